@@ -0,0 +1,277 @@
+"""
+Benchmark reproducible de los solvers.
+
+Las instancias salen de un generador con semilla, estratificado por ancho y por
+profundidad:
+- 3x3: profundidad ÓPTIMA exacta (0 a 31), sacada de la tabla completa de
+  distancias (ver tabla_distancias.py), que se construye en memoria si hace falta.
+- 4x4 en adelante: no hay tabla, así que la "profundidad" es el largo de una
+  mezcla aleatoria sin deshacer movimientos desde el objetivo (una cota superior
+  de la óptima).
+
+De cada solver se mide el tiempo (el mejor de varias repeticiones), el pico de
+memoria (tracemalloc, en una corrida aparte para no inflar el tiempo), los nodos
+expandidos y el largo de la solución, y se agrupa por (solver, ancho,
+profundidad). Con --base se compara contra un resultado guardado y se marcan
+las regresiones (el código de salida es 1 si hay alguna).
+
+Uso:
+    python benchmark.py --salida base.json
+    python benchmark.py --base base.json [--tolerancia 0.2] [--solvers a_star,ida_star]
+    python benchmark.py --anchos 3,4 --profundidades 10-30 --por-profundidad 5
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+from estadisticas import Estadisticas
+from motor import obtener_motor
+from proyecto import a_star, bfs, bfs_bidireccional, busqueda_haz, dfs, ida_star, iddfs, sma_star
+from paralelo import hda_star
+from tabla_distancias import INALCANZABLE, construir_tabla
+from vectorizado import a_star_por_bloques, bfs_por_capas, np
+
+# nombre -> (solver, ancho máximo en el que tiene sentido correrlo)
+SOLVERS = {}
+
+
+def registrar_solver(nombre, solver, ancho_maximo=None):
+    """ 'solver(inicial, objetivo, estadisticas=...)' con la firma de los de proyecto.py. """
+    SOLVERS[nombre] = (solver, ancho_maximo)
+
+
+registrar_solver("bfs", bfs, 3)
+registrar_solver("bidireccional", bfs_bidireccional, 3)
+registrar_solver("dfs", dfs, 3)
+registrar_solver("iddfs", iddfs, 3)         # Exponencial: conviene limitarlo a --profundidades 0-22
+registrar_solver("a_star", a_star, 4)
+registrar_solver("a_star_cubetas", partial(a_star, frontera="cubetas"), 4)
+registrar_solver("ida_star", ida_star)
+registrar_solver("ida_star_conflictos", partial(ida_star, heuristica="conflictos"))
+registrar_solver("sma_star", partial(sma_star, max_nodos=10_000), 4)
+registrar_solver("haz", partial(busqueda_haz, ancho_haz=1000))
+registrar_solver("hda_star", hda_star, 4)     # Un proceso por núcleo
+if np is not None:
+    registrar_solver("bfs_capas", bfs_por_capas, 3)
+    registrar_solver("a_star_bloques", a_star_por_bloques, 4)
+
+
+def objetivo_estandar(ancho):
+    return list(range(1, ancho * ancho)) + [0]
+
+
+def generar_instancias(semilla, anchos, profundidades, por_profundidad):
+    """
+    Lista de instancias {"ancho", "profundidad", "inicial", "objetivo"}. La misma
+    semilla y los mismos parámetros dan siempre las mismas instancias.
+    """
+    azar = random.Random(semilla)
+    instancias = []
+    for ancho in anchos:
+        motor = obtener_motor(ancho)
+        objetivo = objetivo_estandar(ancho)
+
+        if ancho == 3:
+            por_distancia = {}
+            # La tabla completa de distancias se calcula en menos de un segundo
+            for r, d in enumerate(construir_tabla(objetivo)):
+                if d != INALCANZABLE and d in profundidades:
+                    por_distancia.setdefault(d, []).append(r)
+            for d in profundidades:
+                candidatos = por_distancia.get(d, [])
+                for r in azar.sample(candidatos, min(por_profundidad, len(candidatos))):
+                    instancias.append({"ancho": ancho, "profundidad": d,
+                                       "inicial": motor.desempaquetar(motor.desrango(r)), "objetivo": objetivo})
+            continue
+
+        for d in profundidades:
+            for _ in range(por_profundidad):
+                # Mezcla de d movimientos sin deshacer el anterior
+                estado = motor.empaquetar(objetivo)
+                ultimo = None
+                for _ in range(d):
+                    opciones = [c for c, _ in motor.sucesores(estado) if ultimo is None or c != ultimo ^ 1]
+                    ultimo = azar.choice(opciones)
+                    estado = motor.aplicar(estado, ultimo)
+                instancias.append({"ancho": ancho, "profundidad": d,
+                                   "inicial": motor.desempaquetar(estado), "objetivo": objetivo})
+    return instancias
+
+
+def medir(solver, instancia, repeticiones=1, memoria=True):
+    """ {"tiempo", "memoria", "expandidos", "longitud"} de una instancia. """
+    estadisticas = Estadisticas()
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        camino = solver(instancia["inicial"], instancia["objetivo"], estadisticas=estadisticas)
+        duracion = time.perf_counter() - inicio
+        if mejor is None or duracion < mejor:
+            mejor = duracion
+
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        solver(instancia["inicial"], instancia["objetivo"])
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "tiempo": mejor,
+        "memoria": pico,
+        "expandidos": estadisticas.expandidos,
+        "longitud": len(camino) - 1 if camino else None,
+    }
+
+
+def correr(instancias, solvers, repeticiones=1, memoria=True, progreso=None):
+    """
+    Corre cada solver sobre las instancias de su rango de anchos y agrupa por
+    "solver/ancho/profundidad": promedio de tiempo, expandidos y largo, y el
+    máximo pico de memoria.
+    """
+    grupos = {}
+    for nombre in solvers:
+        solver, ancho_maximo = SOLVERS[nombre]
+        for instancia in instancias:
+            if ancho_maximo is not None and instancia["ancho"] > ancho_maximo:
+                continue
+            medida = medir(solver, instancia, repeticiones, memoria)
+            clave = f"{nombre}/{instancia['ancho']}/{instancia['profundidad']}"
+            grupos.setdefault(clave, []).append(medida)
+            if progreso:
+                progreso(clave, medida)
+
+    resultados = {}
+    for clave, medidas in grupos.items():
+        n = len(medidas)
+        longitudes = [m["longitud"] for m in medidas if m["longitud"] is not None]
+        resultados[clave] = {
+            "instancias": n,
+            "tiempo": sum(m["tiempo"] for m in medidas) / n,
+            "memoria": max(m["memoria"] for m in medidas) if memoria else None,
+            "expandidos": sum(m["expandidos"] for m in medidas) / n,
+            "longitud": sum(longitudes) / len(longitudes) if longitudes else None,
+        }
+    return resultados
+
+
+def comparar(resultados, base, tolerancia=0.2, tolerancia_memoria=0.1, tolerancia_nodos=0.0):
+    """
+    Devuelve una lista de (clave, métrica, valor_base, valor_actual) con las
+    regresiones respecto a 'base', mirando solo los grupos presentes en ambos:
+    - nodos expandidos y memoria, grupo por grupo: son deterministas (por defecto
+      cualquier aumento de nodos cuenta);
+    - tiempo, sumado por solver y ancho: el tiempo de un grupo chico es de
+      milisegundos y su ruido supera cualquier tolerancia razonable.
+    Una métrica cuenta como regresión si supera base * (1 + tolerancia).
+    """
+    regresiones = []
+
+    def revisar(clave, metrica, valor_base, valor, margen):
+        if valor_base is not None and valor is not None and valor > valor_base * (1 + margen) and valor > valor_base:
+            regresiones.append((clave, metrica, valor_base, valor))
+
+    comunes = sorted(set(resultados) & set(base))
+    for clave in comunes:
+        revisar(clave, "expandidos", base[clave]["expandidos"], resultados[clave]["expandidos"], tolerancia_nodos)
+        revisar(clave, "memoria", base[clave]["memoria"], resultados[clave]["memoria"], tolerancia_memoria)
+
+    totales_base = _resumen({clave: base[clave] for clave in comunes})
+    for clave, total in sorted(_resumen({clave: resultados[clave] for clave in comunes}).items()):
+        revisar(clave, "tiempo", totales_base[clave]["tiempo"], total["tiempo"], tolerancia)
+    return regresiones
+
+
+def _resumen(resultados):
+    """ Totales por solver y ancho (suma de los promedios de cada profundidad). """
+    totales = {}
+    for clave, r in resultados.items():
+        nombre, ancho, _ = clave.split("/")
+        total = totales.setdefault(f"{nombre}/{ancho}", {"tiempo": 0.0, "expandidos": 0.0, "memoria": 0})
+        total["tiempo"] += r["tiempo"]
+        total["expandidos"] += r["expandidos"]
+        total["memoria"] = max(total["memoria"], r["memoria"] or 0)
+    return totales
+
+
+def _rango(texto):
+    """ "0-31" o "5,10,20" -> lista de enteros. """
+    valores = []
+    for parte in texto.split(","):
+        if "-" in parte:
+            desde, hasta = parte.split("-")
+            valores.extend(range(int(desde), int(hasta) + 1))
+        else:
+            valores.append(int(parte))
+    return valores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los solvers del puzzle")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--anchos", default="3", help="Anchos separados por comas, ej. 3,4")
+    parser.add_argument("--profundidades", default="0-31", help="Rango o lista, ej. 0-31 o 10,20,30")
+    parser.add_argument("--por-profundidad", type=int, default=2, help="Instancias por ancho y profundidad")
+    parser.add_argument("--solvers", default="bfs,dfs,a_star",
+                        help=f"Separados por comas (disponibles: {', '.join(SOLVERS)})")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Se queda con el mejor tiempo")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir memoria (más rápido)")
+    parser.add_argument("--salida", help="Guarda los resultados en JSON (sirve como base)")
+    parser.add_argument("--base", help="Resultados anteriores contra los que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Aumento tolerado del tiempo total por solver y ancho (0.2 = 20%%)")
+    parser.add_argument("--tolerancia-memoria", type=float, default=0.1)
+    parser.add_argument("--tolerancia-nodos", type=float, default=0.0)
+    args = parser.parse_args()
+
+    solvers = args.solvers.split(",")
+    for nombre in solvers:
+        if nombre not in SOLVERS:
+            parser.error(f"Solver desconocido: {nombre!r} (disponibles: {', '.join(SOLVERS)})")
+
+    anchos = [int(a) for a in args.anchos.split(",")]
+    instancias = generar_instancias(args.semilla, anchos, _rango(args.profundidades), args.por_profundidad)
+    print(f"{len(instancias)} instancias, solvers: {', '.join(solvers)}", file=sys.stderr)
+
+    resultados = correr(instancias, solvers, args.repeticiones, not args.sin_memoria)
+
+    for clave, total in sorted(_resumen(resultados).items()):
+        memoria = f"{total['memoria'] / 1e6:9.2f} MB" if total["memoria"] else ""
+        print(f"{clave:28} {total['tiempo']:10.4f} s {total['expandidos']:14.0f} expandidos {memoria}")
+
+    if args.salida:
+        documento = {
+            "parametros": {
+                "semilla": args.semilla,
+                "anchos": anchos,
+                "profundidades": args.profundidades,
+                "por_profundidad": args.por_profundidad,
+                "repeticiones": args.repeticiones,
+            },
+            "python": platform.python_version(),
+            "resultados": resultados,
+        }
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=1, sort_keys=True)
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as archivo:
+            base = json.load(archivo)["resultados"]
+        regresiones = comparar(resultados, base, args.tolerancia, args.tolerancia_memoria,
+                               args.tolerancia_nodos)
+        for clave, metrica, anterior, actual in regresiones:
+            cambio = f" ({actual / anterior - 1:+.0%})" if anterior else ""
+            print(f"REGRESIÓN {clave} {metrica}: {anterior:.6g} -> {actual:.6g}{cambio}")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones respecto a la base", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
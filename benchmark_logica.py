@@ -0,0 +1,73 @@
+"""
+Benchmark de los motores lógicos de la KB del Wumpus (prueba.py): resolución
+con conjunto de soporte contra el solver SAT (sat.py), en mundos cada vez más
+grandes.
+
+Cada mundo sale de una semilla. La exploración es la misma para los dos
+motores: se visita la casilla segura sin visitar más chica (sin caminar hasta
+ella, solo importa lo que se le dice a la KB) hasta que no queda ninguna. Se
+mide el tiempo total de la KB y cuántas casillas llegó a probar seguras: la
+resolución corta a las 'max_clausulas' y puede dejar casillas seguras sin probar.
+
+Uso:
+    python benchmark_logica.py
+    python benchmark_logica.py --tamaños 4,8,12,16 --mundos 5 --motores sat
+"""
+import argparse
+import random
+import sys
+import time
+
+from prueba import KB, MOTORES, Mundo
+
+
+def explorar(mundo, kb):
+    """ Visita todas las casillas que la KB prueba seguras. Devuelve cuántas visitó. """
+    visitadas = set()
+    while True:
+        pendientes = sorted(kb.seguras - visitadas)
+        if not pendientes:
+            return len(visitadas)
+        i, j = pendientes[0]
+        visitadas.add((i, j))
+        celda = mundo.celdas[i][j]
+        kb.actualizar_conocimientos(i, j, celda.brisa, celda.hedor)
+
+
+def medir(motor, tamaño, semilla):
+    """ {"tiempo", "visitadas", "seguras"} de un mundo. """
+    random.seed(semilla)
+    mundo = Mundo(tamaño=tamaño)
+    kb = KB(tamaño, motor=motor, verboso=False)
+    inicio = time.perf_counter()
+    visitadas = explorar(mundo, kb)
+    return {"tiempo": time.perf_counter() - inicio, "visitadas": visitadas, "seguras": len(kb.seguras)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los motores lógicos del Wumpus")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--tamaños", default="4,6,8,10,12", help="Tamaños separados por comas")
+    parser.add_argument("--mundos", type=int, default=3, help="Mundos por tamaño")
+    parser.add_argument("--motores", default=",".join(MOTORES),
+                        help=f"Separados por comas (disponibles: {', '.join(MOTORES)})")
+    args = parser.parse_args()
+
+    motores = args.motores.split(",")
+    for motor in motores:
+        if motor not in MOTORES:
+            parser.error(f"Motor desconocido: {motor!r} (disponibles: {', '.join(MOTORES)})")
+
+    print(f"{'motor':12} {'tamaño':>6} {'tiempo':>10} {'visitadas':>10} {'seguras':>8}")
+    for tamaño in (int(t) for t in args.tamaños.split(",")):
+        for motor in motores:
+            medidas = [medir(motor, tamaño, args.semilla + k) for k in range(args.mundos)]
+            tiempo = sum(m["tiempo"] for m in medidas)
+            visitadas = sum(m["visitadas"] for m in medidas)
+            seguras = sum(m["seguras"] for m in medidas)
+            print(f"{motor:12} {tamaño:6} {tiempo:10.4f} s {visitadas:8} {seguras:8}")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Cache de soluciones con reutilización de subcaminos.
+
+Cuando un solver devuelve un camino ÓPTIMO, cada estado del camino queda con
+su distancia exacta al objetivo y el movimiento que lo acerca. Así una consulta
+posterior por cualquiera de esos estados (no solo el inicial) se responde
+siguiendo esos movimientos, sin buscar. Para tableros cercanos, A* puede usar
+las distancias exactas conocidas como heurística (HeuristicaConCache).
+
+Todo se guarda en forma canónica (ver canonico.py): el objetivo pasa a ser el
+canónico de su órbita y cada estado se guarda como el menor de sus simétricos
+respecto de ese objetivo, así una misma entrada sirve para objetivos distintos
+y para tableros simétricos.
+
+Las entradas se desalojan por LRU (se cuenta por estados guardados) y la cache
+se puede guardar en disco y volver a cargar.
+
+    cache = CacheSoluciones(capacidad=200_000, ruta="cache_soluciones.txt")
+    camino = cache.resolver(inicial, objetivo)          # A* + heurística con la cache
+    camino = cache.resolver(inicial, objetivo, solver=bfs)
+    cache.guardar()
+"""
+import os
+from collections import OrderedDict
+from math import isqrt
+
+from canonico import canonizar, transformaciones
+from estadisticas import Estadisticas
+from heuristicas import Heuristica, obtener_heuristica
+from motor import LETRAS, NINGUNO, obtener_motor
+from proyecto import FORMATOS, a_star
+from validacion import validar_instancia
+
+FIRMA = "CACHEPZ2"
+
+
+class CacheSoluciones:
+    """
+    Entradas (ancho, objetivo, estado) -> distancia << 3 | codigo, con 'estado' y
+    'objetivo' empaquetados (motor.py) y en forma canónica, y 'codigo' el
+    movimiento óptimo desde 'estado' (NINGUNO en el propio objetivo).
+
+    Los métodos que reciben estados empaquetados esperan el objetivo ya canónico
+    (como lo deja canonizar()); los estados pueden ser cualquiera.
+    """
+
+    def __init__(self, capacidad=100_000, ruta=None):
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser de al menos un estado")
+        self.capacidad = capacidad
+        self.ruta = ruta
+        self._entradas = OrderedDict()
+        self._simetrias = {}            # (ancho, objetivo) -> transformaciones que lo dejan fijo
+        # (ancho, objetivo) -> estados guardados y todos sus simétricos, tal cual: un
+        # estado que no está acá no está en la cache, sin calcular su forma canónica
+        self._conocidos = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.cambios = 0                # Sube con cada entrada nueva (invalida lo que otros recuerdan)
+        if ruta is not None and os.path.exists(ruta):
+            self.cargar(ruta)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _guardar_entrada(self, clave, valor):
+        entradas = self._entradas
+        if clave not in entradas:
+            self._simetricos(clave, set.add)
+            self.cambios += 1
+        entradas[clave] = valor
+        entradas.move_to_end(clave)
+        while len(entradas) > self.capacidad:
+            self._simetricos(entradas.popitem(last=False)[0], set.discard)
+
+    def _simetricos(self, clave, operacion):
+        """ Aplica 'operacion' (agregar o quitar) a los simétricos de la clave en _conocidos. """
+        ancho, objetivo, estado = clave
+        motor = obtener_motor(ancho)
+        conocidos = self.conocidos(motor, objetivo)
+        for transformacion in self._transformaciones(motor, objetivo):
+            operacion(conocidos, estado if transformacion.es_identidad else transformacion.aplicar_estado(motor, estado))
+
+    def _transformaciones(self, motor, objetivo):
+        simetrias = self._simetrias.get((motor.ancho, objetivo))
+        if simetrias is None:
+            simetrias = transformaciones(motor.desempaquetar(objetivo), motor.ancho)
+            self._simetrias[motor.ancho, objetivo] = simetrias
+        return simetrias
+
+    def conocidos(self, motor, objetivo):
+        """
+        Conjunto (vivo) de los estados que pueden estar en la cache para un
+        objetivo canónico: los guardados y todos sus simétricos.
+        """
+        conocidos = self._conocidos.get((motor.ancho, objetivo))
+        if conocidos is None:
+            conocidos = self._conocidos[motor.ancho, objetivo] = set()
+        return conocidos
+
+    def _clave(self, motor, estado, objetivo):
+        """
+        (clave, transformación): la clave usa el menor simétrico de 'estado' entre
+        los que dejan fijo el objetivo canónico, y la transformación lleva a él.
+        """
+        mejor = None
+        for transformacion in self._transformaciones(motor, objetivo):
+            simetrico = estado if transformacion.es_identidad else transformacion.aplicar_estado(motor, estado)
+            if mejor is None or simetrico < mejor[0]:
+                mejor = (simetrico, transformacion)
+        return (motor.ancho, objetivo, mejor[0]), mejor[1]
+
+    def registrar(self, motor, inicio, objetivo, codigos):
+        """ Guarda un camino óptimo (estados empaquetados y códigos de movimiento). """
+        distancia = len(codigos)
+        estado = inicio
+        for codigo in codigos:
+            clave, transformacion = self._clave(motor, estado, objetivo)
+            self._guardar_entrada(clave, distancia << 3 | transformacion.codigos[codigo])
+            estado = motor.aplicar(estado, codigo)
+            distancia -= 1
+        self._guardar_entrada((motor.ancho, objetivo, objetivo), NINGUNO)
+
+    def distancia(self, motor, estado, objetivo):
+        """ Distancia exacta al objetivo si se conoce, o None. """
+        if estado not in self.conocidos(motor, objetivo):
+            return None
+        valor = self._entradas.get(self._clave(motor, estado, objetivo)[0])
+        return None if valor is None else valor >> 3
+
+    def consultar(self, motor, inicio, objetivo):
+        """
+        Códigos del camino óptimo desde 'inicio' si está en la cache, o None. Si
+        falta algún estado intermedio (desalojado) cuenta como fallo.
+        """
+        entradas = self._entradas
+        codigos = []
+        estado = inicio
+        while True:
+            clave, transformacion = self._clave(motor, estado, objetivo)
+            valor = entradas.get(clave)
+            if valor is None:
+                return None
+            entradas.move_to_end(clave)         # Usado: pasa al final de la LRU
+            codigo = valor & 7
+            if codigo == NINGUNO:
+                return codigos
+            # El código guardado es el del simétrico: se lleva de vuelta a 'estado'
+            codigo = transformacion.codigos_originales[codigo]
+            codigos.append(codigo)
+            estado = motor.aplicar(estado, codigo)
+
+    def heuristica(self, estado_objetivo, base="manhattan", ancho=None):
+        """ Heurística para a_star: distancia exacta si está en la cache, si no la de 'base'. """
+        return HeuristicaConCache(self, obtener_heuristica(base, estado_objetivo, ancho))
+
+    def resolver(self, estado_inicial, estado_objetivo, solver=None, heuristica="manhattan",
+                 formato="tableros", estadisticas=None):
+        """
+        Como los solvers de proyecto.py, pero primero busca en la cache. Sin
+        'solver' usa a_star con la heurística de la cache. Solo se guardan los
+        caminos que el solver demuestra óptimos (estadisticas.optimo).
+        """
+        if estadisticas is None:
+            estadisticas = Estadisticas()
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido: {formato!r} (disponibles: {', '.join(FORMATOS)})")
+        problema = validar_instancia(estado_inicial, estado_objetivo)
+        if problema is not None:
+            return problema
+
+        motor = obtener_motor(isqrt(len(estado_inicial)))
+        # Se busca y se resuelve la instancia canónica; el camino se devuelve en el tablero original
+        inicial_canonico, objetivo_canonico, transformacion = canonizar(estado_inicial, estado_objetivo, motor.ancho)
+        inicio = motor.empaquetar(inicial_canonico)
+        objetivo = motor.empaquetar(objetivo_canonico)
+
+        codigos = self.consultar(motor, inicio, objetivo)
+        if codigos is not None:
+            self.aciertos += 1
+            estadisticas.iniciar("cache")
+            estadisticas.optimo = True
+            estadisticas.terminar()
+        else:
+            self.fallos += 1
+            if solver is None:
+                movimientos = a_star(inicial_canonico, objetivo_canonico,
+                                     heuristica=self.heuristica(objetivo_canonico, heuristica),
+                                     estadisticas=estadisticas, formato="movimientos")
+            else:
+                movimientos = solver(inicial_canonico, objetivo_canonico, estadisticas=estadisticas,
+                                     formato="movimientos")
+            if movimientos is None:
+                return None
+            codigos = [LETRAS.index(letra) for letra in movimientos]
+            if estadisticas.optimo:
+                self.registrar(motor, inicio, objetivo, codigos)
+
+        codigos = [transformacion.codigos_originales[codigo] for codigo in codigos]
+        return _formatear(motor, motor.empaquetar(estado_inicial), codigos, formato)
+
+    def guardar(self, ruta=None):
+        """ Escribe la cache (de la entrada más vieja a la más nueva) en un archivo de texto. """
+        ruta = ruta or self.ruta
+        if ruta is None:
+            raise ValueError("No se indicó dónde guardar la cache")
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="ascii") as archivo:
+            archivo.write(FIRMA + "\n")
+            for (ancho, objetivo, estado), valor in self._entradas.items():
+                archivo.write(f"{ancho} {objetivo} {estado} {valor}\n")
+        os.replace(temporal, ruta)          # Quien lea nunca ve un archivo a medio escribir
+
+    def cargar(self, ruta):
+        with open(ruta, encoding="ascii") as archivo:
+            if archivo.readline().strip() != FIRMA:
+                raise ValueError(f"{ruta} no es una cache de soluciones")
+            for linea in archivo:
+                ancho, objetivo, estado, valor = map(int, linea.split())
+                self._guardar_entrada((ancho, objetivo, estado), valor)
+
+
+def _formatear(motor, inicio, codigos, formato):
+    if formato == "movimientos":
+        return "".join(LETRAS[c] for c in codigos)
+    return motor.tableros(inicio, codigos)
+
+
+class HeuristicaConCache(Heuristica):
+    """
+    Distancia exacta para los estados que están en la cache y la heurística
+    'base' para el resto. Sigue siendo admisible (la exacta nunca sobreestima),
+    pero no consistente: a_star ya reabre estados cuando hace falta.
+    """
+
+    def __init__(self, cache, base):
+        super().__init__(base.objetivo, base.ancho)
+        self.cache = cache
+        self.base = base
+        self._transformacion = transformaciones(self.objetivo, self.ancho)[0]
+        self._objetivo = self.motor.empaquetar(self._transformacion.aplicar(self.objetivo))
+        self._conocidos = cache.conocidos(self.motor, self._objetivo)
+        # Valor exacto del último estado expandido: a_star pide los deltas de todos
+        # sus hijos seguidos, así que se busca una vez por expansión y no por hijo
+        self._padre = None              # (estado, cache.cambios)
+        self._exacta_padre = None
+
+    def _exacta(self, estado):
+        if not self._transformacion.es_identidad:
+            estado = self._transformacion.aplicar_estado(self.motor, estado)
+        if estado not in self._conocidos:
+            return None                     # Lo común: ni se calcula la forma canónica
+        return self.cache.distancia(self.motor, estado, self._objetivo)
+
+    def evaluar(self, tablero):
+        return self.evaluar_estado(self.motor.empaquetar(tablero))
+
+    def evaluar_estado(self, estado):
+        exacta = self._exacta(estado)
+        return exacta if exacta is not None else self.base.evaluar_estado(estado)
+
+    def delta_estado(self, estado, ficha, desde, hasta):
+        # Se arma el vecino: 'ficha' pasa de 'desde' a 'hasta' y el hueco queda en 'desde'
+        bits = self.motor.bits
+        vecino = estado + ficha * ((1 << bits * (hasta + 1)) - (1 << bits * (desde + 1))) + desde - hasta
+        padre = (estado, self.cache.cambios)
+        if padre != self._padre:
+            self._padre = padre
+            self._exacta_padre = self._exacta(estado)
+        exacta_antes = self._exacta_padre
+        exacta_despues = self._exacta(vecino)
+        if exacta_antes is None and exacta_despues is None:
+            # Ninguno está en la cache: el delta de la heurística base (O(1) con Manhattan)
+            return self.base.delta_estado(estado, ficha, desde, hasta)
+        antes = exacta_antes if exacta_antes is not None else self.base.evaluar_estado(estado)
+        despues = exacta_despues if exacta_despues is not None else self.base.evaluar_estado(vecino)
+        return despues - antes
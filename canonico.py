@@ -0,0 +1,195 @@
+"""
+Forma canónica de una instancia (inicio, objetivo) del puzzle de NxN.
+
+Dos cambios no alteran la distancia entre dos tableros:
+- reetiquetar las fichas (la ficha 5 pasa a llamarse 2, etc.): los movimientos
+  son del hueco y no miran los números;
+- aplicar a los dos tableros la misma simetría del cuadrado (4 rotaciones y 4
+  reflexiones): los movimientos se transforman igual (ARRIBA puede pasar a ser
+  IZQUIERDA, etc.).
+
+Con una simetría se lleva el hueco del objetivo a un representante de su órbita
+(la mayor casilla de la órbita, así el objetivo estándar ya es canónico) y con
+un reetiquetado el objetivo queda en objetivo_canonico(ancho, hueco): fichas
+1, 2, 3... en orden de lectura. Entonces todo lo que se precalcula para un
+objetivo (tabla de distancias, PDB, cache) sirve para cualquier objetivo con el
+hueco en la misma órbita: en el 3x3 hay tres (esquinas, bordes y centro).
+
+Entre las simetrías que dejan fijo el objetivo canónico se elige la que da el
+menor tablero inicial, así los tableros simétricos caen en la misma forma.
+
+    inicial_c, objetivo_c, transformacion = canonizar(inicial, objetivo)
+    camino = [transformacion.deshacer(t) for t in resolver(inicial_c, objetivo_c)]
+    movimientos = transformacion.movimientos_originales(resolver_texto(inicial_c, objetivo_c))
+"""
+from functools import lru_cache
+from math import isqrt
+
+from heuristicas import Heuristica
+from motor import LETRAS
+
+# Vector (fila, columna) del hueco para cada código de movimiento (ver motor.py)
+VECTORES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Las 8 simetrías del cuadrado: (fila, col, último índice) -> (fila, col)
+SIMETRIAS = (
+    lambda f, c, u: (f, c),                 # identidad
+    lambda f, c, u: (c, u - f),             # giro de 90°
+    lambda f, c, u: (u - f, u - c),         # giro de 180°
+    lambda f, c, u: (u - c, f),             # giro de 270°
+    lambda f, c, u: (f, u - c),             # espejo horizontal
+    lambda f, c, u: (u - f, c),             # espejo vertical
+    lambda f, c, u: (c, f),                 # diagonal principal
+    lambda f, c, u: (u - c, u - f),         # diagonal secundaria
+)
+
+
+class Transformacion:
+    """
+    Simetría + reetiquetado. 'posicion[casilla]' es la casilla de destino,
+    'etiqueta[ficha]' la ficha en el tablero transformado (el hueco sigue siendo
+    0) y 'codigos[codigo]' el código de un movimiento en el tablero transformado.
+    """
+    __slots__ = ("posicion", "etiqueta", "codigos", "codigos_originales", "es_identidad", "_etiqueta_original")
+
+    def __init__(self, posicion, etiqueta, codigos):
+        self.posicion = posicion
+        self.etiqueta = etiqueta
+        self.codigos = codigos
+        self.codigos_originales = [0] * 4
+        for codigo, transformado in enumerate(codigos):
+            self.codigos_originales[transformado] = codigo
+        self._etiqueta_original = [0] * len(etiqueta)
+        for ficha, nueva in enumerate(etiqueta):
+            self._etiqueta_original[nueva] = ficha
+        self.es_identidad = (all(p == i for i, p in enumerate(posicion))
+                             and all(e == i for i, e in enumerate(etiqueta)))
+
+    def aplicar(self, tablero):
+        transformado = [0] * len(tablero)
+        posicion, etiqueta = self.posicion, self.etiqueta
+        for casilla, ficha in enumerate(tablero):
+            transformado[posicion[casilla]] = etiqueta[ficha]
+        return transformado
+
+    def deshacer(self, tablero):
+        etiqueta_original = self._etiqueta_original
+        return [etiqueta_original[tablero[destino]] for destino in self.posicion]
+
+    def aplicar_estado(self, motor, estado):
+        """ aplicar() sobre un estado empaquetado (motor.py), sin pasar por listas. """
+        bits, mascara = motor.bits, motor.mascara
+        posicion, etiqueta = self.posicion, self.etiqueta
+        transformado = posicion[estado & mascara]
+        estado >>= bits
+        for casilla in range(motor.casillas):
+            transformado |= etiqueta[estado & mascara] << bits * (posicion[casilla] + 1)
+            estado >>= bits
+        return transformado
+
+    def movimientos(self, texto):
+        """ "UDLR" del tablero original -> los del tablero transformado. """
+        return "".join(LETRAS[self.codigos[LETRAS.index(letra)]] for letra in texto)
+
+    def movimientos_originales(self, texto):
+        """ "UDLR" del tablero transformado -> los del tablero original. """
+        return "".join(LETRAS[self.codigos_originales[LETRAS.index(letra)]] for letra in texto)
+
+
+@lru_cache(maxsize=None)
+def _simetrias(ancho):
+    """ (posicion, codigos) de cada simetría, en el orden de SIMETRIAS. """
+    u = ancho - 1
+    resultado = []
+    for simetria in SIMETRIAS:
+        posicion = []
+        for casilla in range(ancho * ancho):
+            fila, col = simetria(*divmod(casilla, ancho), u)
+            posicion.append(fila * ancho + col)
+        # Con u = 0 la simetría queda lineal: transforma los vectores de movimiento
+        codigos = [VECTORES.index(simetria(df, dc, 0)) for df, dc in VECTORES]
+        resultado.append((tuple(posicion), tuple(codigos)))
+    return tuple(resultado)
+
+
+def hueco_canonico(ancho, hueco):
+    """ Representante de la órbita de 'hueco' bajo las simetrías: su mayor casilla. """
+    return max(posicion[hueco] for posicion, _ in _simetrias(ancho))
+
+
+@lru_cache(maxsize=None)
+def _objetivo_canonico(ancho, hueco):
+    hueco = hueco_canonico(ancho, hueco)
+    fichas = iter(range(1, ancho * ancho))
+    return tuple(0 if casilla == hueco else next(fichas) for casilla in range(ancho * ancho))
+
+
+def objetivo_canonico(ancho, hueco):
+    """ Objetivo canónico de la órbita de 'hueco': 1, 2, 3... en orden de lectura y el hueco en el representante. """
+    return list(_objetivo_canonico(ancho, hueco))
+
+
+def transformaciones(estado_objetivo, ancho=None):
+    """ Todas las transformaciones que llevan 'estado_objetivo' a su objetivo canónico (la primera es la de menor índice). """
+    return _transformaciones(tuple(estado_objetivo), ancho or isqrt(len(estado_objetivo)))
+
+
+@lru_cache(maxsize=64)
+def _transformaciones(estado_objetivo, ancho):
+    hueco = estado_objetivo.index(0)
+    representante = hueco_canonico(ancho, hueco)
+    canonico = _objetivo_canonico(ancho, hueco)
+    resultado = []
+    for posicion, codigos in _simetrias(ancho):
+        if posicion[hueco] != representante:
+            continue
+        # La ficha que la simetría deja en la casilla 'destino' pasa a llamarse canonico[destino]
+        etiqueta = [0] * len(estado_objetivo)
+        for casilla, ficha in enumerate(estado_objetivo):
+            etiqueta[ficha] = canonico[posicion[casilla]]
+        resultado.append(Transformacion(posicion, etiqueta, codigos))
+    return tuple(resultado)
+
+
+def canonizar(estado_inicial, estado_objetivo, ancho=None):
+    """
+    (inicial canónico, objetivo canónico, transformación). Los tableros deben
+    ser válidos (validar_instancia). De las transformaciones posibles se usa la
+    que da el menor inicial, así las instancias simétricas coinciden.
+    """
+    mejor = None
+    for transformacion in transformaciones(estado_objetivo, ancho):
+        inicial = transformacion.aplicar(estado_inicial)
+        if mejor is None or inicial < mejor[0]:
+            mejor = (inicial, transformacion)
+    inicial, transformacion = mejor
+    return inicial, transformacion.aplicar(estado_objetivo), transformacion
+
+
+class HeuristicaCanonica(Heuristica):
+    """
+    Usa una heurística construida para el objetivo canónico (por ejemplo una PDB)
+    con cualquier objetivo de la misma órbita: cada tablero se transforma antes
+    de evaluarlo.
+    """
+
+    def __init__(self, base, transformacion):
+        super().__init__(transformacion.deshacer(base.objetivo), base.ancho)
+        self.base = base
+        self.transformacion = transformacion
+        self.consistente = base.consistente     # Transformar los tableros no cambia los valores
+
+    def evaluar(self, tablero):
+        return self.base.evaluar(self.transformacion.aplicar(tablero))
+
+    def evaluar_estado(self, estado):
+        return self.base.evaluar_estado(self.transformacion.aplicar_estado(self.motor, estado))
+
+    def delta(self, tablero, ficha, desde, hasta):
+        t = self.transformacion
+        return self.base.delta(t.aplicar(tablero), t.etiqueta[ficha], t.posicion[desde], t.posicion[hasta])
+
+    def delta_estado(self, estado, ficha, desde, hasta):
+        t = self.transformacion
+        return self.base.delta_estado(t.aplicar_estado(self.motor, estado), t.etiqueta[ficha],
+                                      t.posicion[desde], t.posicion[hasta])
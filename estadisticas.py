@@ -0,0 +1,117 @@
+"""
+Estadísticas de búsqueda que llenan todos los solvers.
+
+Los solvers cuentan con variables locales (sumar a un entero local es lo más
+barato que hay en Python) y solo las copian a este objeto al terminar o cuando
+toca avisar, así que medir no cambia lo que se mide. Si no se pasa un objeto,
+el solver usa uno propio que se descarta.
+
+    estadisticas = Estadisticas(aviso=print, cada=50_000)
+    a_star(inicial, objetivo, estadisticas=estadisticas)
+    estadisticas.expandidos, estadisticas.tiempos["busqueda"], estadisticas.como_dict()
+"""
+import time
+
+# Umbral de aviso que nunca se alcanza (los contadores empiezan en 0 y solo suben)
+SIN_AVISO = -1
+
+
+class Estadisticas:
+    """
+    expandidos           nodos a los que se les generaron los sucesores
+    generados            sucesores generados (incluye los repetidos)
+    duplicados           sucesores descartados por ya conocidos (o sin mejorar su g)
+    pico_frontera        tamaño máximo de la frontera (cola, pila, lista abierta o rama en IDA*)
+    pico_cerrados        estados guardados como visitados/cerrados
+    llamadas_heuristica  evaluaciones de h (completas o incrementales)
+    optimo               True si el camino devuelto es óptimo demostrado, False si
+                         puede no serlo, None si no hubo camino
+    tiempos              segundos por fase: "preparacion", "busqueda", "reconstruccion"
+    trabajadores         en los solvers paralelos, la carga de cada proceso (lista
+                         de dicts, ver paralelo.py); vacía en el resto
+
+    'aviso(estadisticas)' se llama cada 'cada' nodos expandidos con los contadores
+    al día; sirve para mostrar progreso o cortar búsquedas largas (lanzando una
+    excepción desde el aviso).
+    """
+
+    def __init__(self, aviso=None, cada=10_000):
+        if cada < 1:
+            raise ValueError("'cada' debe ser al menos 1")
+        self.aviso = aviso
+        self.cada = cada
+        self.reiniciar()
+
+    def reiniciar(self, algoritmo=None):
+        self.algoritmo = algoritmo
+        self.expandidos = 0
+        self.generados = 0
+        self.duplicados = 0
+        self.pico_frontera = 0
+        self.pico_cerrados = 0
+        self.llamadas_heuristica = 0
+        self.optimo = None
+        self.tiempos = {}
+        self.trabajadores = []
+        self._fase = None
+        self._inicio_fase = 0.0
+
+    def iniciar(self, algoritmo):
+        """ La llama el solver al empezar: reinicia los contadores y abre la fase "preparacion". """
+        self.reiniciar(algoritmo)
+        self.fase("preparacion")
+
+    def fase(self, nombre):
+        """ Cierra la fase actual (sumando su tiempo) y abre 'nombre' (None = ninguna). """
+        ahora = time.perf_counter()
+        if self._fase is not None:
+            self.tiempos[self._fase] = self.tiempos.get(self._fase, 0.0) + ahora - self._inicio_fase
+        self._fase = nombre
+        self._inicio_fase = ahora
+
+    def primer_aviso(self):
+        """ Cantidad de expandidos en la que el solver debe llamar a avisar() por primera vez. """
+        return self.cada if self.aviso is not None else SIN_AVISO
+
+    def anotar(self, expandidos=0, generados=0, duplicados=0, frontera=0, cerrados=0, llamadas_heuristica=0):
+        """ Copia los contadores locales del solver; los picos solo pueden subir. """
+        self.expandidos = expandidos
+        self.generados = generados
+        self.duplicados = duplicados
+        self.llamadas_heuristica = llamadas_heuristica
+        if frontera > self.pico_frontera:
+            self.pico_frontera = frontera
+        if cerrados > self.pico_cerrados:
+            self.pico_cerrados = cerrados
+
+    def avisar(self, *contadores):
+        """ anotar(*contadores), llama al aviso y devuelve el siguiente umbral de expandidos. """
+        self.anotar(*contadores)
+        self.aviso(self)
+        return self.expandidos + self.cada
+
+    def terminar(self, *contadores):
+        """ Últimos contadores y cierre de la fase en curso. """
+        self.anotar(*contadores)
+        self.fase(None)
+
+    @property
+    def tiempo_total(self):
+        return sum(self.tiempos.values())
+
+    def como_dict(self):
+        return {
+            "algoritmo": self.algoritmo,
+            "expandidos": self.expandidos,
+            "generados": self.generados,
+            "duplicados": self.duplicados,
+            "pico_frontera": self.pico_frontera,
+            "pico_cerrados": self.pico_cerrados,
+            "llamadas_heuristica": self.llamadas_heuristica,
+            "optimo": self.optimo,
+            "tiempos": dict(self.tiempos),
+            "trabajadores": [dict(t) for t in self.trabajadores],
+        }
+
+    def __repr__(self):
+        return f"Estadisticas({self.como_dict()})"
@@ -0,0 +1,130 @@
+"""
+Listas abiertas (fronteras) para los solvers de primero-el-mejor (A* y derivados).
+
+Todas tienen la misma interfaz:
+    agregar(estado, g, h)                  -> inserta un estado nuevo
+    actualizar(estado, g_viejo, g, h)      -> el estado mejoró su g (decrease-key)
+    sacar()                                -> (estado, g, h) con menor f = g + h, o None
+    len(frontera)
+
+"heap" es el heapq de siempre: actualizar() inserta otra entrada y las viejas
+quedan en el montículo hasta que el solver las descarta al sacarlas.
+
+"cubetas" aprovecha que f y g son enteros pequeños: una cubeta por f y dentro una
+por g, cada una un dict {estado: h}. Insertar y sacar son O(1), a igual f se
+saca el de mayor g (el más cercano al objetivo) y actualizar() mueve el estado
+de cubeta en lugar de duplicarlo, así que nunca hay entradas viejas.
+
+FronteraPonderada es un montículo por g + peso * h para A* ponderado; no está en
+FRONTERAS porque necesita el peso (a_star la crea si peso != 1).
+"""
+import heapq
+
+
+class FronteraHeap:
+    def __init__(self):
+        self._montículo = []
+
+    def agregar(self, estado, g, h):
+        # (f, h, estado): a igual f sale el de menor h, es decir el de mayor g
+        heapq.heappush(self._montículo, (g + h, h, estado))
+
+    def actualizar(self, estado, g_viejo, g, h):
+        heapq.heappush(self._montículo, (g + h, h, estado))
+
+    def sacar(self):
+        if not self._montículo:
+            return None
+        f, h, estado = heapq.heappop(self._montículo)
+        return estado, f - h, h
+
+    def __len__(self):
+        return len(self._montículo)
+
+
+class FronteraPonderada:
+    def __init__(self, peso):
+        self.peso = peso
+        self._montículo = []
+
+    def agregar(self, estado, g, h):
+        # La prioridad ya no permite recuperar g, así que va en la entrada
+        heapq.heappush(self._montículo, (g + self.peso * h, h, g, estado))
+
+    def actualizar(self, estado, g_viejo, g, h):
+        heapq.heappush(self._montículo, (g + self.peso * h, h, g, estado))
+
+    def sacar(self):
+        if not self._montículo:
+            return None
+        _, h, g, estado = heapq.heappop(self._montículo)
+        return estado, g, h
+
+    def __len__(self):
+        return len(self._montículo)
+
+
+class FronteraCubetas:
+    def __init__(self):
+        self._cubetas = []      # _cubetas[f][g] -> {estado: h}; la última de cada f nunca está vacía
+        self._f_min = 0
+        self._tamaño = 0
+
+    def agregar(self, estado, g, h):
+        f = g + h
+        cubetas = self._cubetas
+        while len(cubetas) <= f:
+            cubetas.append([])
+        por_g = cubetas[f]
+        while len(por_g) <= g:
+            por_g.append({})
+        por_g[g][estado] = h
+        if f < self._f_min:
+            self._f_min = f
+        self._tamaño += 1
+
+    def actualizar(self, estado, g_viejo, g, h):
+        f = g_viejo + h
+        if f < len(self._cubetas):
+            por_g = self._cubetas[f]
+            if g_viejo < len(por_g) and por_g[g_viejo].pop(estado, None) is not None:
+                self._tamaño -= 1
+                while por_g and not por_g[-1]:
+                    por_g.pop()
+        self.agregar(estado, g, h)
+
+    def sacar(self):
+        if not self._tamaño:
+            return None
+        cubetas = self._cubetas
+        f = self._f_min
+        while not cubetas[f]:
+            f += 1
+        self._f_min = f
+
+        por_g = cubetas[f]
+        g = len(por_g) - 1
+        estado, h = por_g[g].popitem()      # LIFO dentro de la cubeta
+        while por_g and not por_g[-1]:
+            por_g.pop()
+        self._tamaño -= 1
+        return estado, g, h
+
+    def __len__(self):
+        return self._tamaño
+
+
+FRONTERAS = {
+    "heap": FronteraHeap,
+    "cubetas": FronteraCubetas,
+}
+
+
+def crear_frontera(frontera):
+    """ Acepta un nombre de FRONTERAS o una clase/fábrica con la misma interfaz. """
+    if isinstance(frontera, str):
+        if frontera not in FRONTERAS:
+            disponibles = ", ".join(sorted(FRONTERAS))
+            raise ValueError(f"Frontera desconocida: {frontera!r} (disponibles: {disponibles})")
+        frontera = FRONTERAS[frontera]
+    return frontera()
@@ -0,0 +1,339 @@
+"""
+Heurísticas para el puzzle de NxN y su registro por nombre.
+
+Cada heurística se construye una vez por (objetivo, ancho) y precalcula ahí sus
+tablas (posiciones objetivo, distancias por ficha, tablas de walking distance),
+así evaluar un nodo nunca vuelve a buscar fichas en el objetivo con index().
+
+Todas ofrecen la misma interfaz:
+    evaluar(tablero)                       -> h de un tablero (lista)
+    evaluar_estado(estado)                 -> h de un estado empaquetado (motor.py)
+    delta(tablero, ficha, desde, hasta)    -> cambio de h al mover 'ficha' de
+                                              'desde' a 'hasta' (tablero ANTES del movimiento)
+    delta_estado(estado, ficha, desde, hasta)  -> lo mismo sobre un estado empaquetado
+    tabla_movimientos()                    -> tabla de movimientos con la variación
+                                              de h por ficha (solo si h depende de cada
+                                              ficha por separado, como Manhattan), o None
+    consistente                            -> True si h nunca baja más de 1 en un
+                                              movimiento (los solvers que cierran un estado
+                                              en su primera expansión lo necesitan)
+
+Los solvers reciben el nombre ("manhattan", "conflictos", "caminata", ...) o una
+instancia; obtener_heuristica() resuelve ambos casos.
+"""
+from collections import deque
+from functools import lru_cache
+from math import isqrt
+
+from motor import obtener_motor
+
+HEURISTICAS = {}
+
+
+def registrar_heuristica(nombre):
+    """ Decorador: registra una clase o función fabrica(estado_objetivo, ancho). """
+    def decorador(fabrica):
+        HEURISTICAS[nombre] = fabrica
+        return fabrica
+    return decorador
+
+
+def obtener_heuristica(heuristica, estado_objetivo, ancho=None):
+    """ Devuelve la instancia para un nombre registrado (cacheada por objetivo) o la misma instancia. """
+    if isinstance(heuristica, Heuristica):
+        return heuristica
+    ancho = ancho if ancho is not None else isqrt(len(estado_objetivo))
+    return _crear_heuristica(heuristica, tuple(estado_objetivo), ancho)
+
+
+@lru_cache(maxsize=64)
+def _crear_heuristica(nombre, estado_objetivo, ancho):
+    if nombre not in HEURISTICAS:
+        disponibles = ", ".join(sorted(HEURISTICAS))
+        raise ValueError(f"Heurística desconocida: {nombre!r} (disponibles: {disponibles})")
+    return HEURISTICAS[nombre](list(estado_objetivo), ancho)
+
+
+class Heuristica:
+    """ Base con implementaciones genéricas (correctas pero sin incrementalidad). """
+    # Sin saberlo, se asume que no: solo se promete admisible
+    consistente = False
+
+    def __init__(self, estado_objetivo, ancho):
+        self.objetivo = list(estado_objetivo)
+        self.ancho = ancho
+        self.motor = obtener_motor(ancho)
+
+    def evaluar(self, tablero):
+        raise NotImplementedError
+
+    def evaluar_estado(self, estado):
+        return self.evaluar(self.motor.desempaquetar(estado))
+
+    def delta(self, tablero, ficha, desde, hasta):
+        movido = tablero[:]
+        movido[desde], movido[hasta] = 0, ficha
+        return self.evaluar(movido) - self.evaluar(tablero)
+
+    def delta_estado(self, estado, ficha, desde, hasta):
+        return self.delta(self.motor.desempaquetar(estado), ficha, desde, hasta)
+
+    def tabla_movimientos(self):
+        return None
+
+
+@registrar_heuristica("manhattan")
+class Manhattan(Heuristica):
+    """ Suma de distancias Manhattan de cada ficha a su casilla objetivo. """
+    consistente = True
+
+    def __init__(self, estado_objetivo, ancho):
+        super().__init__(estado_objetivo, ancho)
+        casillas = ancho * ancho
+        self.posicion_objetivo = [0] * casillas
+        for i, ficha in enumerate(self.objetivo):
+            self.posicion_objetivo[ficha] = i
+
+        # distancias[ficha][casilla]; el hueco no cuenta
+        self.distancias = [[0] * casillas]
+        for ficha in range(1, casillas):
+            fila_obj, col_obj = divmod(self.posicion_objetivo[ficha], ancho)
+            self.distancias.append([abs(fila - fila_obj) + abs(col - col_obj)
+                                    for fila in range(ancho) for col in range(ancho)])
+        self._tabla = None
+
+    def evaluar(self, tablero):
+        distancias = self.distancias
+        return sum(distancias[ficha][i] for i, ficha in enumerate(tablero))
+
+    def evaluar_estado(self, estado):
+        motor = self.motor
+        distancias = self.distancias
+        total = 0
+        estado >>= motor.bits
+        for i in range(motor.casillas):
+            total += distancias[estado & motor.mascara][i]
+            estado >>= motor.bits
+        return total
+
+    def delta(self, tablero, ficha, desde, hasta):
+        return self.distancias[ficha][hasta] - self.distancias[ficha][desde]
+
+    def delta_estado(self, estado, ficha, desde, hasta):
+        return self.distancias[ficha][hasta] - self.distancias[ficha][desde]
+
+    def tabla_movimientos(self):
+        if self._tabla is None:
+            distancias = self.distancias
+            self._tabla = self.motor.movimientos_con_deltas(lambda ficha, casilla: distancias[ficha][casilla])
+        return self._tabla
+
+
+# Con más combinaciones que esto (7x7 en adelante) la tabla de conflictos por
+# línea no se precalcula: se calcula a demanda con una cache acotada
+MAXIMO_TABLA_CONFLICTOS = 1 << 20
+
+
+def _conflictos_codigos(codigos):
+    """
+    Conflictos de una línea dada como los códigos de sus casillas en orden (0
+    si la ficha no es de esta línea, si no 1 + su posición objetivo en ella):
+    2 * (fichas de la línea - la mayor subsecuencia creciente).
+    """
+    orden = [c for c in codigos if c]
+    mejor = [1] * len(orden)
+    for i in range(len(orden)):
+        for j in range(i):
+            if orden[j] < orden[i] and mejor[j] + 1 > mejor[i]:
+                mejor[i] = mejor[j] + 1
+    return 2 * (len(orden) - max(mejor, default=0))
+
+
+def _decodificar(indice, ancho):
+    """ Índice de una línea (base ancho + 1, la casilla 0 en la cifra menos significativa) -> códigos. """
+    codigos = []
+    for _ in range(ancho):
+        indice, codigo = divmod(indice, ancho + 1)
+        codigos.append(codigo)
+    return codigos
+
+
+@lru_cache(maxsize=None)
+def _tabla_conflictos(ancho):
+    """ bytes: conflictos de cada índice de línea. La misma tabla sirve para filas y columnas. """
+    return bytes(_conflictos_codigos(_decodificar(indice, ancho)) for indice in range((ancho + 1) ** ancho))
+
+
+@registrar_heuristica("conflictos")
+class ConflictosLineales(Manhattan):
+    """
+    Manhattan + 2 por cada ficha que hay que sacar de su fila (o columna) para
+    que las fichas que ya están en su fila objetivo queden en orden. Al mover una
+    ficha solo cambian las dos líneas perpendiculares al movimiento.
+
+    Cada línea se resume en un índice: la suma de lo que aporta cada ficha en su
+    casilla (aporte_fila / aporte_columna, 0 si la ficha no es de esa línea), y
+    los conflictos salen de una tabla precalculada por índice, de tamaño fijo
+    (ancho + 1) ** ancho. Mover una ficha cambia el índice de una línea en un
+    solo aporte, sin armar listas ni tuplas.
+    """
+    # No se garantiza que sea consistente: se la trata como solo admisible
+    consistente = False
+
+    def __init__(self, estado_objetivo, ancho):
+        super().__init__(estado_objetivo, ancho)
+        casillas = ancho * ancho
+        potencias = [(ancho + 1) ** k for k in range(ancho)]
+        # aporte_fila[casilla][ficha]: lo que suma 'ficha' en 'casilla' al índice de la fila de la casilla
+        self.aporte_fila = [[0] * casillas for _ in range(casillas)]
+        self.aporte_columna = [[0] * casillas for _ in range(casillas)]
+        for casilla in range(casillas):
+            fila, col = divmod(casilla, ancho)
+            for ficha in range(1, casillas):
+                fila_obj, col_obj = divmod(self.posicion_objetivo[ficha], ancho)
+                if fila_obj == fila:
+                    self.aporte_fila[casilla][ficha] = (col_obj + 1) * potencias[col]
+                if col_obj == col:
+                    self.aporte_columna[casilla][ficha] = (fila_obj + 1) * potencias[fila]
+        self.casillas_fila = [range(f * ancho, (f + 1) * ancho) for f in range(ancho)]
+        self.casillas_columna = [range(c, casillas, ancho) for c in range(ancho)]
+        # Desplazamiento de cada casilla en un estado empaquetado (motor.py)
+        self._desplazamientos = [self.motor.bits * (casilla + 1) for casilla in range(casillas)]
+
+        if (ancho + 1) ** ancho <= MAXIMO_TABLA_CONFLICTOS:
+            self.conflictos = _tabla_conflictos(ancho).__getitem__
+        else:
+            self.conflictos = lru_cache(maxsize=1 << 16)(lambda indice: _conflictos_codigos(_decodificar(indice, ancho)))
+
+    def evaluar(self, tablero):
+        total = super().evaluar(tablero)
+        conflictos = self.conflictos
+        for casillas, aporte in ((self.casillas_fila, self.aporte_fila), (self.casillas_columna, self.aporte_columna)):
+            for linea in casillas:
+                total += conflictos(sum(aporte[i][tablero[i]] for i in linea))
+        return total
+
+    def _cambio_lineas(self, fichas, ficha, desde, hasta):
+        """
+        Cambio de los conflictos al mover 'ficha' de 'desde' a 'hasta'; 'fichas(i)'
+        da la ficha de la casilla i ANTES del movimiento. En un movimiento
+        horizontal el orden dentro de la fila no cambia, sí las dos columnas
+        (y al revés en uno vertical).
+        """
+        if abs(desde - hasta) == 1:
+            casillas, aporte = self.casillas_columna, self.aporte_columna
+            linea_desde, linea_hasta = desde % self.ancho, hasta % self.ancho
+        else:
+            casillas, aporte = self.casillas_fila, self.aporte_fila
+            linea_desde, linea_hasta = desde // self.ancho, hasta // self.ancho
+        conflictos = self.conflictos
+        # La ficha sale de una línea (queda el hueco, que no aporta) y entra en la
+        # otra; si no es de ninguna de las dos, ninguna cambia de índice
+        cambio = 0
+        if aporte[desde][ficha]:
+            antes = sum(aporte[i][fichas(i)] for i in casillas[linea_desde])
+            cambio = conflictos(antes - aporte[desde][ficha]) - conflictos(antes)
+        if aporte[hasta][ficha]:
+            antes = sum(aporte[i][fichas(i)] for i in casillas[linea_hasta])
+            cambio += conflictos(antes + aporte[hasta][ficha]) - conflictos(antes)
+        return cambio
+
+    def delta(self, tablero, ficha, desde, hasta):
+        cambio = self.distancias[ficha][hasta] - self.distancias[ficha][desde]
+        return cambio + self._cambio_lineas(tablero.__getitem__, ficha, desde, hasta)
+
+    def delta_estado(self, estado, ficha, desde, hasta):
+        cambio = self.distancias[ficha][hasta] - self.distancias[ficha][desde]
+        mascara, desplazamientos = self.motor.mascara, self._desplazamientos
+        return cambio + self._cambio_lineas(lambda i: (estado >> desplazamientos[i]) & mascara, ficha, desde, hasta)
+
+    # La de Manhattan solo sumaría la parte Manhattan
+    evaluar_estado = Heuristica.evaluar_estado
+    tabla_movimientos = Heuristica.tabla_movimientos
+
+
+@registrar_heuristica("caminata")
+class DistanciaCaminata(Heuristica):
+    """
+    Walking distance: en vertical, cuántos movimientos hacen falta para que en
+    cada fila estén las fichas que le tocan (sin importar la columna), contando
+    que el hueco solo intercambia con una ficha de la fila vecina. Lo mismo en
+    horizontal con las columnas, y se suman. Las distancias de todas las
+    configuraciones se calculan una vez con un BFS desde el objetivo.
+    """
+    # Cada movimiento es un paso en una sola de las dos abstracciones: h cambia en 1
+    consistente = True
+
+    def __init__(self, estado_objetivo, ancho):
+        if ancho > 4:
+            raise ValueError("La walking distance solo está disponible hasta 4x4")
+        super().__init__(estado_objetivo, ancho)
+        casillas = ancho * ancho
+        hueco = self.objetivo.index(0)
+        # linea_objetivo[ficha] para filas y columnas
+        self._fila_obj = [0] * casillas
+        self._col_obj = [0] * casillas
+        for i, ficha in enumerate(self.objetivo):
+            self._fila_obj[ficha], self._col_obj[ficha] = divmod(i, ancho)
+        self._vertical = self._construir(hueco // ancho)
+        self._horizontal = self._construir(hueco % ancho)
+
+    def _construir(self, linea_hueco):
+        """ BFS sobre configuraciones (conteos[linea][grupo] aplanados, linea del hueco). """
+        ancho = self.ancho
+        conteos = [0] * (ancho * ancho)
+        for linea in range(ancho):
+            conteos[linea * ancho + linea] = ancho - (1 if linea == linea_hueco else 0)
+        inicio = (tuple(conteos), linea_hueco)
+
+        distancias = {inicio: 0}
+        cola = deque([inicio])
+        while cola:
+            configuracion = cola.popleft()
+            conteos, hueco = configuracion
+            for vecina in (hueco - 1, hueco + 1):
+                if not 0 <= vecina < ancho:
+                    continue
+                for grupo in range(ancho):
+                    if conteos[vecina * ancho + grupo]:
+                        nuevos = list(conteos)
+                        nuevos[vecina * ancho + grupo] -= 1
+                        nuevos[hueco * ancho + grupo] += 1
+                        nueva = (tuple(nuevos), vecina)
+                        if nueva not in distancias:
+                            distancias[nueva] = distancias[configuracion] + 1
+                            cola.append(nueva)
+        return distancias
+
+    def _conteos(self, tablero, vertical):
+        ancho = self.ancho
+        conteos = [0] * (ancho * ancho)
+        objetivo = self._fila_obj if vertical else self._col_obj
+        hueco = 0
+        for i, ficha in enumerate(tablero):
+            linea = i // ancho if vertical else i % ancho
+            if ficha:
+                conteos[linea * ancho + objetivo[ficha]] += 1
+            else:
+                hueco = linea
+        return conteos, hueco
+
+    def evaluar(self, tablero):
+        vertical, hueco_v = self._conteos(tablero, True)
+        horizontal, hueco_h = self._conteos(tablero, False)
+        return (self._vertical[(tuple(vertical), hueco_v)]
+                + self._horizontal[(tuple(horizontal), hueco_h)])
+
+    def delta(self, tablero, ficha, desde, hasta):
+        # Solo cambia la componente en la dirección del movimiento
+        ancho = self.ancho
+        vertical = abs(desde - hasta) == ancho
+        conteos, hueco = self._conteos(tablero, vertical)
+        tabla = self._vertical if vertical else self._horizontal
+        antes = tabla[(tuple(conteos), hueco)]
+
+        linea_desde = desde // ancho if vertical else desde % ancho
+        grupo = (self._fila_obj if vertical else self._col_obj)[ficha]
+        conteos[linea_desde * ancho + grupo] -= 1
+        conteos[hueco * ancho + grupo] += 1
+        return tabla[(tuple(conteos), linea_desde)] - antes
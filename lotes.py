@@ -0,0 +1,214 @@
+"""
+Resolución por lotes: lee instancias en JSONL (de un archivo o de stdin), las
+reparte entre varios procesos y escribe un resultado JSONL por instancia.
+
+Cada línea de entrada es un objeto con el tablero inicial y, opcionalmente, el
+objetivo y el algoritmo (si no, se usan los de la línea de comandos):
+    {"id": "a1", "inicial": [8, 6, 7, 2, 5, 4, 3, 0, 1]}
+    {"inicial": [...], "objetivo": [...], "algoritmo": "ida_star", "heuristica": "conflictos"}
+
+Cada línea de salida lleva el número de línea de entrada ("indice"), el "id" si
+lo había, el estado ("resuelto", "irresoluble", "sin_solucion" o "error", ver
+proyecto.estado_resultado), la "longitud" de la solución (en movimientos, como
+en la salida JSON de proyecto.py), el tiempo del solver en segundos y los nodos
+expandidos y generados.
+
+Las instancias viajan a los procesos en bloques (menos idas y vueltas entre
+procesos) y cada proceso carga una sola vez, al arrancar, las tablas de solo
+lectura (motor, heurísticas, PDB y tabla de distancias mapeadas en memoria).
+
+Uso:
+    python lotes.py instancias.jsonl [--salida resultados.jsonl] [--algoritmo a_star]
+                    [--heuristica manhattan] [--procesos 8] [--bloque 256]
+                    [--orden entrada|llegada] [--caminos]
+    cat instancias.jsonl | python lotes.py -
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from math import isqrt
+from multiprocessing import Pool
+
+from estadisticas import Estadisticas
+from heuristicas import obtener_heuristica
+from motor import obtener_motor
+from proyecto import a_star, bfs, bfs_bidireccional, dfs, estado_resultado, ida_star
+from tabla_distancias import RUTA_POR_DEFECTO, cargar_tabla
+from vectorizado import a_star_por_bloques, bfs_por_capas, comprobar_consistente, comprobar_numpy
+
+ALGORITMOS = ("bfs", "bidireccional", "dfs", "a_star", "ida_star", "tabla", "bfs_capas", "a_star_bloques")
+CON_HEURISTICA = ("a_star", "ida_star", "a_star_bloques")
+# Los que necesitan NumPy (ver vectorizado.py)
+VECTORIZADOS = ("bfs_capas", "a_star_bloques")
+
+# Configuración de cada proceso (la fija _inicializar)
+_config = {}
+
+
+def objetivo_estandar(ancho):
+    return list(range(1, ancho * ancho)) + [0]
+
+
+def _inicializar(algoritmo, heuristica, anchos, ruta_tabla, caminos):
+    """
+    Se ejecuta una vez al arrancar cada proceso: deja construidas las tablas del
+    motor y de la heurística para los anchos indicados, y mapea la tabla de
+    distancias si se va a usar, así ninguna instancia paga ese costo.
+    """
+    _config.update(algoritmo=algoritmo, heuristica=heuristica, ruta_tabla=ruta_tabla, caminos=caminos)
+    for ancho in anchos:
+        obtener_motor(ancho)
+        if algoritmo in CON_HEURISTICA:
+            instancia = obtener_heuristica(heuristica, objetivo_estandar(ancho), ancho)
+            if algoritmo == "a_star_bloques":
+                comprobar_consistente(instancia)
+    if algoritmo == "tabla":
+        cargar_tabla(ruta_tabla)
+
+
+def resolver_instancia(instancia):
+    """
+    Resuelve una instancia (dict) con la configuración del proceso y devuelve el
+    resultado (dict). Los errores de la instancia quedan en el resultado.
+    """
+    algoritmo = instancia.get("algoritmo", _config["algoritmo"])
+    heuristica = instancia.get("heuristica", _config["heuristica"])
+    inicial = instancia["inicial"]
+    objetivo = instancia.get("objetivo") or objetivo_estandar(isqrt(len(inicial)))
+    estadisticas = Estadisticas()
+
+    inicio = time.perf_counter()
+    if algoritmo == "bfs":
+        camino = bfs(inicial, objetivo, estadisticas=estadisticas)
+    elif algoritmo == "bidireccional":
+        camino = bfs_bidireccional(inicial, objetivo, estadisticas=estadisticas)
+    elif algoritmo == "dfs":
+        camino = dfs(inicial, objetivo, estadisticas=estadisticas)
+    elif algoritmo == "a_star":
+        camino = a_star(inicial, objetivo, heuristica=heuristica, estadisticas=estadisticas)
+    elif algoritmo == "ida_star":
+        camino = ida_star(inicial, objetivo, heuristica=heuristica, estadisticas=estadisticas)
+    elif algoritmo == "bfs_capas":
+        camino = bfs_por_capas(inicial, objetivo, estadisticas=estadisticas)
+    elif algoritmo == "a_star_bloques":
+        camino = a_star_por_bloques(inicial, objetivo, heuristica=heuristica, estadisticas=estadisticas)
+    elif algoritmo == "tabla":
+        # Se sigue la tabla de distancias: no hay búsqueda, así que expandidos y generados quedan en 0
+        camino = cargar_tabla(_config["ruta_tabla"]).resolver(inicial, objetivo)
+    else:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo!r} (disponibles: {', '.join(ALGORITMOS)})")
+    duracion = time.perf_counter() - inicio
+
+    estado = estado_resultado(camino)
+    resultado = {
+        "estado": estado,
+        "longitud": len(camino) - 1 if estado == "resuelto" else None,
+        "tiempo": round(duracion, 6),
+        "expandidos": estadisticas.expandidos,
+        "generados": estadisticas.generados,
+    }
+    if estado == "irresoluble":
+        resultado["motivo"] = camino.motivo
+    elif estado == "resuelto" and _config["caminos"]:
+        resultado["camino"] = camino
+    return resultado
+
+
+def _procesar_linea(tarea):
+    """ Trabajo de cada proceso: (indice, línea JSON) -> línea JSON de resultado. """
+    indice, linea = tarea
+    resultado = {"indice": indice}
+    try:
+        instancia = json.loads(linea)
+        if "id" in instancia:
+            resultado["id"] = instancia["id"]
+        resultado.update(resolver_instancia(instancia))
+    except (ValueError, KeyError, TypeError, OSError) as error:
+        resultado.update(estado="error", error=f"{type(error).__name__}: {error}")
+    return json.dumps(resultado, separators=(",", ":"))
+
+
+def _leer_tareas(entrada):
+    """ (indice, línea) para cada línea no vacía; el índice es el número de línea (desde 0). """
+    for indice, linea in enumerate(entrada):
+        if linea.strip():
+            yield indice, linea
+
+
+def resolver_lote(entrada, salida, algoritmo="a_star", heuristica="manhattan", procesos=None,
+                  bloque=256, orden="entrada", caminos=False, anchos=(3,), ruta_tabla=RUTA_POR_DEFECTO):
+    """
+    Resuelve todas las líneas de 'entrada' (iterable de líneas JSON) y escribe los
+    resultados en 'salida' (archivo de texto) a medida que llegan. Con
+    orden="entrada" se respeta el orden de la entrada; con "llegada" se escriben
+    según van terminando (sin esperar a las instancias lentas). Devuelve cuántas
+    instancias se procesaron.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo!r} (disponibles: {', '.join(ALGORITMOS)})")
+    if orden not in ("entrada", "llegada"):
+        raise ValueError("El orden debe ser 'entrada' o 'llegada'")
+    if algoritmo in VECTORIZADOS:
+        comprobar_numpy()
+
+    tareas = _leer_tareas(entrada)
+    argumentos = (algoritmo, heuristica, tuple(anchos), ruta_tabla, caminos)
+    total = 0
+
+    # La configuración se prueba primero aquí: si el inicializador falla dentro
+    # del Pool, este reemplaza a los procesos muertos sin fin y el lote se cuelga
+    _inicializar(*argumentos)
+
+    if procesos == 1:
+        # Sin pool: útil para depurar y para lotes chicos
+        for tarea in tareas:
+            salida.write(_procesar_linea(tarea) + "\n")
+            total += 1
+        return total
+
+    with Pool(procesos, initializer=_inicializar, initargs=argumentos) as pool:
+        mapear = pool.imap if orden == "entrada" else pool.imap_unordered
+        for linea in mapear(_procesar_linea, tareas, chunksize=bloque):
+            salida.write(linea + "\n")
+            total += 1
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resuelve instancias JSONL en paralelo")
+    parser.add_argument("entrada", nargs="?", default="-", help="Archivo JSONL ('-' = stdin)")
+    parser.add_argument("--salida", default="-", help="Archivo JSONL de resultados ('-' = stdout)")
+    parser.add_argument("--algoritmo", choices=ALGORITMOS, default="a_star")
+    parser.add_argument("--heuristica", default="manhattan")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count())
+    parser.add_argument("--bloque", type=int, default=256, help="Instancias por envío a cada proceso")
+    parser.add_argument("--orden", choices=("entrada", "llegada"), default="entrada")
+    parser.add_argument("--anchos", default="3", help="Anchos a precargar, separados por comas")
+    parser.add_argument("--tabla", default=RUTA_POR_DEFECTO, help="Tabla de distancias (algoritmo 'tabla')")
+    parser.add_argument("--caminos", action="store_true", help="Incluir los tableros de cada solución")
+    args = parser.parse_args()
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    # Salida con un búfer grande: se escriben cientos de miles de líneas cortas
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8", buffering=1 << 20)
+    anchos = [int(a) for a in args.anchos.split(",")]
+
+    inicio = time.perf_counter()
+    try:
+        total = resolver_lote(entrada, salida, args.algoritmo, args.heuristica, args.procesos,
+                              args.bloque, args.orden, args.caminos, anchos, args.tabla)
+    except (ValueError, OSError) as error:
+        parser.error(str(error))
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+    duracion = time.perf_counter() - inicio
+    print(f"{total} instancias en {duracion:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
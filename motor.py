@@ -0,0 +1,286 @@
+"""
+Motor de estados compacto para el puzzle deslizante de NxN (8, 15, 24-puzzle...).
+
+Cada tablero se guarda como un solo entero: 4 bits por casilla (5 desde el 5x5)
+y, en los bits más bajos, la posición del hueco. Los solvers trabajan solo con
+estos enteros (baratos de copiar y de hashear) y convierten a listas únicamente
+en los bordes de la API.
+
+En el 3x3 además cada permutación tiene un rango único en [0, 9!) (código de
+Lehmer), lo que permite guardar visitados, g y movimientos padre en arreglos
+planos (bytearray/array) indexados por rango. En tableros más grandes 16! ya no
+cabe en memoria, así que la clave es el propio entero empaquetado y los
+"arreglos" son diccionarios con valor por defecto (RegistroDisperso).
+"""
+from array import array
+from functools import lru_cache
+from math import factorial
+
+ANCHO = 3
+
+# Hasta 9 casillas (3x3) usamos rangos y arreglos planos; más allá, diccionarios
+MAX_CASILLAS_RANGO = 9
+
+# Códigos de movimiento del hueco, en el mismo orden que posibles_movimientos()
+ARRIBA, ABAJO, IZQUIERDA, DERECHA = range(4)
+LETRAS = "UDLR"
+
+# Código de "ningún movimiento previo" (para el estado inicial)
+NINGUNO = 4
+
+# Valor que marca el estado inicial en los arreglos de movimientos padre
+# (los movimientos se guardan como codigo + 1, así 0 significa "no visitado")
+RAIZ = 255
+
+
+class RegistroDisperso(dict):
+    """
+    Diccionario que se comporta como un arreglo ya inicializado: las claves que
+    no están devuelven 'defecto'. Los solvers lo usan igual que un bytearray.
+    """
+    def __init__(self, defecto):
+        super().__init__()
+        self.defecto = defecto
+
+    def __missing__(self, clave):
+        return self.defecto
+
+
+def _mismo(estado):
+    return estado
+
+
+class MotorPuzzle:
+    def __init__(self, ancho=ANCHO):
+        if ancho < 2:
+            raise ValueError("El tablero debe ser de al menos 2x2")
+        self.ancho = ancho
+        self.casillas = ancho * ancho
+        self.bits = max(4, (self.casillas - 1).bit_length())
+        self.mascara = (1 << self.bits) - 1
+
+        # movimientos[hueco] -> tuplas (codigo, desplazamiento, delta_ficha, salto)
+        # Para mover el hueco basta con: ficha = (estado >> desplazamiento) & mascara
+        # y nuevo = estado + ficha * delta_ficha + salto. Sin copias ni index().
+        self.movimientos = [self._calcular_movimientos(h) for h in range(self.casillas)]
+        # por_codigo[hueco][codigo] -> la misma tupla de movimiento, o None si no es legal
+        self.por_codigo = []
+        for movimientos in self.movimientos:
+            fila = [None] * 4
+            for movimiento in movimientos:
+                fila[movimiento[0]] = movimiento
+            self.por_codigo.append(fila)
+        # sin_inverso[hueco][ultimo] -> movimientos legales quitando el que deshace 'ultimo'
+        # (volver al padre nunca sirve). Con ultimo = NINGUNO están todos.
+        self.sin_inverso = [tuple(tuple(m for m in movimientos if m[0] != ultimo ^ 1)
+                                  for ultimo in range(NINGUNO + 1))
+                            for movimientos in self.movimientos]
+
+        # Rango de Lehmer: total de permutaciones y tablas para calcularlo de dos en dos casillas.
+        # 'clave' es lo que indexa los registros de los solvers: el rango o el propio estado.
+        self.usa_rango = self.casillas <= MAX_CASILLAS_RANGO
+        if self.usa_rango:
+            self.total = factorial(self.casillas)
+            self._tablas_rango()
+            self.clave = self.rango
+        else:
+            self.total = None
+            self.clave = _mismo
+
+    def _calcular_movimientos(self, hueco):
+        fila, col = divmod(hueco, self.ancho)
+        saltos = []
+        if fila > 0:  # Arriba
+            saltos.append((ARRIBA, -self.ancho))
+        if fila < self.ancho - 1:  # Abajo
+            saltos.append((ABAJO, +self.ancho))
+        if col > 0:  # Izquierda
+            saltos.append((IZQUIERDA, -1))
+        if col < self.ancho - 1:  # Derecha
+            saltos.append((DERECHA, +1))
+
+        tabla = []
+        for codigo, salto in saltos:
+            destino = hueco + salto
+            desplazamiento = self.bits * (destino + 1)
+            # La ficha pasa de 'destino' a 'hueco' (el hueco vale 0, así que solo se suma)
+            delta_ficha = (1 << self.bits * (hueco + 1)) - (1 << desplazamiento)
+            tabla.append((codigo, desplazamiento, delta_ficha, salto))
+        return tuple(tabla)
+
+    def _tablas_rango(self):
+        """
+        El dígito de Lehmer de una casilla es cuántas fichas menores hay a su
+        derecha. Recorriendo de derecha a izquierda con un bitmask 'vistos' de las
+        fichas ya recorridas, cada par de casillas vecinas aporta un valor que solo
+        depende de 'vistos' y de las dos fichas (un byte del entero empaquetado),
+        así que lo precalculamos: tabla[vistos << 2*bits | par].
+        """
+        n = self.casillas
+        bits = self.bits
+        self._ultima = bits * n             # Desplazamiento de la última casilla (aporta siempre 0)
+        self._pares = []                    # (desplazamiento, bits_par, mascara_par, tabla)
+
+        def menores(vistos, ficha):
+            return bin(vistos & ((1 << ficha) - 1)).count("1")
+
+        # Casillas 0..n-2 en pares (izquierda, derecha), empezando por la derecha.
+        # Si sobra una casilla (la 0) se hace un "par" de una sola ficha.
+        derecha = n - 2
+        while derecha >= 0:
+            izquierda = derecha - 1
+            if izquierda >= 0:
+                tabla = array('I', [0]) * ((1 << n) << 2 * bits)
+                f_izq, f_der = factorial(n - 1 - izquierda), factorial(n - 1 - derecha)
+                for vistos in range(1 << n):
+                    for der in range(n):
+                        if (vistos >> der) & 1:
+                            continue
+                        aporte_der = menores(vistos, der) * f_der
+                        con_der = vistos | (1 << der)
+                        for izq in range(n):
+                            if not (con_der >> izq) & 1:
+                                indice = (vistos << 2 * bits) | (der << bits) | izq
+                                tabla[indice] = aporte_der + menores(con_der, izq) * f_izq
+                self._pares.append((bits * (izquierda + 1), 2 * bits, (1 << 2 * bits) - 1, tabla))
+            else:
+                tabla = array('I', [0]) * ((1 << n) << bits)
+                for vistos in range(1 << n):
+                    for der in range(n):
+                        tabla[(vistos << bits) | der] = menores(vistos, der) * factorial(n - 1 - derecha)
+                self._pares.append((bits * (derecha + 1), bits, self.mascara, tabla))
+            derecha -= 2
+
+        # bits_fichas[par] -> bitmask de las fichas contenidas en ese par de casillas
+        self._bits_fichas = [0] * (1 << 2 * bits)
+        for par in range(1 << 2 * bits):
+            izq, der = par & self.mascara, par >> bits
+            if izq < n and der < n:
+                self._bits_fichas[par] = (1 << izq) | (1 << der)
+
+    def nuevo_registro(self, defecto=0, tipo="B"):
+        """
+        Registro por estado (visitados, movimiento padre, g...) indexado por
+        self.clave(estado): un arreglo plano en el 3x3, un RegistroDisperso si no.
+        """
+        if not self.usa_rango:
+            return RegistroDisperso(defecto)
+        if tipo == "B" and defecto == 0:
+            return bytearray(self.total)
+        return array(tipo, [defecto]) * self.total
+
+    def empaquetar(self, tablero):
+        """ Convierte una lista de fichas en el entero empaquetado. """
+        estado = 0
+        for i in range(self.casillas - 1, -1, -1):
+            estado = (estado << self.bits) | tablero[i]
+        return (estado << self.bits) | tablero.index(0)
+
+    def desempaquetar(self, estado):
+        """ Convierte el entero empaquetado de vuelta en una lista. """
+        tablero = []
+        estado >>= self.bits  # Saltamos el campo del hueco
+        for _ in range(self.casillas):
+            tablero.append(estado & self.mascara)
+            estado >>= self.bits
+        return tablero
+
+    def hueco(self, estado):
+        return estado & self.mascara
+
+    def rango(self, estado):
+        """ Índice denso (código de Lehmer) del tablero, en [0, total). Solo si usa_rango. """
+        bits_fichas = self._bits_fichas
+        vistos = 1 << ((estado >> self._ultima) & self.mascara)
+        r = 0
+        for desplazamiento, ancho_bits, mascara, tabla in self._pares:
+            par = (estado >> desplazamiento) & mascara
+            r += tabla[(vistos << ancho_bits) | par]
+            vistos |= bits_fichas[par]
+        return r
+
+    def desrango(self, r):
+        """ Inverso de rango(): devuelve el estado empaquetado. """
+        disponibles = list(range(self.casillas))
+        tablero = []
+        for i in range(self.casillas - 1, -1, -1):
+            digito, r = divmod(r, factorial(i))
+            tablero.append(disponibles.pop(digito))
+        return self.empaquetar(tablero)
+
+    def aplicar(self, estado, codigo):
+        """ Mueve el hueco según el código de movimiento (ARRIBA, ABAJO, ...). """
+        _, desplazamiento, delta_ficha, salto = self.por_codigo[estado & self.mascara][codigo]
+        return estado + ((estado >> desplazamiento) & self.mascara) * delta_ficha + salto
+
+    def sucesores(self, estado):
+        """ Genera (codigo_movimiento, nuevo_estado) para cada movimiento legal. """
+        for codigo, desplazamiento, delta_ficha, salto in self.movimientos[estado & self.mascara]:
+            ficha = (estado >> desplazamiento) & self.mascara
+            yield codigo, estado + ficha * delta_ficha + salto
+
+    def movimientos_con_deltas(self, distancia=None):
+        """
+        Igual que self.sin_inverso pero cada tupla trae además 'deltas': la
+        variación de la heurística para cada ficha que se mueve, cuando esta solo
+        depende de la ficha y su casilla (distancia(ficha, posicion), como en
+        Manhattan). Así los solvers calculan h del vecino en O(1) a partir de la
+        del padre. Sin 'distancia' el campo queda en None.
+        """
+        tabla = []
+        for hueco, por_ultimo in enumerate(self.sin_inverso):
+            fila = []
+            for movimientos in por_ultimo:
+                con_delta = []
+                for codigo, desplazamiento, delta_ficha, salto in movimientos:
+                    deltas = None
+                    if distancia is not None:
+                        destino = hueco + salto
+                        deltas = (0,) + tuple(distancia(f, hueco) - distancia(f, destino)
+                                              for f in range(1, self.casillas))
+                    con_delta.append((codigo, desplazamiento, delta_ficha, salto, deltas))
+                fila.append(tuple(con_delta))
+            tabla.append(fila)
+        return tabla
+
+    def codigos(self, padres, estado):
+        """
+        Códigos de movimiento desde la raíz hasta 'estado', en orden, leyendo el
+        registro de movimientos padre de atrás hacia adelante (como reconstruir).
+        """
+        codigos = []
+        movimiento = padres[self.clave(estado)]
+        while movimiento != RAIZ:
+            codigos.append(movimiento - 1)
+            estado = self.aplicar(estado, (movimiento - 1) ^ 1)
+            movimiento = padres[self.clave(estado)]
+        codigos.reverse()
+        return codigos
+
+    def tableros(self, estado, codigos):
+        """ Tableros (listas) que se recorren desde 'estado' aplicando los códigos. """
+        camino = [self.desempaquetar(estado)]
+        for codigo in codigos:
+            estado = self.aplicar(estado, codigo)
+            camino.append(self.desempaquetar(estado))
+        return camino
+
+    def reconstruir(self, padres, estado):
+        """
+        Reconstruye el camino hasta 'estado' a partir del registro de movimientos
+        padre (indexado por clave, con codigo + 1 y RAIZ en el inicio). Se deshace
+        cada movimiento desde el final, así que no hace falta guardar tableros.
+        """
+        camino = [estado]
+        movimiento = padres[self.clave(estado)]
+        while movimiento != RAIZ:
+            estado = self.aplicar(estado, (movimiento - 1) ^ 1)  # ^ 1 invierte U<->D y L<->R
+            camino.append(estado)
+            movimiento = padres[self.clave(estado)]
+        return [self.desempaquetar(e) for e in reversed(camino)]
+
+
+@lru_cache(maxsize=None)
+def obtener_motor(ancho=ANCHO):
+    """ Las tablas se construyen una sola vez por proceso y ancho, y se comparten entre solvers. """
+    return MotorPuzzle(ancho)
@@ -0,0 +1,282 @@
+"""
+A* paralelo con reparto por hash (HDA*).
+
+Cada estado tiene un dueño: el proceso trabajador que indica un hash del
+entero empaquetado (motor.py). Cada trabajador guarda la lista abierta y las g
+SOLO de sus estados. Al expandir, los sucesores propios van directo a su lista
+y los ajenos se juntan en lotes por destino que viajan por la cola del dueño;
+así no hay estructuras compartidas que bloquear y todos los núcleos expanden
+a la vez.
+
+El primer camino encontrado ya no tiene por qué ser óptimo (cada trabajador
+avanza a su ritmo): su largo queda como cota compartida ('incumbente') y se
+poda todo lo que tenga g + h >= cota. La búsqueda termina cuando ningún
+trabajador tiene nodos con f menor que la cota y no queda ningún lote en
+viaje. Para saberlo sin un reloj global, cada trabajador cuenta lotes
+enviados y recibidos y marca si está ocioso; el coordinador da por terminada
+la búsqueda cuando dos lecturas seguidas de los contadores coinciden, todos
+los enviados se recibieron y entre una y otra todos estaban ociosos.
+
+    camino = hda_star(inicial, objetivo, trabajadores=8)
+    estadisticas.trabajadores   # expandidos, enviados, recibidos, tiempo ocupado... por proceso
+"""
+import heapq
+import multiprocessing
+import os
+import time
+from queue import Empty
+
+from estadisticas import Estadisticas
+from heuristicas import obtener_heuristica
+from motor import LETRAS, NINGUNO, obtener_motor
+from proyecto import FORMATOS, SIN_G, obtener_ancho
+from validacion import validar_instancia
+
+# Cota inicial: ningún camino es tan largo
+SIN_COTA = 1 << 62
+
+# Expansiones entre dos revisiones de la cola de entrada y de la cota compartida
+EXPANSIONES_POR_VUELTA = 64
+
+_MEZCLA = 0x9E3779B97F4A7C15
+_MASCARA_64 = (1 << 64) - 1
+
+
+def dueño(estado, trabajadores):
+    """
+    Trabajador al que pertenece un estado. El hash de un entero en Python es el
+    propio entero, y sus bits bajos son el hueco: se mezclan con una
+    multiplicación (hash de Fibonacci) para repartir parejo.
+    """
+    return (((estado * _MEZCLA) & _MASCARA_64) >> 32) % trabajadores
+
+
+def _trabajador(indice, trabajadores, objetivo, ancho, heuristica, lote,
+                colas, resultados, enviados, recibidos, ociosos, incumbente):
+    motor = obtener_motor(ancho)
+    heuristica = obtener_heuristica(heuristica, motor.desempaquetar(objetivo), ancho)
+    mascara = motor.mascara
+
+    # Igual que en a_star: deltas de h por ficha si la heurística los ofrece
+    movimientos = heuristica.tabla_movimientos()
+    delta_estado = None
+    if movimientos is None:
+        movimientos = motor.movimientos_con_deltas()
+        delta_estado = heuristica.delta_estado
+
+    g_score = {}
+    padres = {}             # estado -> código del movimiento que lo trajo (NINGUNO en el inicio)
+    abiertos = []           # (f, h, g, estado): a igual f sale el de mayor g
+    salida = [[] for _ in range(trabajadores)]
+    entrada = colas[indice]
+
+    expandidos = generados = nodos_enviados = nodos_recibidos = mejoras = pico_abiertos = 0
+    ocupado = 0.0
+
+    def enviar(destino):
+        # Se cuenta ANTES de poner el lote en la cola: el coordinador nunca ve
+        # un lote recibido que no figure como enviado
+        enviados[indice] += 1
+        colas[destino].put(("nodos", salida[destino]))
+        salida[destino] = []
+
+    cota = SIN_COTA
+    while True:
+        cota = min(cota, incumbente.value)
+        hay_trabajo = bool(abiertos) and abiertos[0][0] < cota
+        if not hay_trabajo:
+            for destino in range(trabajadores):
+                if salida[destino]:
+                    enviar(destino)
+            ociosos[indice] = 1
+
+        try:
+            mensaje = entrada.get_nowait() if hay_trabajo else entrada.get(timeout=0.05)
+        except Empty:
+            mensaje = None
+
+        if mensaje is not None:
+            tipo = mensaje[0]
+            if tipo == "nodos":
+                # Ocupado ANTES de contar el lote como recibido (ver la terminación en hda_star)
+                ociosos[indice] = 0
+                for estado, g, h, codigo in mensaje[1]:
+                    nodos_recibidos += 1
+                    if g + h < cota and g < g_score.get(estado, SIN_G):
+                        g_score[estado] = g
+                        padres[estado] = codigo
+                        heapq.heappush(abiertos, (g + h, h, g, estado))
+                recibidos[indice] += 1
+            elif tipo == "codigo":
+                resultados.put(padres.get(mensaje[1]))
+            elif tipo == "fin":
+                resultados.put({
+                    "trabajador": indice,
+                    "expandidos": expandidos,
+                    "generados": generados,
+                    "mejoras": mejoras,
+                    "enviados": nodos_enviados,
+                    "recibidos": nodos_recibidos,
+                    "cerrados": len(g_score),
+                    "pico_frontera": pico_abiertos,
+                    "ocupado": round(ocupado, 6),
+                })
+                return
+            continue
+
+        if not hay_trabajo:
+            continue
+
+        inicio_vuelta = time.perf_counter()
+        for _ in range(EXPANSIONES_POR_VUELTA):
+            if not abiertos or abiertos[0][0] >= cota:
+                break
+            f, h_actual, g_actual, estado_actual = heapq.heappop(abiertos)
+            if g_actual != g_score[estado_actual]:
+                continue                    # Entrada vieja: el estado mejoró su g después
+
+            if estado_actual == objetivo:
+                with incumbente.get_lock():
+                    if g_actual < incumbente.value:
+                        incumbente.value = g_actual
+                cota = min(cota, g_actual)
+                continue
+
+            expandidos += 1
+            hueco = estado_actual & mascara
+            g_vecino = g_actual + 1
+            opciones = movimientos[hueco][padres[estado_actual]]
+            generados += len(opciones)
+            for codigo, desplazamiento, delta_ficha, salto, deltas in opciones:
+                ficha = (estado_actual >> desplazamiento) & mascara
+                vecino = estado_actual + ficha * delta_ficha + salto
+                if delta_estado is None:
+                    h_vecino = h_actual + deltas[ficha]
+                else:
+                    h_vecino = h_actual + delta_estado(estado_actual, ficha, hueco + salto, hueco)
+                if g_vecino + h_vecino >= cota:
+                    continue
+
+                destino = dueño(vecino, trabajadores)
+                if destino == indice:
+                    if g_vecino < g_score.get(vecino, SIN_G):
+                        g_score[vecino] = g_vecino
+                        padres[vecino] = codigo
+                        mejoras += 1
+                        heapq.heappush(abiertos, (g_vecino + h_vecino, h_vecino, g_vecino, vecino))
+                else:
+                    salida[destino].append((vecino, g_vecino, h_vecino, codigo))
+                    nodos_enviados += 1
+                    if len(salida[destino]) >= lote:
+                        enviar(destino)
+
+        # Los lotes a medio llenar para trabajadores ociosos se mandan ya: mejor
+        # un lote chico que un núcleo esperando
+        for destino in range(trabajadores):
+            if salida[destino] and ociosos[destino]:
+                enviar(destino)
+
+        if len(abiertos) > pico_abiertos:
+            pico_abiertos = len(abiertos)
+        ocupado += time.perf_counter() - inicio_vuelta
+
+
+def hda_star(estado_inicial, estado_objetivo, ancho=None, heuristica="manhattan", trabajadores=None, lote=256,
+             estadisticas=None, formato="tableros"):
+    """
+    A* repartido entre 'trabajadores' procesos (por defecto, uno por núcleo).
+    'lote' es cuántos sucesores se juntan por destino antes de enviarlos: lotes
+    más grandes, menos idas y vueltas entre procesos (con lote=1, un pickle por
+    estado, la comunicación domina: en 4x4 a profundidad ~40 fue 40 veces más
+    lento que con 256). Los lotes a medio llenar salen igual cuando el destino
+    está ocioso. Misma firma y mismo
+    resultado que proyecto.a_star (camino óptimo, con heurística admisible);
+    en estadisticas.trabajadores queda la carga de cada proceso.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("hda_star")
+
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato!r} (disponibles: {', '.join(FORMATOS)})")
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    trabajadores = trabajadores or os.cpu_count()
+    h_inicial = obtener_heuristica(heuristica, estado_objetivo, motor.ancho).evaluar(estado_inicial)
+
+    colas = [multiprocessing.Queue() for _ in range(trabajadores)]
+    resultados = multiprocessing.Queue()
+    # Cada casilla la escribe un solo proceso, así que no hace falta candado;
+    # la última casilla de 'enviados' es la del coordinador (el lote inicial)
+    enviados = multiprocessing.Array("q", trabajadores + 1, lock=False)
+    recibidos = multiprocessing.Array("q", trabajadores, lock=False)
+    ociosos = multiprocessing.Array("b", [1] * trabajadores, lock=False)
+    incumbente = multiprocessing.Value("q", SIN_COTA)
+
+    procesos = [multiprocessing.Process(target=_trabajador, daemon=True,
+                                        args=(i, trabajadores, objetivo, motor.ancho, heuristica, lote, colas,
+                                              resultados, enviados, recibidos, ociosos, incumbente))
+                for i in range(trabajadores)]
+    for proceso in procesos:
+        proceso.start()
+
+    try:
+        estadisticas.fase("busqueda")
+        enviados[trabajadores] = 1
+        colas[dueño(inicio, trabajadores)].put(("nodos", [(inicio, 0, h_inicial, NINGUNO)]))
+
+        # Terminación: contadores iguales en dos lecturas, todo lo enviado
+        # recibido y, entre las dos lecturas, todos ociosos
+        while True:
+            time.sleep(0.001)
+            antes = (sum(enviados), sum(recibidos))
+            if antes[0] != antes[1] or not all(ociosos):
+                if not all(proceso.is_alive() for proceso in procesos):
+                    raise RuntimeError("Un trabajador de hda_star terminó de forma inesperada")
+                continue
+            if (sum(enviados), sum(recibidos)) == antes:
+                break
+
+        camino = None
+        longitud = incumbente.value
+        if longitud != SIN_COTA:
+            # Se reconstruye hacia atrás preguntando a cada dueño por el movimiento que trajo al estado
+            estadisticas.fase("reconstruccion")
+            codigos = []
+            estado = objetivo
+            while True:
+                colas[dueño(estado, trabajadores)].put(("codigo", estado))
+                codigo = resultados.get()
+                if codigo == NINGUNO:
+                    break
+                codigos.append(codigo)
+                estado = motor.aplicar(estado, codigo ^ 1)
+            codigos.reverse()
+            if formato == "movimientos":
+                camino = "".join(LETRAS[c] for c in codigos)
+            else:
+                camino = motor.tableros(inicio, codigos)
+            estadisticas.optimo = True
+
+        for cola in colas:
+            cola.put(("fin",))
+        cargas = sorted((resultados.get() for _ in procesos), key=lambda carga: carga["trabajador"])
+    finally:
+        for proceso in procesos:
+            proceso.join(timeout=1)
+            if proceso.is_alive():
+                proceso.terminate()
+
+    estadisticas.trabajadores = cargas
+    expandidos = sum(c["expandidos"] for c in cargas)
+    generados = sum(c["generados"] for c in cargas)
+    cerrados = sum(c["cerrados"] for c in cargas)
+    estadisticas.terminar(expandidos, generados, generados - cerrados, sum(c["pico_frontera"] for c in cargas),
+                          cerrados, generados + 1)
+    return camino
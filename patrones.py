@@ -0,0 +1,371 @@
+"""
+Bases de datos de patrones (PDB) aditivas para el puzzle de NxN.
+
+Cada grupo de fichas (un "patrón") tiene su tabla: para cada colocación posible
+de esas fichas, el mínimo número de movimientos DE ESAS FICHAS necesarios para
+llevarlas a su lugar. Como los grupos son disjuntos y solo se cuentan los
+movimientos de las fichas del grupo, los valores de todos los grupos se pueden
+sumar y la heurística sigue siendo admisible.
+
+Las tablas se calculan con un BFS hacia atrás desde el objetivo sobre los
+estados abstractos (posiciones de las fichas del grupo + región del hueco) y se
+guardan en un archivo que cada proceso mapea en memoria en solo lectura, así
+varios procesos comparten una sola copia.
+
+Con otro objetivo que tenga el hueco en la misma órbita que el de las tablas
+(ver canonico.py) se transforma cada tablero antes de consultarlas.
+
+La construcción es Python puro y tarda del orden de 80-90 µs por entrada de la
+tabla (perm(casillas, fichas del grupo) entradas): el 3x3 completo unos
+segundos, un grupo de 5 fichas del 4x4 unos 45 s y uno de 6 (5,8 millones de
+entradas) del orden de 10 minutos, así que la 6-6-3 por defecto del 4x4 lleva
+unos 20 minutos. Se hace una sola vez: después solo se mapea el archivo.
+
+Uso:
+    python patrones.py construir --ancho 3 [--salida pdb_3x3.bin]
+    python patrones.py construir --ancho 4 --grupos 1,5,6,9,10,13/7,8,11,12,14,15/2,3,4
+"""
+import argparse
+import json
+import mmap
+import os
+import time
+from functools import lru_cache
+from math import perm
+
+from canonico import HeuristicaCanonica, transformaciones
+from heuristicas import Heuristica, registrar_heuristica
+
+FIRMA = b"PDBPZ1\n"
+SIN_VALOR = 255
+
+# Particiones por ancho: el 3x3 completo en un solo grupo y la clásica 6-6-3 del 15-puzzle
+GRUPOS_POR_DEFECTO = {
+    3: [(1, 2, 3, 4, 5, 6, 7, 8)],
+    4: [(1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)],
+}
+
+
+def ruta_por_defecto(ancho):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"pdb_{ancho}x{ancho}.bin")
+
+
+def _objetivo_estandar(ancho):
+    return list(range(1, ancho * ancho)) + [0]
+
+
+def _mascaras_vecinas(ancho):
+    """ vecinas[celda] -> bitmask con las celdas adyacentes. """
+    vecinas = []
+    for celda in range(ancho * ancho):
+        fila, col = divmod(celda, ancho)
+        mascara = 0
+        if fila > 0:
+            mascara |= 1 << (celda - ancho)
+        if fila < ancho - 1:
+            mascara |= 1 << (celda + ancho)
+        if col > 0:
+            mascara |= 1 << (celda - 1)
+        if col < ancho - 1:
+            mascara |= 1 << (celda + 1)
+        vecinas.append(mascara)
+    return vecinas
+
+
+def _multiplicadores(casillas, k):
+    """ Pesos del rango lexicográfico de k posiciones distintas entre 'casillas'. """
+    return tuple(perm(casillas - 1 - i, k - 1 - i) for i in range(k))
+
+
+def _indice(posiciones, multiplicadores):
+    """ Rango de la colocación (p1, ..., pk) en [0, casillas! / (casillas - k)!). """
+    indice = 0
+    usadas = 0
+    for posicion, multiplicador in zip(posiciones, multiplicadores):
+        indice += (posicion - (usadas & ((1 << posicion) - 1)).bit_count()) * multiplicador
+        usadas |= 1 << posicion
+    return indice
+
+
+def construir_grupo(grupo, estado_objetivo, ancho):
+    """
+    BFS hacia atrás desde el objetivo para un grupo de fichas. Los movimientos
+    del hueco entre celdas libres cuestan 0, así que un estado abstracto es
+    (posiciones del grupo, región del hueco): al expandirlo se rellena la región
+    y cada ficha del grupo que la toca puede entrar en ella con costo 1.
+    Devuelve un bytearray indexado por _indice(posiciones). El tiempo crece con
+    el tamaño de la tabla (ver el docstring del módulo).
+    """
+    casillas = ancho * ancho
+    k = len(grupo)
+    vecinas = _mascaras_vecinas(ancho)
+    multiplicadores = _multiplicadores(casillas, k)
+    tamaño = perm(casillas, k)
+
+    tabla = bytearray([SIN_VALOR]) * tamaño
+    # Bitsets sobre (indice, celda): estados ya encolados y regiones ya expandidas
+    encolados = bytearray((tamaño * casillas + 7) // 8)
+    expandidos = bytearray((tamaño * casillas + 7) // 8)
+
+    inicio = tuple(estado_objetivo.index(f) for f in grupo)
+    capa = [(inicio, estado_objetivo.index(0))]
+    profundidad = 0
+
+    while capa:
+        siguiente = []
+        for posiciones, hueco in capa:
+            indice = _indice(posiciones, multiplicadores)
+            ocupadas = 0
+            for p in posiciones:
+                ocupadas |= 1 << p
+
+            # Región del hueco: celdas libres alcanzables sin mover fichas del grupo
+            region = 1 << hueco
+            borde = region
+            while borde:
+                nuevas = 0
+                while borde:
+                    celda = borde & -borde
+                    nuevas |= vecinas[celda.bit_length() - 1]
+                    borde ^= celda
+                nuevas &= ~ocupadas & ~region
+                region |= nuevas
+                borde = nuevas
+
+            representante = indice * casillas + (region & -region).bit_length() - 1
+            if expandidos[representante >> 3] & (1 << (representante & 7)):
+                continue
+            expandidos[representante >> 3] |= 1 << (representante & 7)
+
+            if tabla[indice] == SIN_VALOR:
+                tabla[indice] = profundidad
+
+            # Cada ficha del grupo junto a la región puede moverse a ella (costo 1)
+            for i, p in enumerate(posiciones):
+                destinos = vecinas[p] & region
+                while destinos:
+                    celda = destinos & -destinos
+                    destinos ^= celda
+                    nuevas_posiciones = posiciones[:i] + (celda.bit_length() - 1,) + posiciones[i + 1:]
+                    clave = _indice(nuevas_posiciones, multiplicadores) * casillas + p
+                    if not encolados[clave >> 3] & (1 << (clave & 7)):
+                        encolados[clave >> 3] |= 1 << (clave & 7)
+                        siguiente.append((nuevas_posiciones, p))
+        capa = siguiente
+        profundidad += 1
+
+    return tabla
+
+
+def construir_patrones(ancho=3, grupos=None, estado_objetivo=None):
+    """ Construye las tablas de todos los grupos (deben ser disjuntos). """
+    grupos = [tuple(g) for g in (grupos or GRUPOS_POR_DEFECTO[ancho])]
+    estado_objetivo = list(estado_objetivo or _objetivo_estandar(ancho))
+    fichas = [f for g in grupos for f in g]
+    if len(fichas) != len(set(fichas)) or not set(fichas) <= set(range(1, ancho * ancho)):
+        raise ValueError("Los grupos deben ser disjuntos y contener solo fichas del tablero")
+    return [construir_grupo(g, estado_objetivo, ancho) for g in grupos]
+
+
+def guardar_patrones(ruta, tablas, ancho=3, grupos=None, estado_objetivo=None):
+    grupos = [list(g) for g in (grupos or GRUPOS_POR_DEFECTO[ancho])]
+    cabecera = {
+        "ancho": ancho,
+        "objetivo": list(estado_objetivo or _objetivo_estandar(ancho)),
+        "grupos": grupos,
+        "tamaños": [len(t) for t in tablas],
+    }
+    with open(ruta, "wb") as archivo:
+        archivo.write(FIRMA)
+        archivo.write(json.dumps(cabecera).encode() + b"\n")
+        for tabla in tablas:
+            archivo.write(tabla)
+
+
+class HeuristicaPatrones(Heuristica):
+    """
+    Heurística de PDB aditiva mapeada en memoria. Se usa como
+    a_star(..., heuristica=HeuristicaPatrones(ruta)), o por nombre
+    ("patrones") si el archivo está en ruta_por_defecto(ancho).
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mapa[:len(FIRMA)] != FIRMA:
+            self._mapa.close()
+            raise ValueError(f"{ruta} no es una base de datos de patrones")
+
+        fin_cabecera = self._mapa.find(b"\n", len(FIRMA))
+        cabecera = json.loads(self._mapa[len(FIRMA):fin_cabecera])
+        super().__init__(cabecera["objetivo"], cabecera["ancho"])
+        self.grupos = [tuple(g) for g in cabecera["grupos"]]
+
+        casillas = self.ancho * self.ancho
+        vista = memoryview(self._mapa)
+        desplazamiento = fin_cabecera + 1
+        self.tablas = []
+        for tamaño in cabecera["tamaños"]:
+            self.tablas.append(vista[desplazamiento:desplazamiento + tamaño])
+            desplazamiento += tamaño
+
+        self._multiplicadores = [_multiplicadores(casillas, len(g)) for g in self.grupos]
+        # grupo_de[ficha] -> índice del grupo que la contiene (None si no está en ninguno)
+        # ranura[ficha] -> lugar de la ficha dentro de su grupo (su posición en el rango)
+        self._grupo_de = [None] * casillas
+        self._ranura = [None] * casillas
+        for g, grupo in enumerate(self.grupos):
+            for r, ficha in enumerate(grupo):
+                self._grupo_de[ficha] = g
+                self._ranura[ficha] = r
+        # Desplazamiento de cada casilla en un estado empaquetado (motor.py)
+        self._desplazamientos = [self.motor.bits * (casilla + 1) for casilla in range(casillas)]
+        # Rango de cada grupo en el último estado expandido: a_star pide los deltas
+        # de todos sus hijos seguidos, así que se calcula una vez por expansión
+        self._padre = None
+        self._posiciones_padre = None
+        self._indices_padre = None
+
+    def _desde_posiciones(self, posicion):
+        """ posicion[ficha] -> casilla. Suma los valores de todos los grupos. """
+        total = 0
+        for grupo, tabla, multiplicadores in zip(self.grupos, self.tablas, self._multiplicadores):
+            total += tabla[_indice([posicion[f] for f in grupo], multiplicadores)]
+        return total
+
+    def evaluar(self, tablero):
+        """ Valor heurístico de un tablero (lista). """
+        posicion = [0] * len(tablero)
+        for i, ficha in enumerate(tablero):
+            posicion[ficha] = i
+        return self._desde_posiciones(posicion)
+
+    def evaluar_estado(self, estado):
+        """ Valor heurístico de un estado empaquetado (ver motor.py). """
+        motor = self.motor
+        posicion = [0] * motor.casillas
+        estado >>= motor.bits
+        for i in range(motor.casillas):
+            posicion[estado & motor.mascara] = i
+            estado >>= motor.bits
+        return self._desde_posiciones(posicion)
+
+    def _cambio(self, g, indice, fichas, ficha, desde, hasta):
+        """
+        Cambio del valor del grupo 'g' cuando 'ficha' pasa de 'desde' a 'hasta';
+        'indice' es el rango del grupo antes del movimiento y 'fichas(i)' la
+        ficha de la casilla i. En vez de rehacer el rango se corrige el actual:
+        el término de la ficha cambia en (hasta - desde) y solo las fichas del
+        grupo entre 'desde' y 'hasta' (ninguna en un movimiento horizontal)
+        cambian cuántas posiciones menores ven antes o después de ella.
+        """
+        tabla, multiplicadores = self.tablas[g], self._multiplicadores[g]
+        ranura = self._ranura
+        r = ranura[ficha]
+        nuevo = indice + (hasta - desde) * multiplicadores[r]
+        if hasta - desde not in (1, -1):
+            paso = 1 if hasta > desde else -1
+            grupo_de = self._grupo_de
+            for casilla in range(desde + paso, hasta, paso):
+                otra = fichas(casilla)
+                if grupo_de[otra] == g:
+                    if ranura[otra] < r:
+                        nuevo -= paso * multiplicadores[r]
+                    else:
+                        nuevo += paso * multiplicadores[ranura[otra]]
+        return tabla[nuevo] - tabla[indice]
+
+    def delta(self, tablero, ficha, desde, hasta):
+        """
+        Cambio de h cuando 'ficha' pasa de 'desde' a 'hasta' (tablero ANTES del
+        movimiento). Solo cambia el grupo de esa ficha.
+        """
+        g = self._grupo_de[ficha]
+        if g is None:
+            return 0
+        grupo_de, ranura = self._grupo_de, self._ranura
+        posiciones = [0] * len(self.grupos[g])
+        for i, f in enumerate(tablero):
+            if grupo_de[f] == g:
+                posiciones[ranura[f]] = i
+        indice = _indice(posiciones, self._multiplicadores[g])
+        return self._cambio(g, indice, tablero.__getitem__, ficha, desde, hasta)
+
+    def delta_estado(self, estado, ficha, desde, hasta):
+        """ Como delta, leyendo las fichas del estado empaquetado sin desempaquetarlo. """
+        g = self._grupo_de[ficha]
+        if g is None:
+            return 0
+        mascara, desplazamientos = self.motor.mascara, self._desplazamientos
+        if estado != self._padre:
+            grupo_de, ranura, bits = self._grupo_de, self._ranura, self.motor.bits
+            posiciones = [[0] * len(grupo) for grupo in self.grupos]
+            resto = estado >> bits
+            for i in range(self.motor.casillas):
+                f = resto & mascara
+                if grupo_de[f] is not None:
+                    posiciones[grupo_de[f]][ranura[f]] = i
+                resto >>= bits
+            self._padre, self._posiciones_padre = estado, posiciones
+            self._indices_padre = [None] * len(self.grupos)
+        indice = self._indices_padre[g]
+        if indice is None:
+            indice = self._indices_padre[g] = _indice(self._posiciones_padre[g], self._multiplicadores[g])
+        return self._cambio(g, indice, lambda i: (estado >> desplazamientos[i]) & mascara,
+                            ficha, desde, hasta)
+
+    def cerrar(self):
+        for tabla in self.tablas:
+            tabla.release()
+        self._mapa.close()
+
+
+@lru_cache(maxsize=None)
+def cargar_patrones(ruta):
+    """ Una sola copia mapeada por proceso y por archivo. """
+    return HeuristicaPatrones(ruta)
+
+
+@registrar_heuristica("patrones")
+def patrones_por_defecto(estado_objetivo, ancho):
+    ruta = ruta_por_defecto(ancho)
+    if not os.path.exists(ruta):
+        # ValueError como cualquier otra heurística mal pedida: la CLI y lotes.py lo informan sin traza
+        raise ValueError(f"No existe la base de datos de patrones {ruta}; "
+                         f"se construye con: python patrones.py construir --ancho {ancho}")
+    heuristica = cargar_patrones(ruta)
+    if heuristica.objetivo == list(estado_objetivo):
+        return heuristica
+    transformacion = transformaciones(estado_objetivo, ancho)[0]
+    if transformacion.aplicar(estado_objetivo) != heuristica.objetivo:
+        raise ValueError("La base de datos de patrones se construyó para un objetivo con el hueco en otra órbita")
+    return HeuristicaCanonica(heuristica, transformacion)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bases de datos de patrones aditivas")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    construir = subcomandos.add_parser("construir", help="Calcula las tablas y las guarda en disco")
+    construir.add_argument("--ancho", type=int, default=3)
+    construir.add_argument("--grupos", help="Grupos de fichas separados por '/', ej. 1,2,3/4,5,6")
+    construir.add_argument("--salida")
+    args = parser.parse_args()
+
+    grupos = None
+    if args.grupos:
+        grupos = [tuple(int(f) for f in g.split(",")) for g in args.grupos.split("/")]
+    salida = args.salida or ruta_por_defecto(args.ancho)
+
+    inicio = time.perf_counter()
+    tablas = construir_patrones(args.ancho, grupos)
+    duracion = time.perf_counter() - inicio
+    guardar_patrones(salida, tablas, args.ancho, grupos)
+
+    for grupo, tabla in zip(grupos or GRUPOS_POR_DEFECTO[args.ancho], tablas):
+        maximo = max(v for v in tabla if v != SIN_VALOR)
+        print(f"Grupo {grupo}: {len(tabla)} entradas, máximo {maximo}")
+    print(f"Construida en {duracion:.2f} s -> {salida}")
+
+
+if __name__ == "__main__":
+    main()
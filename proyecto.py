@@ -1,34 +1,80 @@
+import argparse
+import heapq
+import json
+import sys
+import time
 from collections import deque
-import heapq 
+from math import isqrt
 
-def imprimir_tablero(estado):
+from fronteras import FronteraPonderada, crear_frontera
+from heuristicas import obtener_heuristica
+from motor import LETRAS, NINGUNO, RAIZ, obtener_motor
+from estadisticas import Estadisticas
+from validacion import Irresoluble, validar_instancia
+import patrones  # Registra la heurística "patrones" (PDB) en heuristicas.py
+
+# Valor de g para estados aún no descubiertos en A* (cabe en dos bytes)
+SIN_G = 0xFFFF
+
+# f de las ramas que SMA* ya no puede seguir (más profundas de lo que cabe en memoria)
+INFINITO = float("inf")
+
+# Lo que devuelven los solvers: la lista de tableros o solo los movimientos del hueco ("UDLR...")
+FORMATOS = ("tableros", "movimientos")
+
+def obtener_ancho(estado, ancho=None):
+    """ Ancho del tablero. Si no se indica se deduce del largo (9 -> 3, 16 -> 4, 25 -> 5). """
+    return ancho if ancho is not None else isqrt(len(estado))
+
+def formatear_tablero(estado, ancho=None):
     """ 
-    Muestra un tablero de 3x3 a partir de una lista de 9 elementos.
-    Los numeros del 1 al 8 representan las fichas y el 0 representa el espacio vacío.
+    Texto de un tablero de NxN (3x3 por defecto) a partir de una lista de N*N elementos,
+    una fila por línea. Los numeros del 1 al N*N-1 representan las fichas y "_" el espacio vacío.
     """
-    for i in range(9):
-        valor = estado[i] if estado[i] != 0 else "_"
-        end_char = "\n" if (i+1) % 3 == 0 else " "
-        print(valor, end=end_char)
+    ancho = obtener_ancho(estado, ancho)
+    relleno = len(str(ancho * ancho - 1))      # Para que las columnas queden alineadas en el 4x4 y 5x5
+    celdas = [(str(ficha) if ficha != 0 else "_").rjust(relleno) for ficha in estado]
+    return "\n".join(" ".join(celdas[i:i + ancho]) for i in range(0, len(celdas), ancho))
+
+def imprimir_tablero(estado, ancho=None, archivo=None):
+    """ Muestra un tablero (ver formatear_tablero) con un solo print. """
+    print(formatear_tablero(estado, ancho), file=archivo)
+
+def escribir_camino(camino, archivo, ancho=None, separador="------"):
+    """
+    Escribe todos los tableros de un camino en 'archivo'. Se arma el texto por
+    bloques y se escribe de una vez por bloque: con caminos de miles de pasos
+    (DFS) un print por casilla cuesta más que la búsqueda.
+    """
+    bloque = []
+    for paso in camino:
+        bloque.append(separador)
+        bloque.append(formatear_tablero(paso, ancho))
+        if len(bloque) >= 2048:
+            archivo.write("\n".join(bloque) + "\n")
+            bloque = []
+    if bloque:
+        archivo.write("\n".join(bloque) + "\n")
 
 def posicion_hueco(estado):
     """ Devuelve el índice del hueco (0). """
     return estado.index(0)
 
-def posibles_movimientos(estado):
+def posibles_movimientos(estado, ancho=None):
     """ """
-    hueco = posicion_hueco(estado)  #Nos dice en que posición se encuentra el 0 o el hueco
-    fila, col = divmod(hueco, 3)    #Se sacan las filas y columnas, el indice, para más adelante ver hacia donde se puede mover
+    ancho = obtener_ancho(estado, ancho)
+    hueco = posicion_hueco(estado)      #Nos dice en que posición se encuentra el 0 o el hueco
+    fila, col = divmod(hueco, ancho)    #Se sacan las filas y columnas, el indice, para más adelante ver hacia donde se puede mover
     movimientos = []
 
     # Mas adelante aqui xd
     if fila > 0:  # Arriba
-        movimientos.append(-3)
-    if fila < 2:  # Abajo
-        movimientos.append(+3)
+        movimientos.append(-ancho)
+    if fila < ancho - 1:  # Abajo
+        movimientos.append(+ancho)
     if col > 0:  # Izquierda
         movimientos.append(-1)
-    if col < 2:  # Derecha
+    if col < ancho - 1:  # Derecha
         movimientos.append(+1)
 
     return movimientos
@@ -45,159 +91,1124 @@ def aplicar_movimiento(estado, movimiento):
     return nuevo_estado
 
 # BFS (Búsqueda en Anchura)
-def bfs(estado_inicial, estado_objetivo):
-    queve = deque()
-    visitados = set()
-    padres = {}
+def bfs(estado_inicial, estado_objetivo, ancho=None, estadisticas=None, formato="tableros"):
+    # Todos los solvers llenan un objeto Estadisticas (ver estadisticas.py), el que
+    # pasó el llamador o uno propio que se descarta
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("bfs")
+
+    # Tableros mal formados -> ValueError; paridades distintas -> Irresoluble sin buscar
+    _comprobar_formato(formato)
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    # Internamente cada tablero es un entero empaquetado (ver motor.py)
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    movimientos = motor.sin_inverso
+    mascara = motor.mascara
+    clave = motor.clave
+
+    # En la cola va (estado << 3) | ultimo_movimiento, asi no volvemos a generar al padre
+    queve = deque([(inicio << 3) | NINGUNO])
+    # Un byte por permutación: 0 = no visitado, codigo + 1 = movimiento que nos trajo
+    # (en tableros de 4x4 en adelante es un diccionario, ver motor.nuevo_registro)
+    padres = motor.nuevo_registro()
+    padres[clave(inicio)] = RAIZ
 
-    queve.append(estado_inicial)
-    visitados.add(tuple(estado_inicial))
-    padres[tuple(estado_inicial)] = None
+    # Contadores locales; se copian a 'estadisticas' al terminar o al avisar
+    expandidos = generados = nuevos = 0
+    pico_frontera = 1
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
 
     while queve:
-        estado_actual = queve.popleft()
-
-        if estado_actual == estado_objetivo:
-            camino = []
-            while estado_actual:
-                camino.append(estado_actual)
-                estado_actual = padres[tuple(estado_actual)]
-            return camino[::-1]
-        
-        for movimiento in posibles_movimientos(estado_actual):
-            vecino = aplicar_movimiento(estado_actual, movimiento)
-            tupla_vecino = tuple(vecino)
-
-            if tupla_vecino not in visitados:
-                visitados.add(tupla_vecino)
-                padres[tupla_vecino] = estado_actual
-                queve.append(vecino)
+        entrada = queve.popleft()
+        estado_actual = entrada >> 3
+
+        if estado_actual == objetivo:
+            estadisticas.fase("reconstruccion")
+            camino = _resultado(motor, inicio, motor.codigos(padres, estado_actual), formato)
+            estadisticas.optimo = True
+            estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+            return camino
+
+        expandidos += 1
+        if expandidos == proximo_aviso:
+            proximo_aviso = estadisticas.avisar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+
+        opciones = movimientos[estado_actual & mascara][entrada & 7]
+        generados += len(opciones)
+        for codigo, desplazamiento, delta_ficha, salto in opciones:
+            vecino = estado_actual + ((estado_actual >> desplazamiento) & mascara) * delta_ficha + salto
+            r = clave(vecino)
 
+            if not padres[r]:
+                padres[r] = codigo + 1
+                nuevos += 1
+                queve.append((vecino << 3) | codigo)
+
+        if len(queve) > pico_frontera:
+            pico_frontera = len(queve)
+
+    estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+    return None
+
+# BFS bidireccional
+def bfs_bidireccional(estado_inicial, estado_objetivo, ancho=None, estadisticas=None, formato="tableros"):
+    """
+    BFS desde el inicio y desde el objetivo a la vez, expandiendo cada vez una capa
+    completa de la frontera más chica. Cuando un estado recién descubierto ya fue
+    visto por el otro lado se unen los dos caminos. Como cada lado revisa al otro
+    en el momento de descubrir un estado, el primer encuentro da el camino más
+    corto. Devuelve lo mismo que bfs con aproximadamente la raíz de los nodos.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("bidireccional")
+
+    _comprobar_formato(formato)
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    movimientos = motor.sin_inverso
+    mascara = motor.mascara
+    clave = motor.clave
+
+    if inicio == objetivo:
+        estadisticas.optimo = True
+        estadisticas.terminar(0, 0, 0, 1, 1)
+        return _resultado(motor, inicio, [], formato)
+
+    # Un registro de movimientos padre por lado (ida desde el inicio, vuelta desde el objetivo)
+    padres_ida = motor.nuevo_registro()
+    padres_vuelta = motor.nuevo_registro()
+    padres_ida[clave(inicio)] = RAIZ
+    padres_vuelta[clave(objetivo)] = RAIZ
+    frontera_ida = [(inicio << 3) | NINGUNO]
+    frontera_vuelta = [(objetivo << 3) | NINGUNO]
+
+    expandidos = generados = nuevos = 0
+    pico_frontera = 2
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
+
+    while frontera_ida and frontera_vuelta:
+        ida = len(frontera_ida) <= len(frontera_vuelta)
+        if ida:
+            frontera, padres, otros = frontera_ida, padres_ida, padres_vuelta
+        else:
+            frontera, padres, otros = frontera_vuelta, padres_vuelta, padres_ida
+
+        siguiente = []
+        for entrada in frontera:
+            estado_actual = entrada >> 3
+            expandidos += 1
+            if expandidos == proximo_aviso:
+                proximo_aviso = estadisticas.avisar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 2)
+
+            opciones = movimientos[estado_actual & mascara][entrada & 7]
+            generados += len(opciones)
+            for codigo, desplazamiento, delta_ficha, salto in opciones:
+                vecino = estado_actual + ((estado_actual >> desplazamiento) & mascara) * delta_ficha + salto
+                r = clave(vecino)
+
+                if not padres[r]:
+                    padres[r] = codigo + 1
+                    nuevos += 1
+                    if otros[r]:
+                        # Se encontraron: inicio -> vecino por la ida y vecino -> objetivo por la vuelta
+                        estadisticas.fase("reconstruccion")
+                        # (la vuelta se recorre al revés, así que cada movimiento se invierte)
+                        codigos = motor.codigos(padres_ida, vecino)
+                        codigos += [c ^ 1 for c in reversed(motor.codigos(padres_vuelta, vecino))]
+                        estadisticas.optimo = True
+                        estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 2)
+                        return _resultado(motor, inicio, codigos, formato)
+                    siguiente.append((vecino << 3) | codigo)
+
+        if ida:
+            frontera_ida = siguiente
+        else:
+            frontera_vuelta = siguiente
+        if len(frontera_ida) + len(frontera_vuelta) > pico_frontera:
+            pico_frontera = len(frontera_ida) + len(frontera_vuelta)
+
+    estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 2)
     return None
 
 # DFS (Búsqueda en Profundidad)
-def dfs(estado_inicial, estado_objetivo):
+def dfs(estado_inicial, estado_objetivo, ancho=None, estadisticas=None, formato="tableros"):
     """
     Búsqueda no informada. Usa una pila (LIFO).
     No garantiza el camino más corto.
     """
-    pila = [estado_inicial] 
-    visitados = {tuple(estado_inicial)}             # Asi no repetimos estados
-    
-    # Es clave para reconstruir el camino ya que almacena el rastro, el camino que lo llevó ahi
-    # El estado inicial no tiene padre (es None)
-    padres = {tuple(estado_inicial): None}
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("dfs")
+
+    _comprobar_formato(formato)
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    mascara = motor.mascara
+    clave = motor.clave
+    # Invertimos la tabla una sola vez en lugar de llamar a 'reversed' en cada expansión,
+    # asi el primer vecino es el último en salir y esa rama se explora primero (profundidad)
+    movimientos = [[tuple(reversed(m)) for m in por_ultimo] for por_ultimo in motor.sin_inverso]
+
+    pila = [(inicio << 3) | NINGUNO]                # (estado << 3) | ultimo movimiento: el padre no se vuelve a generar
+
+    # Es clave para reconstruir el camino ya que almacena el rastro, el movimiento que lo llevó ahi
+    # Un byte por permutación (indexado por rango); el inicial se marca como RAIZ.
+    # Tambien sirve para no repetir estados (0 = no visitado)
+    padres = motor.nuevo_registro()
+    padres[clave(inicio)] = RAIZ
+
+    expandidos = generados = nuevos = 0
+    pico_frontera = 1
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
 
     while pila:
-        estado_actual = pila.pop()                  # Extraemos el último estado añadido (LIFO). Esto define la "Profundidad"
-        
-        if estado_actual == estado_objetivo:        #Vemos si está bien o si es la respuesta
-            camino = []                             # iniciamos el backtracking
-            e = estado_actual                       # Empezamos el rastreo desde el objetivo
-            
-            while e:                                # El bucle se detiene cuando 'e' llega al estado inicial, cuyo padre es None
-                camino.append(e)                    # Añadimos el estado al camino (en orden inverso)
-                e = padres[tuple(e)]                # Buscamos el estado predecesor (padre) usando la tupla como clave
- 
-            return camino[::-1]
-        
+        entrada = pila.pop()                        # Extraemos el último estado añadido (LIFO). Esto define la "Profundidad"
+        estado_actual = entrada >> 3
+
+        if estado_actual == objetivo:               # Vemos si está bien o si es la respuesta
+            estadisticas.fase("reconstruccion")
+            # Backtracking desde el objetivo hasta el inicio
+            camino = _resultado(motor, inicio, motor.codigos(padres, estado_actual), formato)
+            estadisticas.optimo = False
+            estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+            return camino
+
+        expandidos += 1
+        if expandidos == proximo_aviso:
+            proximo_aviso = estadisticas.avisar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+
         # Iteramos sobre los movimientos posibles (Arriba, Abajo, Izq, Der)
-        # Usamos 'reversed' para que el primer vecino sea el último en salir, asi se explora esa rama primero y logramos rofundidad
-        for movimiento in reversed(posibles_movimientos(estado_actual)): 
-            
-            vecino = aplicar_movimiento(estado_actual, movimiento)          # Aplicamos el movimiento para obtener el nuevo tablero
-            tupla_vecino = tuple(vecino)
+        opciones = movimientos[estado_actual & mascara][entrada & 7]
+        generados += len(opciones)
+        for codigo, desplazamiento, delta_ficha, salto in opciones:
+
+            # Aplicamos el movimiento para obtener el nuevo tablero (un entero, sin copiar listas)
+            vecino = estado_actual + ((estado_actual >> desplazamiento) & mascara) * delta_ficha + salto
+            r = clave(vecino)
 
             # Filtrado y Registro del Nuevo Estado
-            if tupla_vecino not in visitados:
-                visitados.add(tupla_vecino)             # Si el vecino es nuevo, lo registramos para no visitarlo dos veces
-                padres[tupla_vecino] = estado_actual    # Establecemos el estado actual como el "padre" del nuevo estado
-                
-                pila.append(vecino)
+            if not padres[r]:
+                padres[r] = codigo + 1              # Guardamos con qué movimiento llegamos desde el "padre"
+                nuevos += 1
+
+                pila.append((vecino << 3) | codigo)
 
+        if len(pila) > pico_frontera:
+            pico_frontera = len(pila)
+
+    estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
     return None         # Si la pila se vacía entonces no hay solución
 
+# DFS con límite de profundidad y DFS por profundización iterativa
+def _dfs_con_limite(motor, inicio, objetivo, limite, estadisticas, cuenta):
+    """
+    DFS sin recursión hasta 'limite' movimientos. Solo guarda la rama actual: la
+    pila de estados (hacer = apilar el vecino, deshacer = desapilarlo), los
+    códigos y el conjunto de estados de la rama para no entrar en ciclos.
+    Los estados de otras ramas no se recuerdan, así que la memoria es O(limite).
+    'cuenta' = [expandidos, generados, duplicados, pico_frontera, proximo_aviso]
+    se actualiza en el lugar para sumar entre iteraciones.
+    Devuelve (codigos o None, si alguna rama se cortó por el límite).
+    """
+    if inicio == objetivo:
+        return [], False
+    if limite < 1:
+        return None, True
+
+    movimientos = motor.sin_inverso
+    mascara = motor.mascara
+    expandidos, generados, duplicados, pico_frontera, proximo_aviso = cuenta
+
+    rama = [inicio]                         # Estados de la rama actual
+    codigos = []                            # Movimientos que llevan del inicio a rama[-1]
+    en_rama = {inicio}
+    pila = [iter(movimientos[inicio & mascara][NINGUNO])]
+    expandidos += 1
+    cortado = False
+    resultado = None
+
+    while pila:
+        movimiento = next(pila[-1], None)
+        if movimiento is None:
+            # Sin más opciones: deshacemos el último movimiento
+            pila.pop()
+            if codigos:
+                codigos.pop()
+                en_rama.discard(rama.pop())
+            continue
+
+        codigo, desplazamiento, delta_ficha, salto = movimiento
+        estado = rama[-1]
+        vecino = estado + ((estado >> desplazamiento) & mascara) * delta_ficha + salto
+        generados += 1
+
+        if vecino in en_rama:
+            duplicados += 1                 # Ciclo dentro de la rama
+            continue
+        if vecino == objetivo:
+            codigos.append(codigo)
+            resultado = codigos
+            break
+        if len(codigos) + 1 >= limite:
+            cortado = True                  # Habría que seguir más allá del límite
+            continue
+
+        # Hacemos el movimiento
+        rama.append(vecino)
+        codigos.append(codigo)
+        en_rama.add(vecino)
+        pila.append(iter(movimientos[vecino & mascara][codigo]))
+        if len(rama) > pico_frontera:
+            pico_frontera = len(rama)
+
+        expandidos += 1
+        if expandidos == proximo_aviso:
+            proximo_aviso = estadisticas.avisar(expandidos, generados, duplicados, pico_frontera, 0)
+
+    cuenta[:] = [expandidos, generados, duplicados, pico_frontera, proximo_aviso]
+    return resultado, cortado
+
+def dfs_limitado(estado_inicial, estado_objetivo, ancho=None, limite=31, estadisticas=None, formato="tableros"):
+    """
+    DFS que no baja más de 'limite' movimientos (31 es el diámetro del 8-puzzle).
+    Memoria O(limite), pero el camino no tiene por qué ser el más corto.
+    Devuelve None si no hay solución dentro del límite.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("dfs_limitado")
+
+    _comprobar_formato(formato)
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    cuenta = [0, 0, 0, 1, estadisticas.primer_aviso()]
+    estadisticas.fase("busqueda")
+
+    codigos, _ = _dfs_con_limite(motor, inicio, motor.empaquetar(estado_objetivo), limite, estadisticas, cuenta)
+
+    if codigos is None:
+        estadisticas.terminar(*cuenta[:4])
+        return None
+    estadisticas.fase("reconstruccion")
+    estadisticas.optimo = False
+    estadisticas.terminar(*cuenta[:4])
+    return _resultado(motor, inicio, codigos, formato)
+
+def iddfs(estado_inicial, estado_objetivo, ancho=None, limite_maximo=None, estadisticas=None, formato="tableros"):
+    """
+    DFS por profundización iterativa: dfs_limitado con límites crecientes. La
+    primera solución es la más corta (como BFS) con la memoria de un DFS. Cada
+    movimiento cambia el color de la casilla del hueco (como en un tablero de
+    ajedrez), así que el largo de cualquier solución tiene la misma paridad que la
+    distancia Manhattan del hueco entre inicio y objetivo: los límites van de 2 en 2.
+    Sin 'limite_maximo' sigue hasta encontrarla (la instancia ya se validó).
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("iddfs")
+
+    _comprobar_formato(formato)
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    fila_ini, col_ini = divmod(estado_inicial.index(0), motor.ancho)
+    fila_obj, col_obj = divmod(estado_objetivo.index(0), motor.ancho)
+    limite = abs(fila_ini - fila_obj) + abs(col_ini - col_obj)
+
+    cuenta = [0, 0, 0, 1, estadisticas.primer_aviso()]
+    estadisticas.fase("busqueda")
+
+    while limite_maximo is None or limite <= limite_maximo:
+        codigos, cortado = _dfs_con_limite(motor, inicio, objetivo, limite, estadisticas, cuenta)
+        if codigos is not None:
+            estadisticas.fase("reconstruccion")
+            estadisticas.optimo = True
+            estadisticas.terminar(*cuenta[:4])
+            return _resultado(motor, inicio, codigos, formato)
+        if not cortado:
+            break                           # Se recorrió todo sin tocar el límite
+        limite += 2
+
+    estadisticas.terminar(*cuenta[:4])
+    return None
+
 
 #---------------------------------------------------------------------------------
 #//////////////////////////A* con Heuristica Manhattan////////////////////////////
 #---------------------------------------------------------------------------------
 
-def a_star(estado_inicial, estado_objetivo):
-    
-    cola_prioridad = []
-    
-    g_score = {tuple(estado_inicial): 0}
-    
-    h_inicial = distancia_manhattan(estado_inicial, estado_objetivo)
-    f_score = {tuple(estado_inicial): h_inicial}
-    
-    padres = {tuple(estado_inicial): None}
-    
-    conjunto_cerrado = set()
-    
-    heapq.heappush(cola_prioridad, (h_inicial, estado_inicial))
+def a_star(estado_inicial, estado_objetivo, ancho=None, heuristica="manhattan", frontera="heap",
+           peso=1, cota=None, estadisticas=None, formato="tableros"):
+    """
+    'heuristica' es un nombre registrado en heuristicas.py ("manhattan",
+    "conflictos", "caminata", "patrones") o una instancia de Heuristica.
+    'frontera' es la lista abierta: "heap" o "cubetas" (ver fronteras.py).
+    Con peso > 1 ordena por g + peso * h (A* ponderado): encuentra un camino
+    mucho antes, pero solo garantiza que mide a lo sumo peso * el óptimo.
+    Con 'cota' solo busca caminos de menos de 'cota' movimientos y devuelve None
+    si no los hay (lo usa a_star_anytime para podar con la mejor solución).
+    Como todos los solvers, llena 'estadisticas' si se pasa (ver estadisticas.py)
+    y con formato="movimientos" devuelve solo el texto "UDLR..." (movimientos
+    del hueco) en lugar de la lista de tableros.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("a_star")
+
+    _comprobar_formato(formato)
+    if peso < 1:
+        raise ValueError("El peso de la heurística debe ser al menos 1")
+    if peso != 1 and frontera != "heap":
+        raise ValueError("Con peso distinto de 1 la frontera es siempre un montículo")
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    mascara = motor.mascara
+    clave = motor.clave
+    heuristica = obtener_heuristica(heuristica, estado_objetivo, motor.ancho)
 
-    while cola_prioridad:
-        f_actual, estado_actual = heapq.heappop(cola_prioridad)
-        tupla_actual = tuple(estado_actual)
-        
-        if tupla_actual in conjunto_cerrado:
+    # Si la heurística lo permite (Manhattan) cada movimiento trae la variación de h
+    # por ficha: h del vecino en O(1). Si no, se pide el delta a la heurística
+    movimientos = heuristica.tabla_movimientos()
+    delta_estado = None
+    if movimientos is None:
+        movimientos = motor.movimientos_con_deltas()
+        delta_estado = heuristica.delta_estado
+
+    cola_prioridad = crear_frontera(frontera) if peso == 1 else FronteraPonderada(peso)
+    agregar = cola_prioridad.agregar
+    actualizar = cola_prioridad.actualizar
+    sacar = cola_prioridad.sacar
+
+    # Registros indexados por clave en lugar de diccionarios de tuplas:
+    # g (SIN_G = aún no descubierto), movimiento padre y bandera de cerrado
+    g_score = motor.nuevo_registro(SIN_G, "H")
+    padres = motor.nuevo_registro()
+    conjunto_cerrado = motor.nuevo_registro()
+
+    h_inicial = heuristica.evaluar(estado_inicial)
+    # Con h admisible, ningún estado con g + h >= cota lleva a un camino más corto que la cota
+    limite_f = cota if cota is not None else INFINITO
+
+    r_inicio = clave(inicio)
+    g_score[r_inicio] = 0
+    padres[r_inicio] = RAIZ
+
+    # A igual f la frontera prefiere el de mayor g (el más profundo)
+    if h_inicial < limite_f:
+        agregar(inicio, 0, h_inicial)
+
+    # 'mejoras' = vecinos con una g mejor (a cada uno se le calcula h); 'reabiertos' = cerrados que mejoraron
+    expandidos = generados = mejoras = reabiertos = 0
+    pico_frontera = 1
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
+
+    while True:
+        nodo = sacar()
+        if nodo is None:
+            break
+        estado_actual, g_actual, h_actual = nodo
+        r_actual = clave(estado_actual)
+
+        # Entradas viejas (solo en "heap"): ya cerrado o con una g peor que la que conocemos ahora
+        if conjunto_cerrado[r_actual] or g_actual != g_score[r_actual]:
             continue
 
-        conjunto_cerrado.add(tupla_actual)
-
-        if estado_actual == estado_objetivo:
-            camino = []
-            e = estado_actual
-            while e:
-                camino.append(e)
-                e = padres[tuple(e)]
-            return camino[::-1]
-
-        for movimiento in posibles_movimientos(estado_actual):
-            vecino = aplicar_movimiento(estado_actual, movimiento)
-            tupla_vecino = tuple(vecino)
-            
-            if tupla_vecino in conjunto_cerrado:
-                continue
-            
-            g_tentativo = g_score[tupla_actual] + 1 
-            
-            if tupla_vecino not in g_score or g_tentativo < g_score[tupla_vecino]:
-                
-                g_score[tupla_vecino] = g_tentativo
-                h_vecino = distancia_manhattan(vecino, estado_objetivo)
-                f_score[tupla_vecino] = g_tentativo + h_vecino
-                
-                
-                padres[tupla_vecino] = estado_actual
-                
-                heapq.heappush(cola_prioridad, (f_score[tupla_vecino], vecino))
+        conjunto_cerrado[r_actual] = 1
+
+        if estado_actual == objetivo:
+            estadisticas.fase("reconstruccion")
+            camino = _resultado(motor, inicio, motor.codigos(padres, estado_actual), formato)
+            estadisticas.optimo = peso == 1
+            estadisticas.terminar(expandidos, generados, generados - mejoras, pico_frontera,
+                                  expandidos + 1 - reabiertos, mejoras + 1)
+            return camino
+
+        expandidos += 1
+        if expandidos == proximo_aviso:
+            proximo_aviso = estadisticas.avisar(expandidos, generados, generados - mejoras, pico_frontera,
+                                                expandidos - reabiertos, mejoras + 1)
+
+        g_tentativo = g_actual + 1
+        ultimo = padres[r_actual] - 1 if padres[r_actual] != RAIZ else NINGUNO
+        hueco = estado_actual & mascara
+
+        opciones = movimientos[hueco][ultimo]
+        generados += len(opciones)
+        for codigo, desplazamiento, delta_ficha, salto, deltas in opciones:
+            ficha = (estado_actual >> desplazamiento) & mascara
+            vecino = estado_actual + ficha * delta_ficha + salto
+            r = clave(vecino)
+
+            # Con Manhattan (consistente) un estado cerrado nunca mejora su g. Con
+            # heurísticas inconsistentes (p. ej. PDBs) puede pasar, y se reabre
+            g_viejo = g_score[r]
+            if g_tentativo < g_viejo:
 
+                if delta_estado is None:
+                    h_vecino = h_actual + deltas[ficha]
+                else:
+                    h_vecino = h_actual + delta_estado(estado_actual, ficha, hueco + salto, hueco)
+                mejoras += 1
+                if g_tentativo + h_vecino >= limite_f:
+                    continue
+
+                g_score[r] = g_tentativo
+                if conjunto_cerrado[r]:
+                    conjunto_cerrado[r] = 0
+                    reabiertos += 1
+
+                padres[r] = codigo + 1
+
+                if g_viejo == SIN_G:
+                    agregar(vecino, g_tentativo, h_vecino)
+                else:
+                    actualizar(vecino, g_viejo, g_tentativo, h_vecino)  # Decrease-key
+
+        if len(cola_prioridad) > pico_frontera:
+            pico_frontera = len(cola_prioridad)
+
+    estadisticas.terminar(expandidos, generados, generados - mejoras, pico_frontera,
+                          expandidos - reabiertos, mejoras + 1)
     return None 
 
-def distancia_manhattan(estado, estado_objetivo):
-    
-    distancia = 0
-    
-    for i in range(9):
-        if estado[i] != 0:  
-            fila_actual, col_actual = divmod(i, 3)
-            
-            valor = estado[i]
-            posicion_objetivo = estado_objetivo.index(valor)
-            fila_objetivo, col_objetivo = divmod(posicion_objetivo, 3)
-            
-            distancia += abs(fila_actual - fila_objetivo) + abs(col_actual - col_objetivo)
-    
-    return distancia
+#---------------------------------------------------------------------------------
+#////////////////////////////A* anytime (con plazo)///////////////////////////////
+#---------------------------------------------------------------------------------
+
+class _PlazoVencido(Exception):
+    pass
+
+
+def a_star_anytime(estado_inicial, estado_objetivo, ancho=None, heuristica="manhattan",
+                   pesos=(5, 3, 2, 1.5, 1.25, 1), limite_tiempo=None, estadisticas=None, formato="tableros"):
+    """
+    Generador: corre a_star con los pesos de 'pesos' (de mayor a menor) y va
+    entregando cada camino MÁS CORTO que el anterior. Cada corrida se poda con
+    el largo de la mejor solución (cota), así las siguientes solo buscan
+    mejoras. La corrida con peso 1 termina la búsqueda: o encuentra el óptimo o
+    demuestra que el último camino entregado ya lo era.
+
+    'limite_tiempo' (segundos) corta la búsqueda en curso cuando se vence y el
+    generador termina. Al terminar, estadisticas.optimo dice si el último camino
+    entregado es óptimo; los contadores suman todas las corridas.
+
+    Si la instancia no tiene solución se entrega una sola vez el Irresoluble de
+    validar_instancia (falso, como en los demás solvers), así no se confunde
+    con un plazo vencido antes del primer camino.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("a_star_anytime")
+
+    _comprobar_formato(formato)
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        yield problema
+        return
+
+    plazo = time.perf_counter() + limite_tiempo if limite_tiempo is not None else None
+
+    def revisar_plazo(corrida):
+        if time.perf_counter() > plazo:
+            raise _PlazoVencido
+
+    # La corrida avisa cada 1000 expandidos (unos milisegundos) para revisar el plazo
+    corrida = Estadisticas(aviso=revisar_plazo if plazo is not None else None, cada=1000)
+    totales = [0] * 6       # expandidos, generados, duplicados, pico frontera, pico cerrados, llamadas h
+    cota = None
+    estadisticas.fase("busqueda")
+
+    for peso in pesos:
+        if plazo is not None and time.perf_counter() > plazo:
+            break
+        vencido = False
+        try:
+            camino = a_star(estado_inicial, estado_objetivo, ancho, heuristica, peso=peso, cota=cota,
+                            estadisticas=corrida, formato=formato)
+        except _PlazoVencido:
+            vencido = True
+        for i, valor in enumerate((corrida.expandidos, corrida.generados, corrida.duplicados)):
+            totales[i] += valor
+        totales[3] = max(totales[3], corrida.pico_frontera)
+        totales[4] = max(totales[4], corrida.pico_cerrados)
+        totales[5] += corrida.llamadas_heuristica
+        estadisticas.anotar(*totales)
+
+        if vencido:
+            break
+        if corrida.optimo is None:
+            # La corrida agotó todo lo que podía mejorar la cota (a_star reabre
+            # estados, así que vale con cualquier peso): el último camino es óptimo
+            estadisticas.optimo = True
+            break
+
+        cota = len(camino) - 1 if formato == "tableros" else len(camino)
+        estadisticas.optimo = corrida.optimo
+        yield camino
+        if corrida.optimo or cota == 0:
+            break
+
+    estadisticas.terminar(*totales)
+
+
+def a_star_con_plazo(estado_inicial, estado_objetivo, limite_tiempo, ancho=None, heuristica="manhattan",
+                     al_mejorar=None, estadisticas=None, formato="tableros"):
+    """
+    El mejor camino que a_star_anytime consigue en 'limite_tiempo' segundos (None
+    si no llegó a ninguno, Irresoluble si no hay solución). 'al_mejorar(camino)'
+    se llama con cada mejora.
+    """
+    mejor = None
+    for camino in a_star_anytime(estado_inicial, estado_objetivo, ancho, heuristica,
+                                 limite_tiempo=limite_tiempo, estadisticas=estadisticas, formato=formato):
+        if not camino:
+            return camino                   # Irresoluble
+        mejor = camino
+        if al_mejorar is not None:
+            al_mejorar(camino)
+    return mejor
+
+#---------------------------------------------------------------------------------
+#/////////////////////////////////IDA* (A* iterativo)/////////////////////////////
+#---------------------------------------------------------------------------------
+
+def ida_star(estado_inicial, estado_objetivo, ancho=None, heuristica="manhattan", estadisticas=None,
+             formato="tableros"):
+    """
+    A* por profundización iterativa: DFS acotado por f = g + h, subiendo la cota
+    al menor f que la superó. No guarda abiertos, cerrados ni padres, solo el
+    camino actual, así que la memoria es lineal en la profundidad (sirve para el
+    15-puzzle). El tablero es una única lista que se modifica y se restaura.
+    'heuristica' funciona igual que en a_star; h se actualiza en cada movimiento
+    con la tabla de deltas por ficha o con heuristica.delta(tablero, ...).
+    En las estadísticas la frontera es la rama actual y no hay cerrados.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("ida_star")
+
+    _comprobar_formato(formato)
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    heuristica = obtener_heuristica(heuristica, estado_objetivo, motor.ancho)
+    # movimientos[hueco][ultimo]: sin el movimiento que deshace el anterior, y si se
+    # puede con la variación de h por ficha para actualizarla en O(1)
+    movimientos = heuristica.tabla_movimientos()
+    delta = None
+    if movimientos is None:
+        movimientos = motor.movimientos_con_deltas()
+        delta = heuristica.delta
+
+    tablero = list(estado_inicial)
+    objetivo = list(estado_objetivo)                 # Puede venir como tupla: se compara lista con lista
+    hueco = tablero.index(0)
+    h = heuristica.evaluar(tablero)
+    limite = h
+
+    if h == 0 and tablero == objetivo:
+        estadisticas.optimo = True
+        estadisticas.terminar(0, 0, 0, 0, 0, 1)
+        return _resultado(motor, motor.empaquetar(tablero), [], formato)
+
+    # Sumados sobre todas las iteraciones; cada sucesor generado es una llamada a la heurística
+    expandidos = generados = profundidad_maxima = 0
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
+
+    while True:
+        siguiente_limite = None
+        camino = []                                  # Movimientos aplicados (la rama actual)
+        alturas = []                                 # h antes de cada movimiento, para deshacer
+        g = 0
+        pila = [iter(movimientos[hueco][NINGUNO])]   # Opciones pendientes en cada nivel
+
+        while pila:
+            movimiento = next(pila[-1], None)
+
+            if movimiento is None:
+                # Sin más opciones en este nivel: deshacemos el último movimiento
+                pila.pop()
+                if camino:
+                    salto = camino.pop()[3]
+                    tablero[hueco] = tablero[hueco - salto]
+                    tablero[hueco - salto] = 0
+                    hueco -= salto
+                    h = alturas.pop()
+                    g -= 1
+                continue
+
+            codigo, _, _, salto, deltas = movimiento
+            generados += 1
+            destino = hueco + salto
+            ficha = tablero[destino]
+            if delta is None:
+                h_nuevo = h + deltas[ficha]
+            else:
+                h_nuevo = h + delta(tablero, ficha, destino, hueco)
+            f = g + 1 + h_nuevo
+
+            if f > limite:
+                if siguiente_limite is None or f < siguiente_limite:
+                    siguiente_limite = f
+                continue
+
+            # Hacemos el movimiento sobre el mismo tablero
+            tablero[hueco] = ficha
+            tablero[destino] = 0
+            hueco = destino
+            alturas.append(h)
+            h = h_nuevo
+            g += 1
+            camino.append(movimiento)
+            if g > profundidad_maxima:
+                profundidad_maxima = g
+
+            if h == 0 and tablero == objetivo:
+                estadisticas.fase("reconstruccion")
+                resultado = _resultado(motor, motor.empaquetar(estado_inicial), [m[0] for m in camino], formato)
+                estadisticas.optimo = True
+                estadisticas.terminar(expandidos, generados, 0, profundidad_maxima, 0, generados + 1)
+                return resultado
+
+            expandidos += 1
+            if expandidos == proximo_aviso:
+                proximo_aviso = estadisticas.avisar(expandidos, generados, 0, profundidad_maxima, 0, generados + 1)
+
+            pila.append(iter(movimientos[hueco][codigo]))
+
+        if siguiente_limite is None:
+            estadisticas.terminar(expandidos, generados, 0, profundidad_maxima, 0, generados + 1)
+            return None
+        limite = siguiente_limite
+
+#---------------------------------------------------------------------------------
+#////////////////////////////Búsquedas con memoria acotada//////////////////////////
+#---------------------------------------------------------------------------------
+
+class _NodoSMA:
+    """ Nodo del árbol de SMA*. 'olvidados' guarda {codigo: cota f} de los hijos borrados. """
+    __slots__ = ("estado", "g", "h", "f", "padre", "codigo", "hijos", "olvidados", "expandido", "vivo")
+
+    def __init__(self, estado, g, h, f, padre, codigo):
+        self.estado = estado
+        self.g = g
+        self.h = h
+        self.f = f
+        self.padre = padre
+        self.codigo = codigo
+        self.hijos = 0              # Hijos que siguen en memoria
+        self.olvidados = None
+        self.expandido = False
+        self.vivo = True
+
+    def cota(self):
+        """ Mejor f pendiente: la propia si no se expandió, si no la de los hijos olvidados. """
+        if not self.expandido:
+            return self.f
+        return min(self.olvidados.values()) if self.olvidados else INFINITO
+
+def sma_star(estado_inicial, estado_objetivo, ancho=None, heuristica="manhattan", max_nodos=100_000,
+             estadisticas=None, formato="tableros"):
+    """
+    A* con memoria acotada (SMA*): nunca guarda más de 'max_nodos' nodos (más los
+    hijos de la expansión en curso). Cuando se llena olvida la peor hoja (mayor f
+    y, entre esas, la menos profunda) y su padre se queda con esa f como cota de lo
+    olvidado; si esa cota vuelve a ser la mejor, el padre regenera esos hijos.
+    Busca en árbol (solo evita volver al padre), así que un tablero puede repetirse.
+
+    Es óptimo si el camino óptimo cabe en memoria (profundidad < max_nodos); las
+    ramas más profundas se cortan. estadisticas.optimo dice si quedó demostrado.
+    Si no encuentra solución dentro del límite devuelve None.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("sma_star")
+
+    _comprobar_formato(formato)
+    if max_nodos < 2:
+        raise ValueError("max_nodos debe ser al menos 2")
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    mascara = motor.mascara
+    heuristica = obtener_heuristica(heuristica, estado_objetivo, motor.ancho)
+    movimientos = heuristica.tabla_movimientos()
+    delta_estado = None
+    if movimientos is None:
+        movimientos = motor.movimientos_con_deltas()
+        delta_estado = heuristica.delta_estado
+
+    profundidad_maxima = max_nodos - 1       # Un camino más largo no entra en memoria
+    f_cortado = INFINITO                     # Menor f real de las ramas cortadas por profundidad
+
+    h_inicial = heuristica.evaluar(estado_inicial)
+    raiz = _NodoSMA(inicio, 0, h_inicial, h_inicial, None, NINGUNO)
+
+    # Dos montículos con entradas perezosas (se validan al sacarlas):
+    # abiertos por (cota, -g) -> el mejor nodo a expandir, el más profundo a igual f
+    # hojas por (-cota, g)    -> la peor hoja a olvidar, la menos profunda a igual f
+    secuencia = 0
+    abiertos = [(h_inicial, 0, secuencia, raiz)]
+    hojas = []
+    en_memoria = 1
+
+    expandidos = generados = llamadas = 0
+    pico_abiertos = pico_memoria = 1
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
+
+    while abiertos:
+        cota, _, _, nodo = heapq.heappop(abiertos)
+        if not nodo.vivo or cota != nodo.cota():
+            continue                                    # Entrada vieja
+        if cota == INFINITO:
+            break
+
+        if not nodo.expandido and nodo.estado == objetivo:
+            estadisticas.fase("reconstruccion")
+            codigos = []
+            while nodo.padre is not None:
+                codigos.append(nodo.codigo)
+                nodo = nodo.padre
+            codigos.reverse()
+            # Todo lo pendiente tiene cota >= cota >= g: solo las ramas cortadas podían ser mejores
+            estadisticas.optimo = len(codigos) <= f_cortado or len(codigos) == h_inicial
+            estadisticas.terminar(expandidos, generados, 0, pico_abiertos, pico_memoria, llamadas + 1)
+            return _resultado(motor, inicio, codigos, formato)
+
+        expandidos += 1
+        if expandidos == proximo_aviso:
+            proximo_aviso = estadisticas.avisar(expandidos, generados, 0, pico_abiertos, pico_memoria, llamadas + 1)
+
+        # Primera expansión: todos los hijos; después, solo los olvidados (con su cota)
+        estado = nodo.estado
+        hueco = estado & mascara
+        if nodo.expandido:
+            pendientes = nodo.olvidados
+        else:
+            pendientes = {m[0]: 0 for m in movimientos[hueco][nodo.codigo]}
+            nodo.expandido = True
+        nodo.olvidados = {}
+
+        g = nodo.g + 1
+        for codigo, desplazamiento, delta_ficha, salto, deltas in movimientos[hueco][nodo.codigo]:
+            if codigo not in pendientes:
+                continue
+            ficha = (estado >> desplazamiento) & mascara
+            vecino = estado + ficha * delta_ficha + salto
+            if delta_estado is None:
+                h = nodo.h + deltas[ficha]
+            else:
+                h = nodo.h + delta_estado(estado, ficha, hueco + salto, hueco)
+            llamadas += 1
+            generados += 1
+
+            # La f de un hijo nunca es menor que la del padre ni que la cota con la que se olvidó
+            f = max(g + h, nodo.f, pendientes[codigo])
+            if g >= profundidad_maxima and vecino != objetivo:
+                f_cortado = min(f_cortado, f)
+                f = INFINITO
+
+            hijo = _NodoSMA(vecino, g, h, f, nodo, codigo)
+            nodo.hijos += 1
+            en_memoria += 1
+            secuencia += 1
+            heapq.heappush(abiertos, (f, -g, secuencia, hijo))
+            heapq.heappush(hojas, (-f, g, secuencia, hijo))
+
+        # Memoria llena: se olvidan las peores hojas y el padre guarda su cota
+        while en_memoria > max_nodos:
+            menos_cota, _, _, hoja = heapq.heappop(hojas)
+            if not hoja.vivo or hoja.hijos or -menos_cota != hoja.cota():
+                continue
+            padre = hoja.padre
+            padre.olvidados[hoja.codigo] = hoja.cota()
+            padre.hijos -= 1
+            hoja.vivo = False
+            en_memoria -= 1
+            secuencia += 1
+            heapq.heappush(abiertos, (padre.cota(), -padre.g, secuencia, padre))
+            if not padre.hijos and padre.padre is not None:
+                heapq.heappush(hojas, (-padre.cota(), padre.g, secuencia, padre))
+
+        if en_memoria > pico_memoria:
+            pico_memoria = en_memoria
+        if len(abiertos) > pico_abiertos:
+            pico_abiertos = len(abiertos)
+        # Las entradas viejas de los montículos también ocupan memoria: se compactan de vez en cuando
+        if len(abiertos) > 4 * max_nodos:
+            abiertos = [e for e in abiertos if e[3].vivo and e[0] == e[3].cota()]
+            heapq.heapify(abiertos)
+        if len(hojas) > 4 * max_nodos:
+            hojas = [e for e in hojas if e[3].vivo and not e[3].hijos and -e[0] == e[3].cota()]
+            heapq.heapify(hojas)
+
+    estadisticas.terminar(expandidos, generados, 0, pico_abiertos, pico_memoria, llamadas + 1)
+    return None
+
+def busqueda_haz(estado_inicial, estado_objetivo, ancho=None, heuristica="manhattan", ancho_haz=1000,
+                 estadisticas=None, formato="tableros"):
+    """
+    Búsqueda en haz: BFS por capas que solo conserva los 'ancho_haz' estados de
+    menor h de cada capa. La memoria queda en ancho_haz estados por nivel (más
+    los ya vistos), pero el camino puede no ser óptimo y puede no encontrar
+    solución (devuelve None). estadisticas.optimo es True solo si el largo
+    coincide con h(inicio), que es una cota inferior.
+    """
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar("haz")
+
+    _comprobar_formato(formato)
+    if ancho_haz < 1:
+        raise ValueError("ancho_haz debe ser al menos 1")
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return problema
+
+    motor = obtener_motor(obtener_ancho(estado_inicial, ancho))
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = motor.empaquetar(estado_objetivo)
+    mascara = motor.mascara
+    clave = motor.clave
+    heuristica = obtener_heuristica(heuristica, estado_objetivo, motor.ancho)
+    movimientos = heuristica.tabla_movimientos()
+    delta_estado = None
+    if movimientos is None:
+        movimientos = motor.movimientos_con_deltas()
+        delta_estado = heuristica.delta_estado
+
+    h_inicial = heuristica.evaluar(estado_inicial)
+    # capas[d][i] = (estado, h, indice del padre en la capa d - 1, codigo)
+    capas = [[(inicio, h_inicial, -1, NINGUNO)]]
+    vistos = motor.nuevo_registro()
+    vistos[clave(inicio)] = 1
+
+    expandidos = generados = nuevos = 0
+    pico_frontera = 1
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
+
+    encontrado = inicio == objetivo
+    while capas[-1] and not encontrado:
+        candidatos = []
+        for i, (estado, h, _, ultimo) in enumerate(capas[-1]):
+            expandidos += 1
+            if expandidos == proximo_aviso:
+                proximo_aviso = estadisticas.avisar(expandidos, generados, generados - nuevos,
+                                                    pico_frontera, nuevos + 1, nuevos + 1)
+            hueco = estado & mascara
+            opciones = movimientos[hueco][ultimo]
+            generados += len(opciones)
+            for codigo, desplazamiento, delta_ficha, salto, deltas in opciones:
+                ficha = (estado >> desplazamiento) & mascara
+                vecino = estado + ficha * delta_ficha + salto
+                r = clave(vecino)
+                if vistos[r]:
+                    continue
+                vistos[r] = 1
+                nuevos += 1
+                if delta_estado is None:
+                    h_vecino = h + deltas[ficha]
+                else:
+                    h_vecino = h + delta_estado(estado, ficha, hueco + salto, hueco)
+                candidatos.append((h_vecino, vecino, i, codigo))
+                if vecino == objetivo:
+                    candidatos = [candidatos[-1]]
+                    encontrado = True
+                    break
+            if encontrado:
+                break
+
+        if len(candidatos) > ancho_haz:
+            candidatos = heapq.nsmallest(ancho_haz, candidatos)
+        capas.append([(vecino, h, i, codigo) for h, vecino, i, codigo in candidatos])
+        if len(candidatos) > pico_frontera:
+            pico_frontera = len(candidatos)
+
+    if not encontrado:
+        estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1, nuevos + 1)
+        return None
+
+    estadisticas.fase("reconstruccion")
+    codigos = []
+    i = 0                                   # El objetivo es el único de la última capa
+    for capa in reversed(capas[1:]):
+        _, _, i, codigo = capa[i]
+        codigos.append(codigo)
+    codigos.reverse()
+    estadisticas.optimo = len(codigos) == h_inicial
+    estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1, nuevos + 1)
+    return _resultado(motor, inicio, codigos, formato)
+
+def _comprobar_formato(formato):
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato!r} (disponibles: {', '.join(FORMATOS)})")
+
+def _resultado(motor, inicio, codigos, formato):
+    """
+    Lo que devuelve un solver a partir de los códigos de movimiento: la lista de
+    tableros (reproduciendo los movimientos desde el inicio) o el texto "UDLR...".
+    Ojo: con "movimientos", si el inicio ya es el objetivo se devuelve "", que es
+    falso igual que Irresoluble; para distinguirlos usar isinstance(..., Irresoluble).
+    """
+    if formato == "movimientos":
+        return "".join(LETRAS[c] for c in codigos)
+    return motor.tableros(inicio, codigos)
+
+def distancia_manhattan(estado, estado_objetivo, ancho=None):
+    """
+    Suma de distancias Manhattan. Las distancias por ficha se precalculan una vez
+    por objetivo (ver heuristicas.Manhattan), sin index() por ficha en cada llamada.
+    """
+    return obtener_heuristica("manhattan", estado_objetivo, obtener_ancho(estado, ancho)).evaluar(estado)
 
 #---------------------------------------------------------------------------------
 #---------------------------------------------------------------------------------
 
-def main():
+# Solvers que se pueden elegir desde la línea de comandos
+ALGORITMOS = {
+    "bfs": bfs,
+    "bidireccional": bfs_bidireccional,
+    "dfs": dfs,
+    "iddfs": iddfs,
+    "a_star": a_star,
+    "ida_star": ida_star,
+    "sma_star": sma_star,
+    "haz": busqueda_haz,
+}
+CON_HEURISTICA = ("a_star", "ida_star", "sma_star", "haz")
+
+# Qué se escribe: los tableros, el texto "UDLR...", un objeto JSON o solo las estadísticas
+SALIDAS = ("tableros", "movimientos", "json", "estadisticas")
+
+ESTADO_INICIAL_POR_DEFECTO = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+
+
+def _tablero(texto):
+    """ "8,6,7,2,5,4,3,0,1" -> lista (para argparse). """
+    try:
+        return [int(ficha) for ficha in texto.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tablero inválido: {texto!r} (se esperan números separados por comas)")
+
+
+def estado_resultado(camino):
+    """
+    "resuelto", "irresoluble" (Irresoluble: la instancia no tiene solución) o
+    "sin_solucion" (None: la instancia es resoluble pero la búsqueda no halló
+    el camino, por ejemplo un haz angosto o una cota corta).
+    """
+    if isinstance(camino, Irresoluble):
+        return "irresoluble"
+    # Con "movimientos" un camino vacío ("") también es falso: no se mira la verdad
+    return "sin_solucion" if camino is None else "resuelto"
+
+
+def resolver(algoritmo, estado_inicial, estado_objetivo, heuristica="manhattan", salida="tableros",
+             archivo=sys.stdout):
+    """
+    Corre 'algoritmo' (nombre de ALGORITMOS) y escribe el resultado en 'archivo'
+    según 'salida' (ver SALIDAS). Devuelve True si encontró un camino.
+    """
+    solver = ALGORITMOS[algoritmo]
+    opciones = {"heuristica": heuristica} if algoritmo in CON_HEURISTICA else {}
+    estadisticas = Estadisticas()
+    # Salvo para dibujar los tableros basta con el texto de movimientos (no se arma la lista)
+    formato = "tableros" if salida == "tableros" else "movimientos"
+    camino = solver(estado_inicial, estado_objetivo, estadisticas=estadisticas, formato=formato, **opciones)
+    estado = estado_resultado(camino)
+    resuelto = estado == "resuelto"
+    motivo = camino.motivo if isinstance(camino, Irresoluble) else None
+    longitud = (len(camino) - 1 if formato == "tableros" else len(camino)) if resuelto else None
+
+    if salida == "json":
+        documento = {
+            "algoritmo": algoritmo,
+            "inicial": estado_inicial,
+            "objetivo": estado_objetivo,
+            "estado": estado,
+            "longitud": longitud,
+            "movimientos": camino if resuelto else None,
+            "estadisticas": estadisticas.como_dict(),
+        }
+        if motivo is not None:
+            documento["motivo"] = motivo
+        archivo.write(json.dumps(documento, ensure_ascii=False) + "\n")
+        return resuelto
+
+    if salida == "tableros" and resuelto:
+        escribir_camino(camino, archivo)
+    elif salida == "movimientos" and resuelto:
+        archivo.write(camino + "\n")
+    elif salida == "estadisticas":
+        for clave, valor in estadisticas.como_dict().items():
+            if clave != "trabajadores":
+                archivo.write(f"{clave}: {valor}\n")
+
+    if resuelto:
+        print(f"Solución de {longitud} movimientos ({algoritmo}, {estadisticas.tiempo_total:.3f} s, "
+              f"{estadisticas.expandidos} expandidos)", file=sys.stderr)
+    else:
+        print(f"Sin solución: {motivo or 'la búsqueda no encontró un camino'}", file=sys.stderr)
+    return resuelto
+
+
+def menu():
+    """ El menú interactivo de siempre (es lo que corre sin argumentos). """
     estado_objetivo = [1, 2, 3, 4, 5, 6, 7, 8, 0]  
-    estado_inicial = [8, 6, 7, 2, 5, 4, 3, 0, 1] 
+    estado_inicial = ESTADO_INICIAL_POR_DEFECTO
     
     print("\n--- 8-Puzzle Solucionador ---")
     print("Estado Inicial:")
@@ -207,33 +1218,49 @@ def main():
     print("1: BFS (Búsqueda en Anchura)")
     print("2: DFS (Búsqueda en Profundidad)")
     print("3: A* (A-Star)")
-    opcion = input("\nIntroduce el número de la opción (1-4): ")
+    opcion = input("\nIntroduce el número de la opción (1-3): ")
 
-    solver = None
-    algoritmo_nombre = ""
-    
-    if opcion == '1':
-        solver = bfs
-        algoritmo_nombre = "BFS"
-    elif opcion == '2':
-        solver = dfs
-        algoritmo_nombre = "DFS"
-    elif opcion == '4':
-        solver = a_star
-        algoritmo_nombre = "A*"
-    else:
+    opciones = {"1": "bfs", "2": "dfs", "3": "a_star"}
+    if opcion.strip() not in opciones:
         print("Opción no válida. Terminando programa.")
         return
     
-    # Ejecuta el algoritmo seleccionado
-    camino = solver(estado_inicial, estado_objetivo)
-    
-    # Muestra cada paso del camino
-    for i, paso in enumerate(camino):
-    #   print(f"--- Paso {i} ---") -> por si queremos poner cada paso
-        print("------")
-        imprimir_tablero(paso)
-    print(f"\n¡Solución encontrada en {len(camino)-1} movimientos!")
+    # Ejecuta el algoritmo seleccionado y muestra cada paso del camino
+    resolver(opciones[opcion.strip()], estado_inicial, estado_objetivo)
+
+
+def main(argumentos=None):
+    argumentos = sys.argv[1:] if argumentos is None else argumentos
+    if not argumentos:
+        menu()
+        return 0
+
+    parser = argparse.ArgumentParser(
+        description="Resuelve un puzzle deslizante de NxN. Sin argumentos muestra el menú interactivo.")
+    parser.add_argument("--algoritmo", choices=ALGORITMOS, default="a_star")
+    parser.add_argument("--heuristica", default="manhattan",
+                        help="Para a_star, ida_star, sma_star y haz (ver heuristicas.py)")
+    parser.add_argument("--inicial", type=_tablero, default=ESTADO_INICIAL_POR_DEFECTO,
+                        help="Tablero inicial separado por comas (0 = hueco)")
+    parser.add_argument("--objetivo", type=_tablero,
+                        help="Tablero objetivo (por defecto 1, 2, ..., N*N-1, 0)")
+    parser.add_argument("--salida", choices=SALIDAS, default="tableros", help="Qué escribir")
+    parser.add_argument("--archivo", default="-", help="Dónde escribirlo ('-' = stdout)")
+    args = parser.parse_args(argumentos)
+
+    objetivo = args.objetivo or list(range(1, len(args.inicial))) + [0]
+    # Todo pasa por un único búfer grande que se vuelca al final (o cuando se llena)
+    if args.archivo == "-":
+        archivo = open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=1 << 20, closefd=False)
+    else:
+        archivo = open(args.archivo, "w", encoding="utf-8", buffering=1 << 20)
+    try:
+        resuelto = resolver(args.algoritmo, args.inicial, objetivo, args.heuristica, args.salida, archivo)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        archivo.close()
+    return 0 if resuelto else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
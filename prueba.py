@@ -1,79 +1,169 @@
 from collections import deque
+import argparse
+import heapq
 import random
 import time
 
+from sat import SolverSAT
+
+
+class TablaSimbolos:
+    """
+    Traduce los literales de texto a enteros, al estilo DIMACS: cada proposición
+    ("P_1_2") recibe un número desde 1 y su negación ("~P_1_2") es el mismo número
+    con el signo cambiado.
+
+    Una cláusula se guarda como un conjunto de bits (un int): el literal n ocupa
+    el bit 2n y el -n el bit 2n+1, así el opuesto de un bit es 'bit ^ 1' y
+    resolver o comparar cláusulas son operaciones de enteros, sin cadenas.
+    """
+    def __init__(self):
+        self.numeros = {}        # nombre -> número
+        self.nombres = [None]    # número -> nombre (el 0 no es un literal válido)
+
+    def literal(self, texto):
+        negado = texto.startswith("~")
+        nombre = texto[1:] if negado else texto
+        numero = self.numeros.get(nombre)
+        if numero is None:
+            numero = len(self.nombres)
+            self.numeros[nombre] = numero
+            self.nombres.append(nombre)
+        return -numero if negado else numero
+
+    def texto(self, literal):
+        nombre = self.nombres[abs(literal)]
+        return f"~{nombre}" if literal < 0 else nombre
+
+    def clausula(self, literales):
+        """ Literales de texto -> cláusula en bits. """
+        bits = 0
+        for texto in literales:
+            bits |= 1 << posicion(self.literal(texto))
+        return bits
+
+    def literales(self, clausula):
+        """ Cláusula en bits -> lista de literales de texto (para mostrarla). """
+        return [self.texto(-(p // 2) if p & 1 else p // 2) for p in posiciones(clausula)]
+
+    def pares(self):
+        """ Máscara con el bit positivo (2n) de cada símbolo conocido. """
+        return (4 ** len(self.nombres) - 1) // 3
+
+
+def posicion(literal):
+    """ Bit de un literal entero: 2n para n y 2n+1 para -n. """
+    return 2 * literal if literal > 0 else 1 - 2 * literal
+
+
+def posiciones(clausula):
+    """ Bits encendidos de una cláusula, de menor a mayor. """
+    resultado = []
+    while clausula:
+        bit = clausula & -clausula
+        resultado.append(bit.bit_length() - 1)
+        clausula ^= bit
+    return resultado
+
+
+def es_tautologia(clausula, pares):
+    # Tiene A y no A: los bits 2n y 2n+1 encendidos a la vez
+    return clausula & (clausula >> 1) & pares != 0
+
+
 # Explicación: Este es el núcleo de la IA. No sabe nada de pozos o wumpus,
 class MotorLogico:
     def __init__(self):
-        # Almacena todo el conocimiento como un conjunto de reglas matemáticas.
+        # Las cláusulas se guardan como enteros (ver TablaSimbolos); tell y ask
+        # siguen recibiendo texto y lo traducen en la entrada.
+        self.simbolos = TablaSimbolos()
         # Usamos 'set' para evitar reglas duplicadas automáticamente.
         self.clausulas = set()
+        # Índice bit de literal -> cláusulas que lo contienen: para resolver una
+        # cláusula solo hace falta mirar las que tienen el literal opuesto (bit ^ 1)
+        self.indice = {}
 
     def tell(self, sentencia_fnc):
-        """Recibe: Una cláusula (ej: "Hay pozo en 1,1 O hay pozo en 1,2")"""
-        if not isinstance(sentencia_fnc, frozenset): # Usamos 'frozenset' porque los sets normales no pueden guardarse dentro de otros sets.
-            sentencia_fnc = frozenset(sentencia_fnc)
-        self.clausulas.add(sentencia_fnc)
-
-    def ask(self, query, max_pasos=500):
-        """Si quiero saber si "Es seguro", asumo temporalmente que "NO es seguro" """
-        # Negamos la hipótesis (Asumimos lo contrario a lo que queremos probar)
-        negacion = self.negar_literal(query)
-        clauses = set(self.clausulas)
-        clauses.add(frozenset({negacion}))
-        
-        nuevas = set()
-        pasos = 0
-        
-        # Bucle de resolución: Intentamos chocar reglas contra reglas hasta hallar una contradicción
-        while pasos < max_pasos:
-            pasos += 1
-            n = len(clauses)
-            lista_clausulas = list(clauses)
-            
-            # Comparamos todas las reglas contra todas (fuerza bruta heurística)
-            pairs = [(lista_clausulas[i], lista_clausulas[j]) for i in range(n) for j in range(i+1, n)]
-            
-            encontro_nuevas = False
-            for (ci, cj) in pairs:
-                # Intentamos fusionar dos reglas (Resolver)
-                resolventes = self.pl_resolve(ci, cj)
-                
-                # Si obtenemos un set vacío, encontramos una CONTRADICCIÓN (Ej: A y no A).
-                # Esto significa que nuestra hipótesis negada era falsa, por tanto la query es VERDAD.
-                if frozenset() in resolventes: return True
-                
-                for res in resolventes:
-                    if res not in clauses and res not in nuevas:
-                        nuevas.add(res)
-                        encontro_nuevas = True
-            
-            # Si no encontramos nada nuevo, no podemos probarlo.
-            if not encontro_nuevas: return False
-            clauses.update(nuevas)
-        
-        return False # Se acabó el tiempo/pasos
-
-    def pl_resolve(self, ci, cj):
+        """Recibe: Una cláusula (ej: "Hay pozo en 1,1 O hay pozo en 1,2"), como conjunto de literales de texto"""
+        clausula = self.simbolos.clausula(sentencia_fnc)
+        if clausula in self.clausulas: return
+        if es_tautologia(clausula, self.simbolos.pares()): return  # A o no A: siempre verdad, no aporta
+        self.clausulas.add(clausula)
+        for bit in posiciones(clausula):
+            self.indice.setdefault(bit, []).append(clausula)
+
+    def ask(self, query, max_clausulas=500):
         """
-        La regla matemática de Resolución:
-        Si tenemos (A o B) y (No B o C) -> Los 'B' se cancelan -> Queda (A o C).
+        Si quiero saber si "Es seguro", asumo temporalmente que "NO es seguro".
+        Resolución con conjunto de soporte (cláusula dada): solo se resuelven las
+        cláusulas que salen de la hipótesis negada, y cada una una sola vez contra
+        las ya procesadas. 'max_clausulas' es cuántas cláusulas dadas se procesan
+        como mucho (antes 'max_pasos' contaba rondas de resolución completas).
         """
-        resolventes = set()
-        for literal in ci:
-            negacion = self.negar_literal(literal)
-            # Buscamos si el opuesto exacto existe en la otra cláusula
-            if negacion in cj:
-                nueva = set(ci | cj) # Unimos todo
-                nueva.remove(literal) # Quitamos el positivo
-                nueva.remove(negacion) # Quitamos el negativo
-                resolventes.add(frozenset(nueva))
-        return resolventes
-
-    def negar_literal(self, literal):
-        # Convierte "A" en "~A" y viceversa
-        if literal.startswith("~"): return literal[1:]
-        return f"~{literal}"
+        # Negamos la hipótesis (Asumimos lo contrario a lo que queremos probar)
+        inicial = 1 << posicion(-self.simbolos.literal(query))
+        pares = self.simbolos.pares()
+        clausulas = self.clausulas
+        indice = self.indice
+
+        # Cláusulas derivadas en esta consulta, indexadas aparte para no tocar la KB
+        derivadas = {}
+        vistas = {inicial}
+        # Pendientes por tamaño: las cláusulas cortas (hechos) primero, llegan antes a la vacía
+        pendientes = [(1, 0, inicial)]
+        contador = 1
+        procesadas = 0
+
+        while pendientes and procesadas < max_clausulas:
+            procesadas += 1
+            _, _, dada = heapq.heappop(pendientes)
+            lista = posiciones(dada)
+
+            # Chocamos la cláusula dada solo contra las que tienen el literal opuesto
+            for bit in lista:
+                opuesto = bit ^ 1
+                quitar = ~((1 << bit) | (1 << opuesto))
+                for otras in (indice.get(opuesto, ()), derivadas.get(opuesto, ())):
+                    for otra in otras:
+                        resolvente = (dada | otra) & quitar
+                        # Si obtenemos la cláusula vacía, encontramos una CONTRADICCIÓN (Ej: A y no A).
+                        # Esto significa que nuestra hipótesis negada era falsa, por tanto la query es VERDAD.
+                        if not resolvente: return True
+                        if resolvente in vistas or resolvente in clausulas: continue
+                        if es_tautologia(resolvente, pares): continue  # No aporta
+                        vistas.add(resolvente)
+                        heapq.heappush(pendientes, (resolvente.bit_count(), contador, resolvente))
+                        contador += 1
+
+            # La dada pasa a estar procesada: las siguientes se resolverán contra ella
+            for bit in lista:
+                derivadas.setdefault(bit, []).append(dada)
+
+        # Si no quedan cláusulas nuevas, no podemos probarlo (o se acabó el presupuesto de cláusulas).
+        return False
+
+
+class MotorSAT:
+    """
+    Mismo tell/ask que MotorLogico, pero con un solver SAT (sat.py): la KB
+    implica 'query' si KB ∧ ~query no tiene modelo. La respuesta es siempre
+    exacta: no hay límite de pasos que haga pasar una casilla segura por peligrosa.
+    """
+    def __init__(self):
+        self.simbolos = TablaSimbolos()
+        self.solver = SolverSAT()
+
+    def tell(self, sentencia_fnc):
+        """Recibe: Una cláusula, como conjunto de literales de texto"""
+        self.solver.agregar_clausula([self.simbolos.literal(l) for l in sentencia_fnc])
+
+    def ask(self, query):
+        # ~query entra como supuesto: vale solo para esta consulta y lo aprendido queda para las siguientes
+        return not self.solver.resolver([-self.simbolos.literal(query)])
+
+
+# Motores lógicos que puede usar una KB
+MOTORES = {"resolucion": MotorLogico, "sat": MotorSAT}
 
 
 # MODULO 2
@@ -208,10 +298,13 @@ class Mundo:
 
 # MÓDULO 3: EL PUENTE (Traductor KB)
 class KB:
-    def __init__(self, tamaño):
+    def __init__(self, tamaño, motor="resolucion", verboso=True):
         self.tamaño = tamaño
-        # Aquí vive la instancia del Motor Lógico
-        self.motor = MotorLogico()
+        # Aquí vive la instancia del Motor Lógico (ver MOTORES)
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconocido: {motor!r} (disponibles: {', '.join(MOTORES)})")
+        self.motor = MOTORES[motor]()
+        self.verboso = verboso
         
         # Listas visuales para mostrar al usuario qué sospecha el agente
         self.seguras = set()
@@ -261,7 +354,7 @@ class KB:
         # 2. CONSULTA Y VISUALIZACIÓN
         # Una vez alimentado el cerebro, le preguntamos qué opina de los vecinos
         self.actualizar_listas_visuales(ady)
-        self.mostrar_estado()
+        if self.verboso: self.mostrar_estado()
 
     def actualizar_listas_visuales(self, adyacentes_relevantes):
         """
@@ -373,36 +466,47 @@ class Agente:
             print("¡Encontraste el oro!")
 
 
-# 1. Crear el entorno
-m = Mundo(tamaño=4)
-# 2. Crear la mente (KB + Motor Lógico)
-kb = KB(tamaño=4)
-# 3. Crear el agente (Cuerpo)
-agente = Agente(m, kb)
-
-# Inicializar
-print(f"\nTe encuentras en {agente.pos}")
-agente.obtener_percepciones()
-
-# Bucle del juego
-while agente.vivo and not agente.tiene_oro:
-    m.mostrar_tablero()
-    destino = agente.elegir_movimiento()
-    
-    if not destino:
-        print("No hay más movimientos posibles.")
-        break
-    
-    # Pausa opcional para ver paso a paso
-    # time.sleep(0.5) 
-    agente.moverse(destino)
-    
-    if not agente.vivo:
-        break
-    if agente.obtener_percepciones():
-        agente.tiene_oro = True
-        print("Oro detectado al entrar ✨")
-        break
-
-print("\nResultado final:")
-print(f"Vivo: {agente.vivo}, Oro: {agente.tiene_oro}")
\ No newline at end of file
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Agente lógico en el mundo del Wumpus")
+    parser.add_argument("--tamaño", type=int, default=4)
+    parser.add_argument("--motor", choices=list(MOTORES), default="resolucion",
+                        help="Motor lógico de la KB: resolución o solver SAT")
+    args = parser.parse_args(argumentos)
+
+    # 1. Crear el entorno
+    m = Mundo(tamaño=args.tamaño)
+    # 2. Crear la mente (KB + Motor Lógico)
+    kb = KB(tamaño=args.tamaño, motor=args.motor)
+    # 3. Crear el agente (Cuerpo)
+    agente = Agente(m, kb)
+
+    # Inicializar
+    print(f"\nTe encuentras en {agente.pos}")
+    agente.obtener_percepciones()
+
+    # Bucle del juego
+    while agente.vivo and not agente.tiene_oro:
+        m.mostrar_tablero()
+        destino = agente.elegir_movimiento()
+
+        if not destino:
+            print("No hay más movimientos posibles.")
+            break
+
+        # Pausa opcional para ver paso a paso
+        # time.sleep(0.5) 
+        agente.moverse(destino)
+
+        if not agente.vivo:
+            break
+        if agente.obtener_percepciones():
+            agente.tiene_oro = True
+            print("Oro detectado al entrar ✨")
+            break
+
+    print("\nResultado final:")
+    print(f"Vivo: {agente.vivo}, Oro: {agente.tiene_oro}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Solver SAT incremental (CDCL) para fórmulas en FNC con literales enteros al
+estilo DIMACS: la variable n es el literal n y su negación el -n.
+
+- Propagación unitaria con dos literales vigilados por cláusula: al volverse
+  falso un literal solo se revisan las cláusulas que lo vigilan, y al
+  retroceder no hay nada que deshacer en las vigilancias.
+- Ante un conflicto se aprende una cláusula (primer punto de implicación
+  único) y se salta hacia atrás al nivel que la vuelve unitaria.
+- Se decide por actividad (VSIDS: las variables de conflictos recientes
+  primero) con el último valor de cada variable, y se reinicia según la serie
+  de Luby.
+- Interfaz incremental: las cláusulas se pueden agregar entre llamadas y lo
+  aprendido se conserva (se deduce solo de las cláusulas). 'resolver' recibe
+  supuestos: literales que valen solo para esa llamada.
+
+Para saber si una base de conocimiento implica 'q' se pregunta si KB ∧ ¬q es
+insatisfacible:
+
+    solver = SolverSAT()
+    solver.agregar_clausula([1, 2])         # P1 o P2
+    solver.agregar_clausula([-1])           # no P1
+    solver.resolver([-2])                   # False: KB ∧ ¬P2 no tiene modelo, así que KB implica P2
+    solver.resolver()                       # True; solver.modelo == [-1, 2]
+
+Internamente cada literal es un código: 2n para n y 2n+1 para -n, así el
+opuesto de un código es 'codigo ^ 1' y los valores y las vigilancias se
+indexan en listas.
+"""
+import heapq
+
+# Valor de un código de literal
+VERDADERO = 1
+FALSO = -1
+LIBRE = 0
+
+# Conflictos del primer tramo entre reinicios (se multiplica por la serie de Luby)
+CONFLICTOS_POR_REINICIO = 100
+
+# Factor con el que crece el aumento de actividad tras cada conflicto (1/0.95)
+CRECIMIENTO_ACTIVIDAD = 1 / 0.95
+
+
+def codigo(literal):
+    return 2 * literal if literal > 0 else 1 - 2 * literal
+
+
+def literal(codigo):
+    return -(codigo >> 1) if codigo & 1 else codigo >> 1
+
+
+def luby(i):
+    """ i-ésimo término (desde 1) de la serie de Luby: 1 1 2 1 1 2 4 1 1 2... """
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class SolverSAT:
+    def __init__(self):
+        self.valores = [LIBRE, LIBRE]   # código -> VERDADERO / FALSO / LIBRE
+        self.niveles = [0]              # variable -> nivel de decisión en que se asignó
+        self.razones = [None]           # variable -> cláusula que la implicó (None: decisión o nivel 0)
+        self.fases = [False]            # variable -> último valor (se repite al decidir)
+        self.actividad = [0.0]
+        self.vigilancias = [[], []]     # código -> cláusulas que lo vigilan (sus dos primeros literales)
+        self.clausulas = []             # listas de códigos
+        self.rastro = []                # códigos asignados verdaderos, en orden
+        self.limites = []               # rastro[limites[k]] es la decisión del nivel k + 1
+        self.propagados = 0             # rastro[:propagados] ya se propagó
+        self.cola_actividad = []        # (-actividad, variable), con entradas viejas que se ignoran
+        self.aumento = 1.0
+        self.inconsistente = False      # Las cláusulas solas ya no tienen modelo
+        self.modelo = None
+        self.conflictos = self.decisiones = self.propagaciones = self.aprendidas = 0
+
+    @property
+    def variables(self):
+        return len(self.niveles) - 1
+
+    def _asegurar(self, variable):
+        while len(self.niveles) <= variable:
+            self.valores += [LIBRE, LIBRE]
+            self.niveles.append(0)
+            self.razones.append(None)
+            self.fases.append(False)
+            self.actividad.append(0.0)
+            self.vigilancias += [[], []]
+            heapq.heappush(self.cola_actividad, (0.0, len(self.niveles) - 1))
+
+    def agregar_clausula(self, literales):
+        """
+        Agrega una cláusula (literales enteros distintos de 0). Devuelve False si
+        con ella la fórmula ya es insatisfacible sin supuestos.
+        """
+        if self.inconsistente:
+            return False
+        self._retroceder(0)
+        valores = self.valores
+        codigos = []
+        for l in set(literales):
+            self._asegurar(abs(l))
+            c = codigo(l)
+            if valores[c] == VERDADERO or c ^ 1 in codigos:
+                return True                 # Ya satisfecha, o tautología (A o no A)
+            if valores[c] == LIBRE and c not in codigos:
+                codigos.append(c)           # Los falsos en el nivel 0 no aportan nada
+        if not codigos:
+            self.inconsistente = True
+            return False
+        if len(codigos) == 1:
+            self._asignar(codigos[0], None)
+            if self._propagar() is not None:
+                self.inconsistente = True
+                return False
+            return True
+        self._agregar(codigos)
+        return True
+
+    def _agregar(self, codigos):
+        indice = len(self.clausulas)
+        self.clausulas.append(codigos)
+        self.vigilancias[codigos[0]].append(indice)
+        self.vigilancias[codigos[1]].append(indice)
+        return indice
+
+    def _asignar(self, c, razon):
+        variable = c >> 1
+        self.valores[c] = VERDADERO
+        self.valores[c ^ 1] = FALSO
+        self.niveles[variable] = len(self.limites)
+        self.razones[variable] = razon
+        self.fases[variable] = not c & 1
+        self.rastro.append(c)
+
+    def _retroceder(self, nivel):
+        if len(self.limites) <= nivel:
+            return
+        valores, cola, actividad = self.valores, self.cola_actividad, self.actividad
+        inicio = self.limites[nivel]
+        for c in self.rastro[inicio:]:
+            valores[c] = valores[c ^ 1] = LIBRE
+            heapq.heappush(cola, (-actividad[c >> 1], c >> 1))
+        del self.rastro[inicio:]
+        del self.limites[nivel:]
+        self.propagados = inicio
+
+    def _propagar(self):
+        """ Propagación unitaria; devuelve la cláusula en conflicto o None. """
+        valores, clausulas, vigilancias, rastro = self.valores, self.clausulas, self.vigilancias, self.rastro
+        while self.propagados < len(rastro):
+            falso = rastro[self.propagados] ^ 1
+            self.propagados += 1
+            self.propagaciones += 1
+            vigilantes = vigilancias[falso]
+            quedan = []
+            for posicion, indice in enumerate(vigilantes):
+                clausula = clausulas[indice]
+                # El literal que se volvió falso queda en la posición 1
+                if clausula[0] == falso:
+                    clausula[0], clausula[1] = clausula[1], falso
+                if valores[clausula[0]] == VERDADERO:
+                    quedan.append(indice)
+                    continue
+                # Se busca otro literal no falso para vigilar en su lugar
+                for k in range(2, len(clausula)):
+                    if valores[clausula[k]] != FALSO:
+                        clausula[1], clausula[k] = clausula[k], falso
+                        vigilancias[clausula[1]].append(indice)
+                        break
+                else:
+                    quedan.append(indice)
+                    if valores[clausula[0]] == FALSO:
+                        quedan.extend(vigilantes[posicion + 1:])
+                        vigilancias[falso] = quedan
+                        return indice
+                    self._asignar(clausula[0], indice)
+            vigilancias[falso] = quedan
+        return None
+
+    def _aumentar(self, variable):
+        actividad = self.actividad
+        actividad[variable] += self.aumento
+        if actividad[variable] > 1e100:
+            # Se reescala todo para no desbordar; el orden no cambia
+            for v in range(1, len(actividad)):
+                actividad[v] *= 1e-100
+            self.aumento *= 1e-100
+            self.cola_actividad = [(-actividad[v], v) for v in range(1, len(actividad))]
+            heapq.heapify(self.cola_actividad)
+        elif self.valores[2 * variable] == LIBRE:
+            heapq.heappush(self.cola_actividad, (-actividad[variable], variable))
+
+    def _analizar(self, conflicto):
+        """
+        Cláusula aprendida (primer punto de implicación único) y nivel al que
+        retroceder. El literal que la cláusula afirma queda primero y el de
+        mayor nivel entre el resto, segundo (para vigilarlos).
+        """
+        niveles, razones, rastro, clausulas = self.niveles, self.razones, self.rastro, self.clausulas
+        nivel_actual = len(self.limites)
+        vistos = set()
+        aprendida = [None]
+        pendientes = 0
+        c = None
+        posicion = len(rastro) - 1
+        clausula = clausulas[conflicto]
+        while True:
+            for q in (clausula if c is None else clausula[1:]):
+                variable = q >> 1
+                if variable not in vistos and niveles[variable] > 0:
+                    vistos.add(variable)
+                    self._aumentar(variable)
+                    if niveles[variable] == nivel_actual:
+                        pendientes += 1
+                    else:
+                        aprendida.append(q)
+            # El último literal del rastro que participa en el conflicto
+            while rastro[posicion] >> 1 not in vistos:
+                posicion -= 1
+            c = rastro[posicion]
+            posicion -= 1
+            vistos.discard(c >> 1)
+            pendientes -= 1
+            if pendientes == 0:
+                break
+            clausula = clausulas[razones[c >> 1]]
+        aprendida[0] = c ^ 1
+
+        if len(aprendida) == 1:
+            return aprendida, 0
+        mayor = max(range(1, len(aprendida)), key=lambda i: niveles[aprendida[i] >> 1])
+        aprendida[1], aprendida[mayor] = aprendida[mayor], aprendida[1]
+        return aprendida, niveles[aprendida[1] >> 1]
+
+    def _decidir(self):
+        """ Variable libre de mayor actividad, con su último valor; None si no quedan. """
+        valores, cola, actividad = self.valores, self.cola_actividad, self.actividad
+        while cola:
+            menos_actividad, variable = heapq.heappop(cola)
+            if valores[2 * variable] == LIBRE and -menos_actividad == actividad[variable]:
+                return 2 * variable if self.fases[variable] else 2 * variable + 1
+        # Las entradas pueden haber quedado viejas: se busca entre todas
+        for variable in range(1, len(self.niveles)):
+            if valores[2 * variable] == LIBRE:
+                return 2 * variable if self.fases[variable] else 2 * variable + 1
+        return None
+
+    def resolver(self, supuestos=()):
+        """
+        True si las cláusulas junto con los 'supuestos' (literales que valen
+        solo para esta llamada) tienen un modelo, que queda en self.modelo como
+        lista de literales. False si no lo tienen.
+        """
+        self.modelo = None
+        if self.inconsistente:
+            return False
+        self._retroceder(0)
+        supuestos = [codigo(l) for l in supuestos]
+        for c in supuestos:
+            self._asegurar(c >> 1)
+
+        reinicios = 1
+        limite = CONFLICTOS_POR_REINICIO * luby(reinicios)
+        conflictos = 0
+        while True:
+            conflicto = self._propagar()
+            if conflicto is not None:
+                self.conflictos += 1
+                conflictos += 1
+                if not self.limites:
+                    self.inconsistente = True
+                    return False
+                aprendida, nivel = self._analizar(conflicto)
+                self._retroceder(nivel)
+                if len(aprendida) == 1:
+                    self._asignar(aprendida[0], None)
+                else:
+                    self._asignar(aprendida[0], self._agregar(aprendida))
+                    self.aprendidas += 1
+                self.aumento *= CRECIMIENTO_ACTIVIDAD
+                continue
+
+            if conflictos >= limite:
+                reinicios += 1
+                limite = CONFLICTOS_POR_REINICIO * luby(reinicios)
+                conflictos = 0
+                self._retroceder(0)
+                continue
+
+            nivel = len(self.limites)
+            if nivel < len(supuestos):
+                # Los supuestos se deciden primero, uno por nivel
+                c = supuestos[nivel]
+                if self.valores[c] == FALSO:
+                    self._retroceder(0)
+                    return False
+                self.limites.append(len(self.rastro))
+                if self.valores[c] == LIBRE:
+                    self._asignar(c, None)
+                continue
+
+            c = self._decidir()
+            if c is None:
+                self.modelo = [literal(c) for c in sorted(self.rastro)]
+                self._retroceder(0)
+                return True
+            self.decisiones += 1
+            self.limites.append(len(self.rastro))
+            self._asignar(c, None)
@@ -0,0 +1,189 @@
+"""
+Tabla completa de distancias del 8-puzzle.
+
+El espacio de estados es pequeño (9! permutaciones, 181,440 alcanzables desde el
+objetivo), así que podemos calcular UNA vez la distancia exacta al objetivo de
+todos los estados con un BFS hacia atrás desde el objetivo y guardarla en disco:
+un byte por permutación, indexado por el rango de Lehmer (ver motor.py).
+
+Al cargarla se mapea en memoria (mmap) en solo lectura, así varios procesos
+comparten la misma copia, y resolver un tablero es bajar por la tabla: desde
+cada estado hay un vecino con distancia d - 1 hasta llegar a 0.
+
+Una tabla construida para un objetivo canónico (ver canonico.py) también
+resuelve cualquier otro objetivo con el hueco en la misma órbita: la del
+objetivo por defecto sirve para todos los que tienen el hueco en una esquina.
+
+Uso:
+    python tabla_distancias.py construir [--objetivo 1,2,3,4,5,6,7,8,0] [--salida tabla_8puzzle.bin]
+    python tabla_distancias.py construir --hueco 4 --salida tabla_centro.bin
+"""
+import argparse
+import mmap
+import os
+import time
+from functools import lru_cache
+
+from canonico import canonizar, objetivo_canonico
+from motor import NINGUNO, obtener_motor
+from validacion import validar_instancia
+
+# Cabecera del archivo: firma + tablero objetivo (un byte por casilla)
+FIRMA = b"DIST8P1\n"
+INALCANZABLE = 255
+OBJETIVO_POR_DEFECTO = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+RUTA_POR_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tabla_8puzzle.bin")
+
+
+def construir_tabla(estado_objetivo=OBJETIVO_POR_DEFECTO):
+    """
+    BFS hacia atrás desde el objetivo. Los movimientos son reversibles, así que la
+    distancia desde el objetivo es la distancia hacia el objetivo.
+    Devuelve un bytearray de 9! posiciones (INALCANZABLE para la otra paridad).
+    """
+    motor = obtener_motor()
+    movimientos = motor.sin_inverso
+    mascara = motor.mascara
+    rango = motor.rango
+
+    objetivo = motor.empaquetar(list(estado_objetivo))
+    tabla = bytearray([INALCANZABLE]) * motor.total
+    tabla[rango(objetivo)] = 0
+
+    # Recorrido por capas: 'capa' tiene los estados a distancia 'profundidad'
+    capa = [(objetivo << 3) | NINGUNO]
+    profundidad = 0
+    while capa:
+        profundidad += 1
+        siguiente = []
+        for entrada in capa:
+            estado = entrada >> 3
+            for codigo, desplazamiento, delta_ficha, salto in movimientos[estado & mascara][entrada & 7]:
+                vecino = estado + ((estado >> desplazamiento) & mascara) * delta_ficha + salto
+                r = rango(vecino)
+                if tabla[r] == INALCANZABLE:
+                    tabla[r] = profundidad
+                    siguiente.append((vecino << 3) | codigo)
+        capa = siguiente
+
+    return tabla
+
+
+def guardar_tabla(ruta, tabla, estado_objetivo=OBJETIVO_POR_DEFECTO):
+    with open(ruta, "wb") as archivo:
+        archivo.write(FIRMA)
+        archivo.write(bytes(estado_objetivo))
+        archivo.write(tabla)
+
+
+class TablaDistancias:
+    """ Tabla de distancias mapeada en memoria (solo lectura). """
+
+    def __init__(self, ruta=RUTA_POR_DEFECTO):
+        self.motor = obtener_motor()
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        inicio = len(FIRMA) + self.motor.casillas
+        if self._mapa[:len(FIRMA)] != FIRMA or len(self._mapa) != inicio + self.motor.total:
+            self._mapa.close()
+            raise ValueError(f"{ruta} no es una tabla de distancias válida")
+
+        self.objetivo = list(self._mapa[len(FIRMA):inicio])
+        self._distancias = memoryview(self._mapa)[inicio:]
+
+    def _canonizar(self, estado_inicial, estado_objetivo):
+        """ Lleva la instancia al objetivo de la tabla (o lanza ValueError si no se puede). """
+        inicial, objetivo, transformacion = canonizar(estado_inicial, estado_objetivo, self.motor.ancho)
+        if objetivo != self.objetivo:
+            raise ValueError("La tabla se construyó para un objetivo con el hueco en otra órbita "
+                             f"(haría falta una tabla para {objetivo})")
+        return inicial, transformacion
+
+    def distancia(self, tablero, estado_objetivo=None):
+        """ Distancia óptima al objetivo, o None si no tiene solución. """
+        if estado_objetivo is not None and list(estado_objetivo) != self.objetivo:
+            if validar_instancia(tablero, estado_objetivo, self.motor.ancho) is not None:
+                return None
+            tablero, _ = self._canonizar(tablero, estado_objetivo)
+        elif validar_instancia(tablero, self.objetivo, self.motor.ancho) is not None:
+            return None
+        d = self._distancias[self.motor.rango(self.motor.empaquetar(tablero))]
+        return None if d == INALCANZABLE else d
+
+    def resolver(self, estado_inicial, estado_objetivo=None):
+        """
+        Camino óptimo (lista de tableros, como bfs/a_star) bajando por la tabla.
+        Cada paso solo mira los vecinos del estado actual: O(profundidad).
+        Con otro objetivo se resuelve la instancia canónica y se deshace la transformación.
+        """
+        if estado_objetivo is not None and list(estado_objetivo) != self.objetivo:
+            problema = validar_instancia(estado_inicial, estado_objetivo, self.motor.ancho)
+            if problema is not None:
+                return problema
+            inicial, transformacion = self._canonizar(estado_inicial, estado_objetivo)
+            return [transformacion.deshacer(tablero) for tablero in self.resolver(inicial)]
+
+        problema = validar_instancia(estado_inicial, self.objetivo, self.motor.ancho)
+        if problema is not None:
+            return problema
+
+        motor = self.motor
+        distancias = self._distancias
+        estado = motor.empaquetar(estado_inicial)
+        d = distancias[motor.rango(estado)]
+
+        camino = [estado]
+        while d:
+            for _, vecino in motor.sucesores(estado):
+                if distancias[motor.rango(vecino)] == d - 1:
+                    estado = vecino
+                    break
+            camino.append(estado)
+            d -= 1
+        return [motor.desempaquetar(e) for e in camino]
+
+    def cerrar(self):
+        self._distancias.release()
+        self._mapa.close()
+
+
+@lru_cache(maxsize=None)
+def cargar_tabla(ruta=RUTA_POR_DEFECTO):
+    """ Una sola tabla mapeada por proceso y por archivo. """
+    return TablaDistancias(ruta)
+
+
+def resolver_con_tabla(estado_inicial, estado_objetivo, ruta=RUTA_POR_DEFECTO):
+    """ Misma firma que bfs/dfs/a_star, pero usando la tabla precalculada. """
+    return cargar_tabla(ruta).resolver(estado_inicial, estado_objetivo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabla de distancias del 8-puzzle")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    construir = subcomandos.add_parser("construir", help="Calcula la tabla y la guarda en disco")
+    construir.add_argument("--objetivo", default=",".join(map(str, OBJETIVO_POR_DEFECTO)),
+                           help="Tablero objetivo separado por comas (0 = hueco)")
+    construir.add_argument("--hueco", type=int,
+                           help="En lugar de --objetivo, el objetivo canónico con el hueco en esa casilla")
+    construir.add_argument("--salida", default=RUTA_POR_DEFECTO)
+    args = parser.parse_args()
+
+    if args.hueco is not None:
+        objetivo = objetivo_canonico(3, args.hueco)
+    else:
+        objetivo = [int(x) for x in args.objetivo.split(",")]
+    inicio = time.perf_counter()
+    tabla = construir_tabla(objetivo)
+    duracion = time.perf_counter() - inicio
+    guardar_tabla(args.salida, tabla, objetivo)
+
+    alcanzables = len(tabla) - tabla.count(INALCANZABLE)
+    maxima = max(d for d in tabla if d != INALCANZABLE)
+    print(f"{alcanzables} estados alcanzables, distancia máxima {maxima}")
+    print(f"Construida en {duracion:.2f} s -> {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Pruebas de cache_soluciones.py.
+
+    python -m pytest -q
+"""
+from cache_soluciones import CacheSoluciones
+from canonico import transformaciones
+from proyecto import bfs
+
+OBJETIVO = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+INICIAL = [8, 6, 7, 2, 5, 4, 3, 0, 1]       # A 31 movimientos
+
+
+def test_resuelve_optimo_y_despues_acierta():
+    cache = CacheSoluciones()
+    camino = cache.resolver(INICIAL, OBJETIVO)
+    assert len(camino) == len(bfs(INICIAL, OBJETIVO)) == 32
+    assert cache.resolver(INICIAL, OBJETIVO) == camino
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+
+
+def test_subcamino_y_simetrico_aciertan():
+    cache = CacheSoluciones()
+    camino = cache.resolver(INICIAL, OBJETIVO)
+    # Un estado intermedio del camino guardado
+    assert cache.resolver(camino[10], OBJETIVO) == camino[10:]
+    # El simétrico del inicial respecto del objetivo (misma distancia)
+    simetrica = [t for t in transformaciones(OBJETIVO) if not t.es_identidad][0]
+    otro = cache.resolver(simetrica.aplicar(INICIAL), OBJETIVO)
+    assert len(otro) == 32 and otro[-1] == OBJETIVO
+    assert cache.fallos == 1
+
+
+def test_heuristica_con_cache_sigue_siendo_optima():
+    cache = CacheSoluciones()
+    cache.resolver(INICIAL, OBJETIVO)
+    vecino = [8, 6, 7, 2, 0, 4, 3, 5, 1]
+    assert len(cache.resolver(vecino, OBJETIVO)) == len(bfs(vecino, OBJETIVO))
+
+
+def test_guardar_y_cargar(tmp_path):
+    ruta = str(tmp_path / "cache.txt")
+    cache = CacheSoluciones(ruta=ruta)
+    camino = cache.resolver(INICIAL, OBJETIVO)
+    cache.guardar()
+
+    cargada = CacheSoluciones(ruta=ruta)
+    assert len(cargada) == len(cache)
+    assert cargada.resolver(INICIAL, OBJETIVO) == camino
+    assert (cargada.aciertos, cargada.fallos) == (1, 0)
+
+
+def test_capacidad_desaloja_los_mas_viejos():
+    cache = CacheSoluciones(capacidad=10)
+    cache.resolver(INICIAL, OBJETIVO)
+    assert len(cache) == 10
+    # Los primeros estados del camino se desalojaron: vuelve a buscar
+    cache.resolver(INICIAL, OBJETIVO)
+    assert cache.fallos == 2
@@ -0,0 +1,66 @@
+"""
+Pruebas de la forma canónica de instancias (canonico.py).
+
+    python -m pytest -q
+"""
+import random
+
+import pytest
+
+from canonico import canonizar, hueco_canonico, objetivo_canonico, transformaciones
+from motor import LETRAS, obtener_motor
+from proyecto import bfs
+
+
+def _tablero_al_azar(azar, ancho):
+    tablero = list(range(ancho * ancho))
+    azar.shuffle(tablero)
+    return tablero
+
+
+@pytest.mark.parametrize("ancho", [3, 4])
+def test_transformaciones_se_deshacen(ancho):
+    azar = random.Random(ancho)
+    motor = obtener_motor(ancho)
+    for _ in range(20):
+        objetivo, tablero = _tablero_al_azar(azar, ancho), _tablero_al_azar(azar, ancho)
+        for transformacion in transformaciones(objetivo):
+            assert transformacion.aplicar(objetivo) == objetivo_canonico(ancho, objetivo.index(0))
+            assert transformacion.deshacer(transformacion.aplicar(tablero)) == tablero
+            transformado = motor.desempaquetar(transformacion.aplicar_estado(motor, motor.empaquetar(tablero)))
+            assert transformado == transformacion.aplicar(tablero)
+
+
+def test_canonizar_conserva_la_distancia():
+    azar = random.Random(18)
+    motor = obtener_motor(3)
+    for _ in range(10):
+        objetivo = _tablero_al_azar(azar, 3)
+        # Una caminata corta desde el objetivo, así la instancia tiene solución
+        estado = motor.empaquetar(objetivo)
+        for _ in range(20):
+            _, estado = azar.choice(list(motor.sucesores(estado)))
+        inicial = motor.desempaquetar(estado)
+
+        inicial_c, objetivo_c, transformacion = canonizar(inicial, objetivo)
+        assert objetivo_c == objetivo_canonico(3, objetivo.index(0))
+        assert objetivo_c.index(0) == hueco_canonico(3, objetivo.index(0))
+        movimientos = bfs(inicial, objetivo, formato="movimientos")
+        movimientos_c = bfs(inicial_c, objetivo_c, formato="movimientos")
+        assert len(movimientos_c) == len(movimientos)
+        # Los movimientos del canónico, llevados al original, lo resuelven
+        camino = [transformacion.deshacer(t) for t in bfs(inicial_c, objetivo_c)]
+        assert camino[0] == inicial and camino[-1] == objetivo
+        assert transformacion.movimientos(transformacion.movimientos_originales(movimientos_c)) == movimientos_c
+        estado = motor.empaquetar(inicial)
+        for letra in transformacion.movimientos_originales(movimientos_c):
+            estado = motor.aplicar(estado, LETRAS.index(letra))
+        assert motor.desempaquetar(estado) == objetivo
+
+
+def test_instancias_simetricas_coinciden():
+    # Un tablero y su espejo (con el objetivo reflejado igual) dan la misma forma canónica
+    objetivo = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    inicial = [4, 1, 3, 7, 2, 6, 0, 5, 8]
+    espejo = lambda t: [t[f * 3 + 2 - c] for f in range(3) for c in range(3)]
+    assert canonizar(inicial, objetivo)[:2] == canonizar(espejo(inicial), espejo(objetivo))[:2]
@@ -0,0 +1,81 @@
+"""
+Pruebas de las heurísticas de heuristicas.py.
+
+    python -m pytest -q
+"""
+import random
+
+import pytest
+
+import patrones
+from heuristicas import ConflictosLineales
+from motor import obtener_motor
+from proyecto import a_star, bfs
+
+
+def _caminata(motor, estado, pasos, azar):
+    """ Estados de una caminata al azar desde 'estado' (empaquetado). """
+    for _ in range(pasos):
+        _, estado = azar.choice(list(motor.sucesores(estado)))
+        yield estado
+
+
+@pytest.mark.parametrize("ancho", [2, 3, 4, 5])
+def test_conflictos_delta_coincide_con_evaluar(ancho):
+    motor = obtener_motor(ancho)
+    azar = random.Random(ancho)
+    objetivo = list(range(ancho * ancho))
+    azar.shuffle(objetivo)
+    heuristica = ConflictosLineales(objetivo, ancho)
+    estado = motor.empaquetar(objetivo)
+    for siguiente in _caminata(motor, estado, 2000, azar):
+        tablero, despues = motor.desempaquetar(estado), motor.desempaquetar(siguiente)
+        hasta, desde = tablero.index(0), despues.index(0)
+        ficha = tablero[desde]
+        cambio = heuristica.evaluar(despues) - heuristica.evaluar(tablero)
+        assert heuristica.delta(tablero, ficha, desde, hasta) == cambio
+        assert heuristica.delta_estado(estado, ficha, desde, hasta) == cambio
+        assert heuristica.evaluar_estado(siguiente) == heuristica.evaluar(despues)
+        estado = siguiente
+
+
+def test_conflictos_sin_tabla_precalculada(monkeypatch):
+    # Por encima del máximo se calcula a demanda y da lo mismo
+    import heuristicas
+    objetivo = list(range(1, 16)) + [0]
+    tablero = [12, 1, 2, 15, 11, 6, 5, 8, 7, 10, 9, 4, 0, 13, 14, 3]
+    esperado = ConflictosLineales(objetivo, 4).evaluar(tablero)
+    monkeypatch.setattr(heuristicas, "MAXIMO_TABLA_CONFLICTOS", 0)
+    assert ConflictosLineales(objetivo, 4).evaluar(tablero) == esperado
+
+
+def test_a_star_con_conflictos_es_optimo():
+    motor = obtener_motor(3)
+    azar = random.Random(7)
+    objetivo = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    for _ in range(10):
+        *_, estado = _caminata(motor, motor.empaquetar(objetivo), 40, azar)
+        inicial = motor.desempaquetar(estado)
+        optimo = len(bfs(inicial, objetivo, formato="movimientos"))
+        assert len(a_star(inicial, objetivo, heuristica="conflictos", formato="movimientos")) == optimo
+
+
+def test_patrones_delta_coincide_con_evaluar(tmp_path):
+    grupos = [(1, 2, 3), (4, 5, 6), (7, 8)]
+    ruta = tmp_path / "pdb.bin"
+    patrones.guardar_patrones(ruta, patrones.construir_patrones(3, grupos), 3, grupos)
+    heuristica = patrones.HeuristicaPatrones(ruta)
+    try:
+        motor = obtener_motor(3)
+        azar = random.Random(3)
+        estado = motor.empaquetar(heuristica.objetivo)
+        for siguiente in _caminata(motor, estado, 3000, azar):
+            tablero, despues = motor.desempaquetar(estado), motor.desempaquetar(siguiente)
+            hasta, desde = tablero.index(0), despues.index(0)
+            ficha = tablero[desde]
+            cambio = heuristica.evaluar(despues) - heuristica.evaluar(tablero)
+            assert heuristica.delta(tablero, ficha, desde, hasta) == cambio
+            assert heuristica.delta_estado(estado, ficha, desde, hasta) == cambio
+            estado = siguiente
+    finally:
+        heuristica.cerrar()
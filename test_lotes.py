@@ -0,0 +1,47 @@
+"""
+Pruebas de lotes.py.
+
+    python -m pytest -q
+"""
+import io
+import json
+
+import pytest
+
+from lotes import resolver_lote
+
+LINEAS = [
+    '{"id": "a", "inicial": [1, 2, 3, 4, 5, 6, 0, 7, 8]}\n',
+    '\n',
+    '{"id": "b", "inicial": [2, 1, 3, 4, 5, 6, 7, 8, 0]}\n',
+    '{"inicial": [8, 6, 7, 2, 5, 4, 3, 0, 1], "algoritmo": "ida_star", "heuristica": "conflictos"}\n',
+    '{"inicial": [1, 2, 3]}\n',
+]
+
+
+def _resolver(**opciones):
+    salida = io.StringIO()
+    total = resolver_lote(LINEAS, salida, **opciones)
+    return total, [json.loads(linea) for linea in salida.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_una_linea_por_instancia(procesos):
+    total, resultados = _resolver(procesos=procesos)
+    assert total == 4
+    assert [r["indice"] for r in resultados] == [0, 2, 3, 4]
+    assert resultados[0]["id"] == "a" and resultados[0]["estado"] == "resuelto" and resultados[0]["longitud"] == 2
+    assert resultados[1]["estado"] == "irresoluble" and resultados[1]["longitud"] is None and resultados[1]["motivo"]
+    assert resultados[2]["estado"] == "resuelto" and resultados[2]["longitud"] == 31
+    assert resultados[3]["estado"] == "error"
+
+
+def test_caminos():
+    _, resultados = _resolver(procesos=1, caminos=True)
+    assert resultados[0]["camino"][-1] == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    assert "camino" not in resultados[1]
+
+
+def test_configuracion_invalida_falla_antes_de_empezar():
+    with pytest.raises(ValueError):
+        resolver_lote(LINEAS, io.StringIO(), heuristica="nope", procesos=2)
@@ -0,0 +1,46 @@
+"""
+Pruebas del A* paralelo (paralelo.py) contra proyecto.a_star.
+
+    python -m pytest -q
+"""
+import random
+
+import pytest
+
+from estadisticas import Estadisticas
+from motor import obtener_motor
+from paralelo import hda_star
+from proyecto import a_star
+from validacion import Irresoluble
+
+OBJETIVO = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+
+def _instancias(cantidad, pasos, semilla):
+    motor = obtener_motor(3)
+    azar = random.Random(semilla)
+    for _ in range(cantidad):
+        estado = motor.empaquetar(OBJETIVO)
+        for _ in range(pasos):
+            _, estado = azar.choice(list(motor.sucesores(estado)))
+        yield motor.desempaquetar(estado)
+
+
+@pytest.mark.parametrize("trabajadores,lote", [(1, 256), (2, 256), (3, 256), (3, 1)])
+def test_hda_star_es_optimo(trabajadores, lote):
+    motor = obtener_motor(3)
+    for inicial in _instancias(4, 60, trabajadores):
+        esperado = len(a_star(inicial, OBJETIVO, formato="movimientos"))
+        estadisticas = Estadisticas()
+        camino = hda_star(inicial, OBJETIVO, trabajadores=trabajadores, lote=lote, estadisticas=estadisticas)
+        # Un camino válido: cada tablero a un movimiento del anterior, de inicio a objetivo
+        assert len(camino) == esperado + 1
+        assert camino[0] == inicial and camino[-1] == OBJETIVO
+        for antes, despues in zip(camino, camino[1:]):
+            vecinos = [motor.desempaquetar(v) for _, v in motor.sucesores(motor.empaquetar(antes))]
+            assert despues in vecinos
+        assert len(estadisticas.trabajadores) == trabajadores
+
+
+def test_hda_star_irresoluble():
+    assert isinstance(hda_star([2, 1, 3, 4, 5, 6, 7, 8, 0], OBJETIVO, trabajadores=2), Irresoluble)
@@ -0,0 +1,115 @@
+"""
+Pruebas de regresión de los solvers de proyecto.py.
+
+    python -m pytest -q
+"""
+import random
+
+import pytest
+
+from motor import obtener_motor
+from proyecto import (a_star, a_star_anytime, a_star_con_plazo, bfs, bfs_bidireccional, busqueda_haz, dfs_limitado,
+                      ida_star, iddfs, sma_star)
+from validacion import Irresoluble
+
+OBJETIVO = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+
+def _instancias(cantidad, pasos, semilla):
+    """ Tableros 3x3 a 'pasos' movimientos al azar del objetivo. """
+    motor = obtener_motor(3)
+    azar = random.Random(semilla)
+    for _ in range(cantidad):
+        estado = motor.empaquetar(OBJETIVO)
+        for _ in range(pasos):
+            _, estado = azar.choice(list(motor.sucesores(estado)))
+        yield motor.desempaquetar(estado)
+
+
+def _es_camino(camino, inicial, objetivo):
+    """ Cada tablero a un movimiento del anterior, de 'inicial' a 'objetivo'. """
+    motor = obtener_motor(3)
+    if camino[0] != list(inicial) or camino[-1] != list(objetivo):
+        return False
+    return all(despues in [motor.desempaquetar(v) for _, v in motor.sucesores(motor.empaquetar(antes))]
+               for antes, despues in zip(camino, camino[1:]))
+
+
+def test_ida_star_con_objetivo_en_tupla():
+    # Con el objetivo como tupla la comparación contra la lista interna nunca daba verdadero
+    inicial = (1, 2, 3, 4, 5, 6, 0, 7, 8)
+    objetivo = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+    assert ida_star(inicial, objetivo, formato="movimientos") == "RR"
+    assert ida_star(objetivo, objetivo, formato="movimientos") == ""
+
+
+def test_a_star_anytime_irresoluble():
+    # Paridades distintas: se entrega el Irresoluble en vez de terminar sin nada
+    inicial = (2, 1, 3, 4, 5, 6, 7, 8, 0)
+    objetivo = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+    entregados = list(a_star_anytime(inicial, objetivo, limite_tiempo=5))
+    assert len(entregados) == 1 and isinstance(entregados[0], Irresoluble)
+    assert isinstance(a_star_con_plazo(inicial, objetivo, 5), Irresoluble)
+
+
+def test_patrones_sin_archivo(monkeypatch, tmp_path):
+    import patrones
+    monkeypatch.setattr(patrones, "ruta_por_defecto", lambda ancho: str(tmp_path / f"pdb_{ancho}x{ancho}.bin"))
+    with pytest.raises(ValueError, match="patrones.py construir"):
+        a_star((1, 2, 3, 4, 5, 6, 0, 7, 8), (1, 2, 3, 4, 5, 6, 7, 8, 0), heuristica="patrones")
+
+
+def test_resolver_distingue_irresoluble_de_sin_solucion(monkeypatch):
+    import io
+    import json
+    import proyecto
+    objetivo = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+    salida = io.StringIO()
+    assert not proyecto.resolver("bfs", [2, 1, 3, 4, 5, 6, 7, 8, 0], objetivo, salida="json", archivo=salida)
+    assert json.loads(salida.getvalue())["estado"] == "irresoluble"
+
+    # Con una cota corta a_star no halla camino en una instancia que sí tiene solución
+    monkeypatch.setitem(proyecto.ALGORITMOS, "a_star", lambda *a, **k: proyecto.a_star(*a, cota=10, **k))
+    salida = io.StringIO()
+    assert not proyecto.resolver("a_star", [8, 6, 7, 2, 5, 4, 3, 0, 1], objetivo, salida="json", archivo=salida)
+    documento = json.loads(salida.getvalue())
+    assert documento["estado"] == "sin_solucion" and "motivo" not in documento
+
+
+def test_bfs_bidireccional_es_optimo():
+    for inicial in _instancias(8, 80, 9):
+        camino = bfs_bidireccional(inicial, OBJETIVO)
+        assert _es_camino(camino, inicial, OBJETIVO)
+        assert len(camino) == len(bfs(inicial, OBJETIVO))
+    assert bfs_bidireccional(OBJETIVO, OBJETIVO, formato="movimientos") == ""
+    assert isinstance(bfs_bidireccional([2, 1, 3, 4, 5, 6, 7, 8, 0], OBJETIVO), Irresoluble)
+
+
+def test_sma_star_es_optimo():
+    for inicial in _instancias(6, 80, 15):
+        esperado = len(bfs(inicial, OBJETIVO))
+        # Con memoria de sobra y con poca: mientras quepa el camino óptimo, sigue siendo óptimo
+        for max_nodos in (100_000, 200):
+            camino = sma_star(inicial, OBJETIVO, max_nodos=max_nodos)
+            assert _es_camino(camino, inicial, OBJETIVO)
+            assert len(camino) == esperado
+
+
+def test_busqueda_haz():
+    for inicial in _instancias(6, 80, 15):
+        esperado = len(bfs(inicial, OBJETIVO))
+        # Con un haz más ancho que cualquier capa del 3x3 es un BFS: óptimo
+        assert len(busqueda_haz(inicial, OBJETIVO, ancho_haz=200_000)) == esperado
+        camino = busqueda_haz(inicial, OBJETIVO, ancho_haz=5)
+        assert camino is None or (_es_camino(camino, inicial, OBJETIVO) and len(camino) >= esperado)
+
+
+def test_iddfs_es_optimo():
+    for inicial in _instancias(6, 60, 16):
+        camino = iddfs(inicial, OBJETIVO)
+        assert _es_camino(camino, inicial, OBJETIVO)
+        assert len(camino) == len(bfs(inicial, OBJETIVO))
+        # Con un límite menor que el óptimo no hay camino
+        assert dfs_limitado(inicial, OBJETIVO, limite=len(camino) - 3) is None
+    assert iddfs(OBJETIVO, OBJETIVO, formato="movimientos") == ""
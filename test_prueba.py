@@ -0,0 +1,92 @@
+"""
+Pruebas de los motores lógicos de prueba.py contra la implicación por tabla de
+verdad en bases chicas al azar.
+
+    python -m pytest -q
+"""
+import itertools
+import random
+
+import pytest
+
+from benchmark_logica import explorar
+from prueba import KB, MotorLogico, MotorSAT, Mundo, TablaSimbolos, es_tautologia
+
+SIMBOLOS = ["A", "B", "C", "D"]
+
+
+def _base_al_azar(azar):
+    """ Cláusulas (listas de literales de texto) de una KB satisfacible. """
+    while True:
+        base = []
+        for _ in range(azar.randint(1, 6)):
+            simbolos = azar.sample(SIMBOLOS, azar.randint(1, 3))
+            base.append([s if azar.random() < 0.5 else f"~{s}" for s in simbolos])
+        if _modelos(base):
+            return base
+
+
+def _modelos(base):
+    """ Asignaciones (dict símbolo -> bool) que satisfacen todas las cláusulas. """
+    modelos = []
+    for valores in itertools.product([False, True], repeat=len(SIMBOLOS)):
+        asignacion = dict(zip(SIMBOLOS, valores))
+        if all(any(asignacion[l.lstrip("~")] != l.startswith("~") for l in c) for c in base):
+            modelos.append(asignacion)
+    return modelos
+
+
+def _implica(base, query):
+    return all(m[query.lstrip("~")] != query.startswith("~") for m in _modelos(base))
+
+
+def _comparar(fabrica, semilla, **opciones):
+    azar = random.Random(semilla)
+    for _ in range(40):
+        base = _base_al_azar(azar)
+        motor = fabrica()
+        for clausula in base:
+            motor.tell(frozenset(clausula))
+        for query in SIMBOLOS + [f"~{s}" for s in SIMBOLOS]:
+            assert motor.ask(query, **opciones) == _implica(base, query), (base, query)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_resolucion_coincide_con_tabla_de_verdad(semilla):
+    _comparar(MotorLogico, semilla, max_clausulas=10_000)
+
+
+def test_resolucion_con_presupuesto_agotado():
+    # Hace falta más de una cláusula dada para llegar a la vacía: con una sola no se prueba
+    motor = MotorLogico()
+    for clausula in (["~A", "B"], ["~B", "C"], ["A"]):
+        motor.tell(frozenset(clausula))
+    assert motor.ask("C")
+    assert not motor.ask("C", max_clausulas=1)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_sat_coincide_con_tabla_de_verdad(semilla):
+    _comparar(MotorSAT, semilla)
+
+
+def test_sat_prueba_al_menos_lo_que_prueba_resolucion():
+    # Mismo mundo, misma exploración: el motor SAT prueba al menos las mismas casillas seguras
+    for semilla in range(3):
+        seguras = {}
+        for motor in ("resolucion", "sat"):
+            random.seed(semilla)
+            mundo = Mundo(tamaño=4)
+            kb = KB(4, motor=motor, verboso=False)
+            explorar(mundo, kb)
+            seguras[motor] = kb.seguras
+        assert seguras["resolucion"] <= seguras["sat"]
+
+
+def test_tabla_de_simbolos():
+    simbolos = TablaSimbolos()
+    assert simbolos.literal("P_1_2") == 1 and simbolos.literal("~W_0_1") == -2 and simbolos.literal("~P_1_2") == -1
+    clausula = simbolos.clausula(["P_1_2", "~W_0_1"])
+    assert sorted(simbolos.literales(clausula)) == ["P_1_2", "~W_0_1"]
+    assert not es_tautologia(clausula, simbolos.pares())
+    assert es_tautologia(simbolos.clausula(["W_0_1", "~W_0_1"]), simbolos.pares())
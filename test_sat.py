@@ -0,0 +1,66 @@
+"""
+Pruebas del solver SAT (sat.py) contra fuerza bruta en fórmulas chicas.
+
+    python -m pytest -q
+"""
+import itertools
+import random
+
+import pytest
+
+from sat import SolverSAT, luby
+
+
+def _formula_al_azar(azar, variables, clausulas):
+    return [[v if azar.random() < 0.5 else -v for v in azar.sample(range(1, variables + 1), azar.randint(1, 3))]
+            for _ in range(clausulas)]
+
+
+def _satisface(asignacion, clausulas):
+    """ 'asignacion' es una tupla de bools, la variable n en la posición n - 1. """
+    return all(any(asignacion[abs(l) - 1] == (l > 0) for l in c) for c in clausulas)
+
+
+def _satisfacible(variables, clausulas):
+    return any(_satisface(a, clausulas) for a in itertools.product([False, True], repeat=variables))
+
+
+def test_luby():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_coincide_con_fuerza_bruta(semilla):
+    azar = random.Random(semilla)
+    variables = 6
+    for _ in range(60):
+        clausulas = _formula_al_azar(azar, variables, azar.randint(1, 30))
+        solver = SolverSAT()
+        for clausula in clausulas:
+            solver.agregar_clausula(clausula)
+        esperado = _satisfacible(variables, clausulas)
+        assert solver.resolver() == esperado
+        if esperado:
+            # El modelo puede no nombrar las variables que no aparecen: valen cualquier cosa
+            valores = {abs(l): l > 0 for l in solver.modelo}
+            asignacion = tuple(valores.get(v, False) for v in range(1, variables + 1))
+            assert _satisface(asignacion, clausulas)
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_supuestos_y_clausulas_incrementales(semilla):
+    # Las cláusulas se agregan de a una entre llamadas y cada llamada lleva supuestos distintos
+    azar = random.Random(100 + semilla)
+    variables = 6
+    solver = SolverSAT()
+    clausulas = []
+    for clausula in _formula_al_azar(azar, variables, 25):
+        clausulas.append(clausula)
+        solver.agregar_clausula(clausula)
+        for _ in range(3):
+            supuestos = [v if azar.random() < 0.5 else -v for v in azar.sample(range(1, variables + 1), 2)]
+            esperado = _satisfacible(variables, clausulas + [[l] for l in supuestos])
+            assert solver.resolver(supuestos) == esperado, (clausulas, supuestos)
+        # Los supuestos no quedan: sin ellos la respuesta es la de las cláusulas solas
+        assert solver.resolver() == _satisfacible(variables, clausulas)
+        assert solver.inconsistente == (not _satisfacible(variables, clausulas))
@@ -0,0 +1,35 @@
+"""
+Pruebas de la tabla de distancias del 8-puzzle (tabla_distancias.py).
+
+    python -m pytest -q
+"""
+import pytest
+
+from proyecto import bfs
+from tabla_distancias import TablaDistancias, construir_tabla, guardar_tabla
+from validacion import Irresoluble
+
+
+@pytest.fixture(scope="module")
+def tabla(tmp_path_factory):
+    ruta = tmp_path_factory.mktemp("tabla") / "tabla.bin"
+    guardar_tabla(ruta, construir_tabla())
+    return TablaDistancias(ruta)
+
+
+def test_distancia_irresoluble(tabla, monkeypatch):
+    import tabla_distancias
+    # Con distinta paridad se responde sin canonizar ni mirar la tabla
+    monkeypatch.setattr(tabla_distancias, "canonizar", None)
+    intercambiado = [2, 1, 3, 4, 5, 6, 7, 8, 0]
+    assert tabla.distancia(intercambiado) is None
+    assert tabla.distancia(intercambiado, [0, 1, 2, 3, 4, 5, 6, 7, 8]) is None
+    assert isinstance(tabla.resolver(intercambiado), Irresoluble)
+
+
+def test_distancia_con_otro_objetivo(tabla):
+    inicial = [4, 1, 3, 0, 2, 6, 7, 5, 8]
+    objetivo = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+    esperado = len(bfs(inicial, objetivo, formato="movimientos"))
+    assert tabla.distancia(inicial, objetivo) == esperado
+    assert len(tabla.resolver(inicial, objetivo)) == esperado + 1
@@ -0,0 +1,49 @@
+"""
+Pruebas de vectorizado.py (se saltean si NumPy no está instalado).
+
+    python -m pytest -q
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from proyecto import bfs
+from vectorizado import _Cerrados, a_star_por_bloques, bfs_por_capas
+
+OBJETIVO = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+
+@pytest.mark.parametrize("heuristica", ["manhattan", "caminata"])
+def test_a_star_por_bloques_optimo(heuristica):
+    inicial = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+    assert len(a_star_por_bloques(inicial, OBJETIVO, heuristica=heuristica)) == len(bfs(inicial, OBJETIVO))
+
+
+def test_a_star_por_bloques_rechaza_heuristica_no_consistente():
+    with pytest.raises(ValueError):
+        a_star_por_bloques([1, 2, 3, 4, 5, 6, 0, 7, 8], OBJETIVO, heuristica="conflictos")
+
+
+@pytest.mark.parametrize("inicial", [
+    [1, 2, 3, 4, 5, 6, 0, 7, 8],
+    [0, 1, 3, 4, 2, 5, 7, 8, 6],
+    [6, 4, 7, 8, 5, 0, 3, 2, 1],
+])
+def test_bfs_por_capas_y_bloques_optimos(inicial):
+    largo = len(bfs(inicial, OBJETIVO))
+    assert len(bfs_por_capas(inicial, OBJETIVO)) == largo
+    assert len(a_star_por_bloques(inicial, OBJETIVO)) == largo
+
+
+def test_cerrados_por_tramos():
+    cerrados = _Cerrados()
+    vistos = set()
+    azar = np.random.default_rng(0)
+    for _ in range(50):
+        bloque = np.unique(azar.integers(0, 10_000, size=100, dtype=np.uint64))
+        bloque = bloque[~cerrados.contiene(bloque)]
+        cerrados.agregar(bloque)
+        vistos.update(int(v) for v in bloque)
+    consulta = np.arange(10_000, dtype=np.uint64)
+    assert [int(v) for v in consulta[cerrados.contiene(consulta)]] == sorted(vistos)
+    assert len(cerrados) == len(vistos) and len(cerrados.tramos) <= 6
@@ -0,0 +1,81 @@
+"""
+Validación de instancias antes de buscar.
+
+Un movimiento intercambia el hueco con una ficha, así que la paridad de las
+inversiones (sin contar el hueco) solo puede cambiar de forma controlada:
+- ancho impar: un movimiento vertical salta ancho - 1 fichas (un número par),
+  así que la paridad de las inversiones nunca cambia.
+- ancho par: cada movimiento vertical cambia la paridad de las inversiones y
+  también la fila del hueco, así que se conserva la paridad de la suma.
+Si el inicio y el objetivo no coinciden en esa paridad no hay solución, y lo
+sabemos en O(casillas²) en lugar de recorrer toda la componente alcanzable.
+"""
+from math import isqrt
+
+
+class Irresoluble:
+    """
+    Resultado de un solver cuando el objetivo no es alcanzable. Es falso en un
+    if (como el None de antes), pero dice por qué no hay solución.
+    """
+    __slots__ = ("motivo",)
+
+    def __init__(self, motivo):
+        self.motivo = motivo
+
+    def __bool__(self):
+        return False
+
+    def __len__(self):
+        return 0
+
+    def __repr__(self):
+        return f"Irresoluble({self.motivo!r})"
+
+
+def _comprobar_tablero(tablero, casillas, nombre):
+    """ Lanza ValueError si 'tablero' no es una permutación de 0..casillas-1. """
+    if len(tablero) != casillas:
+        raise ValueError(f"El {nombre} tiene {len(tablero)} casillas y se esperaban {casillas}")
+    vistas = 0
+    for ficha in tablero:
+        if not isinstance(ficha, int) or not 0 <= ficha < casillas:
+            raise ValueError(f"El {nombre} tiene una ficha fuera de rango: {ficha!r}")
+        if (vistas >> ficha) & 1:
+            raise ValueError(f"El {nombre} repite la ficha {ficha}")
+        vistas |= 1 << ficha
+
+
+def paridad(tablero, ancho):
+    """ Invariante de los movimientos: inversiones (+ fila del hueco si el ancho es par) módulo 2. """
+    fichas = [f for f in tablero if f]
+    inversiones = 0
+    for i, ficha in enumerate(fichas):
+        for otra in fichas[i + 1:]:
+            if otra < ficha:
+                inversiones += 1
+    if ancho % 2 == 0:
+        inversiones += tablero.index(0) // ancho
+    return inversiones & 1
+
+
+def validar_instancia(estado_inicial, estado_objetivo, ancho=None):
+    """
+    Primer paso de todos los solvers. Lanza ValueError si algún tablero está mal
+    formado; devuelve Irresoluble si el objetivo no es alcanzable y None si la
+    instancia tiene solución.
+    """
+    if ancho is None:
+        ancho = isqrt(len(estado_inicial))
+        if ancho * ancho != len(estado_inicial):
+            raise ValueError(f"Un tablero de {len(estado_inicial)} casillas no es cuadrado")
+    if ancho < 2:
+        raise ValueError("El tablero debe ser de al menos 2x2")
+
+    casillas = ancho * ancho
+    _comprobar_tablero(estado_inicial, casillas, "estado inicial")
+    _comprobar_tablero(estado_objetivo, casillas, "estado objetivo")
+
+    if paridad(estado_inicial, ancho) != paridad(estado_objetivo, ancho):
+        return Irresoluble("El inicio y el objetivo tienen distinta paridad de permutación")
+    return None
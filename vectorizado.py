@@ -0,0 +1,426 @@
+"""
+Expansión de nodos por bloques con NumPy (opcional: pip install numpy).
+
+En lugar de expandir un estado a la vez, una capa o un bloque de la frontera se
+guarda como arreglos de NumPy y los sucesores, la detección de repetidos y los
+valores de la heurística se calculan para todo el bloque con operaciones de
+arreglos, sin pasar por el intérprete por cada nodo.
+
+Los estados son los de motor.py sin los 4 bits del hueco: hasta 4x4 las fichas
+caben justas en 64 bits (uint64), y la posición del hueco viaja en un arreglo
+aparte (el estado empaquetado de motor.py es fichas << 4 | hueco). Como las
+fichas forman una permutación, las fichas solas identifican el estado.
+
+    bfs_por_capas(inicial, objetivo)                    # BFS capa por capa
+    a_star_por_bloques(inicial, objetivo)               # A* que expande toda la cubeta de menor f junta
+    evaluar_tableros("manhattan", tableros, objetivo)   # h de miles de tableros de una vez
+"""
+from functools import lru_cache
+from math import isqrt
+
+try:
+    import numpy as np
+except ImportError:         # Solo hace falta al usar este módulo
+    np = None
+
+from estadisticas import Estadisticas
+from heuristicas import Manhattan, obtener_heuristica
+from motor import LETRAS, NINGUNO, obtener_motor
+from patrones import HeuristicaPatrones
+from proyecto import FORMATOS, obtener_ancho
+from validacion import validar_instancia
+
+# Cada casilla ocupa 4 bits: hasta 16 casillas en un uint64
+ANCHO_MAXIMO = 4
+
+# Desplazamiento del hueco por código de movimiento (ARRIBA, ABAJO, IZQUIERDA, DERECHA)
+_FILAS = (-1, 1, 0, 0)
+_COLUMNAS = (0, 0, -1, 1)
+
+
+def comprobar_numpy():
+    if np is None:
+        raise ImportError("vectorizado.py necesita NumPy (pip install numpy)")
+
+
+class MotorVectorizado:
+    """ Sucesores de bloques de estados para un ancho dado (ver obtener_motor_vectorizado). """
+
+    def __init__(self, ancho):
+        comprobar_numpy()
+        if not 2 <= ancho <= ANCHO_MAXIMO:
+            raise ValueError(f"El motor vectorizado trabaja con tableros de 2x2 a {ANCHO_MAXIMO}x{ANCHO_MAXIMO}")
+        self.ancho = ancho
+        self.casillas = ancho * ancho
+        self.motor = obtener_motor(ancho)
+
+        # legal[codigo][hueco] y destino[codigo][hueco]: adónde va el hueco con cada movimiento
+        self.legal = np.zeros((4, self.casillas), dtype=bool)
+        self.destino = np.zeros((4, self.casillas), dtype=np.uint64)
+        for codigo in range(4):
+            for hueco in range(self.casillas):
+                fila, col = divmod(hueco, ancho)
+                fila += _FILAS[codigo]
+                col += _COLUMNAS[codigo]
+                if 0 <= fila < ancho and 0 <= col < ancho:
+                    self.legal[codigo, hueco] = True
+                    self.destino[codigo, hueco] = fila * ancho + col
+
+    def empaquetar(self, tableros):
+        """ Lista de tableros -> (fichas, huecos). """
+        tableros = np.asarray(tableros, dtype=np.uint64).reshape(-1, self.casillas)
+        desplazamientos = np.arange(self.casillas, dtype=np.uint64) * np.uint64(4)
+        fichas = np.bitwise_or.reduce(tableros << desplazamientos, axis=1)
+        huecos = np.argmin(tableros, axis=1).astype(np.uint64)
+        return fichas, huecos
+
+    def desempaquetar(self, fichas):
+        """ fichas -> matriz (n, casillas) con un tablero por fila. """
+        desplazamientos = np.arange(self.casillas, dtype=np.uint64) * np.uint64(4)
+        return ((fichas[:, None] >> desplazamientos) & np.uint64(15)).astype(np.int64)
+
+    def estado(self, fichas, hueco):
+        """ Estado empaquetado de motor.py de una sola entrada. """
+        return int(fichas) << 4 | int(hueco)
+
+    def expandir(self, fichas, huecos):
+        """
+        Todos los sucesores de un bloque. Devuelve (fichas, huecos, padre, codigo,
+        ficha): 'padre' es el índice en el bloque de entrada y 'ficha' la ficha
+        que se movió (de la casilla nueva del hueco a la vieja).
+        """
+        partes = []
+        for codigo in range(4):
+            indices = np.nonzero(self.legal[codigo][huecos])[0]
+            if not len(indices):
+                continue
+            padre_fichas = fichas[indices]
+            hueco = huecos[indices]
+            destino = self.destino[codigo][hueco]
+            desde = destino * np.uint64(4)
+            hasta = hueco * np.uint64(4)
+            ficha = (padre_fichas >> desde) & np.uint64(15)
+            # La ficha sale de 'destino' y entra donde estaba el hueco (que valía 0)
+            hijos = padre_fichas - (ficha << desde) + (ficha << hasta)
+            partes.append((hijos, destino, indices, np.full(len(indices), codigo, dtype=np.uint8), ficha))
+        if not partes:
+            vacio = np.zeros(0, dtype=np.uint64)
+            return vacio, vacio, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8), vacio
+        return tuple(np.concatenate(columna) for columna in zip(*partes))
+
+
+@lru_cache(maxsize=None)
+def obtener_motor_vectorizado(ancho=3):
+    return MotorVectorizado(ancho)
+
+
+def evaluar_lote(heuristica, motor, fichas, huecos):
+    """
+    h de un bloque de estados. Manhattan y las PDB se calculan con arreglos; el
+    resto de las heurísticas, estado por estado con evaluar_estado().
+    """
+    if type(heuristica) is Manhattan:
+        distancias = _tabla_distancias(heuristica)
+        total = np.zeros(len(fichas), dtype=np.int64)
+        for casilla in range(motor.casillas):
+            ficha = ((fichas >> np.uint64(4 * casilla)) & np.uint64(15)).astype(np.int64)
+            total += distancias[ficha, casilla]
+        return total
+
+    if isinstance(heuristica, HeuristicaPatrones):
+        # posicion[i, ficha] -> casilla de 'ficha' en el estado i
+        tableros = motor.desempaquetar(fichas)
+        posicion = np.empty_like(tableros)
+        np.put_along_axis(posicion, tableros, np.arange(motor.casillas)[None, :], axis=1)
+        total = np.zeros(len(fichas), dtype=np.int64)
+        for grupo, tabla, multiplicadores in zip(heuristica.grupos, heuristica.tablas, heuristica._multiplicadores):
+            # El rango de _indice(): cada posición menos las ya usadas que tiene a su izquierda
+            posiciones = posicion[:, list(grupo)]
+            indice = np.zeros(len(fichas), dtype=np.int64)
+            for i, multiplicador in enumerate(multiplicadores):
+                menores = (posiciones[:, :i] < posiciones[:, i:i + 1]).sum(axis=1)
+                indice += (posiciones[:, i] - menores) * multiplicador
+            total += np.frombuffer(tabla, dtype=np.uint8)[indice]
+        return total
+
+    return np.fromiter((heuristica.evaluar_estado(motor.estado(f, h)) for f, h in zip(fichas, huecos)),
+                       dtype=np.int64, count=len(fichas))
+
+
+def _tabla_distancias(heuristica):
+    """ distancias[ficha, casilla] de Manhattan como matriz (se guarda en la heurística). """
+    tabla = getattr(heuristica, "_distancias_numpy", None)
+    if tabla is None:
+        tabla = np.array(heuristica.distancias, dtype=np.int64)
+        heuristica._distancias_numpy = tabla
+    return tabla
+
+
+def evaluar_tableros(heuristica, tableros, estado_objetivo, ancho=None):
+    """ h de muchos tableros de una vez (arreglo de enteros, en el mismo orden). """
+    comprobar_numpy()
+    ancho = ancho or isqrt(len(estado_objetivo))
+    motor = obtener_motor_vectorizado(ancho)
+    heuristica = obtener_heuristica(heuristica, estado_objetivo, ancho)
+    fichas, huecos = motor.empaquetar(tableros)
+    return evaluar_lote(heuristica, motor, fichas, huecos)
+
+
+def _buscar(ordenadas, valores):
+    """ Máscara de los 'valores' que están en el arreglo ordenado 'ordenadas'. """
+    if not len(ordenadas):
+        return np.zeros(len(valores), dtype=bool)
+    posiciones = np.searchsorted(ordenadas, valores)
+    np.minimum(posiciones, len(ordenadas) - 1, out=posiciones)
+    return ordenadas[posiciones] == valores
+
+
+class _Cerrados:
+    """
+    Conjunto de estados (fichas) como tramos ordenados de tamaño decreciente:
+    cada tramo es más de 8 veces el siguiente, así que hay O(log n). Al agregar
+    un bloque solo se mezclan los tramos chicos del final y cada estado se copia
+    O(log n) veces en total, en vez de rehacer un único arreglo ordenado en cada
+    cubeta (O(n) por cubeta). Con 8 casi todo queda en el primer tramo y buscar
+    cuesta poco más que en un solo arreglo.
+    """
+
+    def __init__(self):
+        self.tramos = []
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def contiene(self, valores):
+        mascara = np.zeros(len(valores), dtype=bool)
+        for tramo in self.tramos:
+            mascara |= _buscar(tramo, valores)
+        return mascara
+
+    def agregar(self, ordenadas):
+        """ 'ordenadas': arreglo ordenado, sin repetidos ni estados ya cerrados. """
+        self.total += len(ordenadas)
+        tramos = self.tramos
+        tramos.append(ordenadas)
+        while len(tramos) > 1 and len(tramos[-2]) <= 8 * len(tramos[-1]):
+            ultimo = tramos.pop()
+            # Dos partes ordenadas: el timsort de kind="stable" solo las mezcla, O(n)
+            tramos[-1] = np.sort(np.concatenate((tramos[-1], ultimo)), kind="stable")
+
+
+def _codigos_hacia_atras(motor, ordenadas, codigos, estado):
+    """
+    Códigos del camino desde la raíz hasta 'estado' (empaquetado de motor.py):
+    'ordenadas' son las fichas de los estados visitados (ordenadas) y 'codigos'
+    el movimiento que trajo a cada uno (NINGUNO en la raíz).
+    """
+    camino = []
+    while True:
+        codigo = int(codigos[np.searchsorted(ordenadas, np.uint64(estado >> 4))])
+        if codigo == NINGUNO:
+            break
+        camino.append(codigo)
+        estado = motor.aplicar(estado, codigo ^ 1)
+    camino.reverse()
+    return camino
+
+
+def _formatear(motor, inicio, codigos, formato):
+    if formato == "movimientos":
+        return "".join(LETRAS[c] for c in codigos)
+    return motor.tableros(inicio, codigos)
+
+
+def comprobar_consistente(heuristica):
+    """
+    Devuelve la heurística si es consistente (heuristica.consistente) y si no
+    lanza ValueError: a_star_por_bloques no reabre estados.
+    """
+    if not heuristica.consistente:
+        raise ValueError(f"a_star_por_bloques necesita una heurística consistente "
+                         f"({type(heuristica).__name__} no lo asegura; use 'manhattan' o 'caminata')")
+    return heuristica
+
+
+def _preparar(nombre, estado_inicial, estado_objetivo, ancho, estadisticas, formato):
+    """ Lo común a los dos solvers: (estadisticas, motor vectorizado, problema). """
+    comprobar_numpy()
+    if estadisticas is None:
+        estadisticas = Estadisticas()
+    estadisticas.iniciar(nombre)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato!r} (disponibles: {', '.join(FORMATOS)})")
+    problema = validar_instancia(estado_inicial, estado_objetivo, ancho)
+    if problema is not None:
+        estadisticas.terminar()
+        return estadisticas, None, problema
+    return estadisticas, obtener_motor_vectorizado(obtener_ancho(estado_inicial, ancho)), None
+
+
+def bfs_por_capas(estado_inicial, estado_objetivo, ancho=None, estadisticas=None, formato="tableros"):
+    """
+    BFS que expande cada capa entera de una vez. En un grafo no dirigido los
+    vecinos de la capa k están en las capas k - 1, k o k + 1, así que los
+    repetidos se descartan contra las dos últimas capas (ordenadas, con
+    searchsorted) sin un conjunto global de visitados. Mismo resultado y misma
+    firma que proyecto.bfs; solo hasta 4x4.
+    """
+    estadisticas, vectorizado, problema = _preparar("bfs_por_capas", estado_inicial, estado_objetivo,
+                                                     ancho, estadisticas, formato)
+    if problema is not None:
+        return problema
+
+    motor = vectorizado.motor
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo = np.uint64(motor.empaquetar(estado_objetivo) >> 4)
+
+    fichas, huecos = vectorizado.empaquetar([estado_inicial])
+    codigos = np.array([NINGUNO], dtype=np.uint8)
+    anterior = np.zeros(0, dtype=np.uint64)
+    capas = []              # (fichas ordenadas, codigos) de cada capa, para reconstruir
+
+    expandidos = generados = nuevos = 0
+    pico_frontera = 1
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
+
+    while len(fichas):
+        capas.append((fichas, codigos))
+        if _buscar(fichas, np.array([objetivo]))[0]:
+            estadisticas.fase("reconstruccion")
+            codigos_camino = []
+            estado = motor.empaquetar(estado_objetivo)
+            for fichas_capa, codigos_capa in reversed(capas[1:]):
+                codigo = int(codigos_capa[np.searchsorted(fichas_capa, np.uint64(estado >> 4))])
+                codigos_camino.append(codigo)
+                estado = motor.aplicar(estado, codigo ^ 1)
+            codigos_camino.reverse()
+            camino = _formatear(motor, inicio, codigos_camino, formato)
+            estadisticas.optimo = True
+            estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+            return camino
+
+        expandidos += len(fichas)
+        hijos, huecos_hijos, _, codigos_hijos, _ = vectorizado.expandir(fichas, huecos)
+        generados += len(hijos)
+
+        # Únicos (ordenados) y fuera de la capa anterior y de la actual
+        hijos, primeros = np.unique(hijos, return_index=True)
+        nueva = ~(_buscar(anterior, hijos) | _buscar(fichas, hijos))
+        anterior = fichas
+        fichas = hijos[nueva]
+        huecos = huecos_hijos[primeros][nueva]
+        codigos = codigos_hijos[primeros][nueva]
+        nuevos += len(fichas)
+
+        if len(fichas) > pico_frontera:
+            pico_frontera = len(fichas)
+        if 0 <= proximo_aviso <= expandidos:
+            proximo_aviso = estadisticas.avisar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+
+    estadisticas.terminar(expandidos, generados, generados - nuevos, pico_frontera, nuevos + 1)
+    return None
+
+
+def a_star_por_bloques(estado_inicial, estado_objetivo, ancho=None, heuristica="manhattan", estadisticas=None,
+                       formato="tableros"):
+    """
+    A* que saca de la frontera TODOS los estados con el menor f y los expande
+    juntos. Los f son enteros, así que la frontera es un diccionario de cubetas
+    f -> bloques de arreglos; los hijos con el mismo f vuelven a la misma cubeta
+    y se expanden en la siguiente vuelta. Un estado se cierra la primera vez que
+    se expande, así que la heurística debe ser consistente (ver
+    comprobar_consistente): con las que no lo aseguran, como las PDB o
+    "conflictos", el camino podría no ser óptimo y se rechazan con ValueError.
+    Misma firma que proyecto.a_star; solo hasta 4x4.
+    """
+    estadisticas, vectorizado, problema = _preparar("a_star_por_bloques", estado_inicial, estado_objetivo,
+                                                     ancho, estadisticas, formato)
+    if problema is not None:
+        return problema
+
+    motor = vectorizado.motor
+    inicio = motor.empaquetar(estado_inicial)
+    objetivo_estado = motor.empaquetar(estado_objetivo)
+    objetivo = np.uint64(objetivo_estado >> 4)
+    heuristica = comprobar_consistente(obtener_heuristica(heuristica, estado_objetivo, motor.ancho))
+    # Con Manhattan el h de cada hijo sale de la tabla por ficha, sin reevaluar el tablero
+    distancias = _tabla_distancias(heuristica) if type(heuristica) is Manhattan else None
+
+    fichas, huecos = vectorizado.empaquetar([estado_inicial])
+    h_inicial = int(evaluar_lote(heuristica, vectorizado, fichas, huecos)[0])
+    # cubetas[f] -> lista de bloques (fichas, huecos, g, codigos)
+    cubetas = {h_inicial: [(fichas, huecos, np.zeros(1, dtype=np.int64), np.array([NINGUNO], dtype=np.uint8))]}
+    cerrados = _Cerrados()
+    historial = []          # (fichas, codigos) de cada bloque expandido, para reconstruir
+
+    expandidos = generados = llamadas_heuristica = 0
+    en_frontera = pico_frontera = 1
+    proximo_aviso = estadisticas.primer_aviso()
+    estadisticas.fase("busqueda")
+
+    while cubetas:
+        f = min(cubetas)
+        bloques = cubetas.pop(f)
+        fichas, huecos, g, codigos = (np.concatenate(columna) for columna in zip(*bloques))
+        en_frontera -= len(fichas)
+
+        # Un estado con el mismo f tiene el mismo g (mismo h), así que basta el primero
+        fichas, primeros = np.unique(fichas, return_index=True)
+        abiertos = ~cerrados.contiene(fichas)
+        fichas = fichas[abiertos]
+        if not len(fichas):
+            continue
+        primeros = primeros[abiertos]
+        huecos, g, codigos = huecos[primeros], g[primeros], codigos[primeros]
+
+        historial.append((fichas, codigos))
+        if _buscar(fichas, np.array([objetivo]))[0]:
+            estadisticas.fase("reconstruccion")
+            todas = np.concatenate([b[0] for b in historial])
+            orden = np.argsort(todas, kind="stable")
+            codigos_todos = np.concatenate([b[1] for b in historial])[orden]
+            codigos_camino = _codigos_hacia_atras(motor, todas[orden], codigos_todos, objetivo_estado)
+            camino = _formatear(motor, inicio, codigos_camino, formato)
+            estadisticas.optimo = True
+            estadisticas.terminar(expandidos, generados, generados - llamadas_heuristica, pico_frontera,
+                                  len(cerrados) + len(fichas), llamadas_heuristica + 1)
+            return camino
+
+        cerrados.agregar(fichas)
+        expandidos += len(fichas)
+
+        hijos, huecos_hijos, padres, codigos_hijos, movidas = vectorizado.expandir(fichas, huecos)
+        generados += len(hijos)
+        # Se descartan ya los cerrados (entre ellos, el padre de cada uno)
+        abiertos = ~cerrados.contiene(hijos)
+        hijos, huecos_hijos = hijos[abiertos], huecos_hijos[abiertos]
+        padres, codigos_hijos, movidas = padres[abiertos], codigos_hijos[abiertos], movidas[abiertos]
+        g_hijos = g[padres] + 1
+
+        if distancias is not None:
+            # La ficha pasa de la casilla nueva del hueco a la vieja
+            ficha = movidas.astype(np.int64)
+            h_hijos = (f - g[padres]) + distancias[ficha, huecos[padres].astype(np.int64)] \
+                - distancias[ficha, huecos_hijos.astype(np.int64)]
+        else:
+            h_hijos = evaluar_lote(heuristica, vectorizado, hijos, huecos_hijos)
+        llamadas_heuristica += len(hijos)
+
+        f_hijos = g_hijos + h_hijos
+        for valor in np.unique(f_hijos):
+            seleccion = f_hijos == valor
+            cubetas.setdefault(int(valor), []).append(
+                (hijos[seleccion], huecos_hijos[seleccion], g_hijos[seleccion], codigos_hijos[seleccion]))
+        en_frontera += len(hijos)
+
+        if en_frontera > pico_frontera:
+            pico_frontera = en_frontera
+        if 0 <= proximo_aviso <= expandidos:
+            proximo_aviso = estadisticas.avisar(expandidos, generados, generados - llamadas_heuristica,
+                                                pico_frontera, len(cerrados), llamadas_heuristica + 1)
+
+    estadisticas.terminar(expandidos, generados, generados - llamadas_heuristica, pico_frontera, len(cerrados),
+                          llamadas_heuristica + 1)
+    return None